@@ -0,0 +1,89 @@
+import math
+
+import numpy as np
+
+
+class AdaptiveInference:
+    """Poz çıkarımını ölçülen gecikmeye göre her N karede bir çalıştırır.
+
+    N, ortalama çıkarım süresinin kare başına ayrılan bütçeye oranından
+    seçilir. Aradaki karelerde landmarklar son iki çıkarımdan hesaplanan
+    hızla ileriye doğru tahmin edilir.
+    """
+
+    def __init__(self, budget_ms=20.0, max_interval=4, smoothing=0.2):
+        self.budget_ms = budget_ms         # Kare başına çıkarıma ayrılan süre
+        self.max_interval = max_interval   # En fazla kaç karede bir çıkarım
+        self.smoothing = smoothing         # Gecikme ortalaması için EMA katsayısı
+        self.reset()
+
+    def reset(self):
+        """Geçmiş landmarkları ve istatistikleri temizler"""
+        self.latency_ms = None
+        self.interval = 1
+        self.inferred = 0
+        self.interpolated = 0
+        self._since_inference = 0
+        self._prev = None       # (zaman, (33, 4) landmark dizisi)
+        self._last = None
+        self._velocity = None
+
+    def should_infer(self):
+        """Bu karede tam çıkarım yapılıp yapılmayacağı"""
+        return self._last is None or self._since_inference + 1 >= self.interval
+
+    def update(self, points, timestamp, latency_ms, velocity=None):
+        """Tam çıkarım sonucunu ve süresini kaydeder, N değerini günceller.
+
+        velocity verilirse (ör. yumuşatma filtresinin hız tahmini, (33, 3))
+        iki çıkarım arasındaki fark yerine o kullanılır.
+        """
+        self.inferred += 1
+        self._since_inference = 0
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += self.smoothing * (latency_ms - self.latency_ms)
+        self.interval = max(1, min(self.max_interval, math.ceil(self.latency_ms / self.budget_ms)))
+
+        if points is None:
+            # Kişi kayboldu; eski hız ile tahmin yapma
+            self._prev = self._last = self._velocity = None
+            return
+        self._prev, self._last = self._last, (timestamp, points.copy())
+        if velocity is not None:
+            if self._velocity is None:
+                self._velocity = np.zeros_like(points)
+            self._velocity[:, :3] = velocity
+        elif self._prev is not None and self._last[0] > self._prev[0]:
+            self._velocity = (self._last[1] - self._prev[1]) / (self._last[0] - self._prev[0])
+            self._velocity[:, 3] = 0.0 # Görünürlük tahmin edilmez
+        else:
+            self._velocity = None
+
+    def extrapolate(self, timestamp, out=None):
+        """Son çıkarımdan bu yana geçen süreye göre landmarkları tahmin eder"""
+        self.interpolated += 1
+        self._since_inference += 1
+        if self._last is None:
+            return None
+        last_time, last_points = self._last
+        if out is None:
+            out = np.empty_like(last_points)
+        if self._velocity is None:
+            out[:] = last_points
+        else:
+            np.multiply(self._velocity, timestamp - last_time, out=out)
+            out += last_points
+        return out
+
+    def stats(self):
+        """Çıkarım aralığını ve tahmin edilen kare oranını döndürür"""
+        total = self.inferred + self.interpolated
+        return {
+            "interval": self.interval,
+            "latency_ms": self.latency_ms or 0.0,
+            "inferred": self.inferred,
+            "interpolated": self.interpolated,
+            "interpolated_ratio": self.interpolated / total if total else 0.0,
+        }
@@ -0,0 +1,104 @@
+from enum import IntEnum
+
+import numpy as np
+
+NUM_LANDMARKS = 33
+
+# MediaPipe Pose landmark indeksleri ve iskelet bağlantıları. Analiz, kayıt ve
+# tekrar oynatma mediapipe'ı yüklemeden çalışabilsin diye burada tanımlıdır.
+PoseLandmark = IntEnum("PoseLandmark", [
+    "NOSE", "LEFT_EYE_INNER", "LEFT_EYE", "LEFT_EYE_OUTER", "RIGHT_EYE_INNER", "RIGHT_EYE",
+    "RIGHT_EYE_OUTER", "LEFT_EAR", "RIGHT_EAR", "MOUTH_LEFT", "MOUTH_RIGHT",
+    "LEFT_SHOULDER", "RIGHT_SHOULDER", "LEFT_ELBOW", "RIGHT_ELBOW", "LEFT_WRIST", "RIGHT_WRIST",
+    "LEFT_PINKY", "RIGHT_PINKY", "LEFT_INDEX", "RIGHT_INDEX", "LEFT_THUMB", "RIGHT_THUMB",
+    "LEFT_HIP", "RIGHT_HIP", "LEFT_KNEE", "RIGHT_KNEE", "LEFT_ANKLE", "RIGHT_ANKLE",
+    "LEFT_HEEL", "RIGHT_HEEL", "LEFT_FOOT_INDEX", "RIGHT_FOOT_INDEX",
+], start=0)
+
+POSE_CONNECTIONS = frozenset([
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20),
+    (11, 23), (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28),
+    (27, 29), (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+])
+
+# Eklem adı -> (a, b, c) landmark indeksleri; açı b noktasında ölçülür
+JOINTS = {
+    "left_knee": (PoseLandmark.LEFT_HIP, PoseLandmark.LEFT_KNEE, PoseLandmark.LEFT_ANKLE),
+    "right_knee": (PoseLandmark.RIGHT_HIP, PoseLandmark.RIGHT_KNEE, PoseLandmark.RIGHT_ANKLE),
+    "left_hip": (PoseLandmark.LEFT_SHOULDER, PoseLandmark.LEFT_HIP, PoseLandmark.LEFT_KNEE),
+    "right_hip": (PoseLandmark.RIGHT_SHOULDER, PoseLandmark.RIGHT_HIP, PoseLandmark.RIGHT_KNEE),
+    "left_elbow": (PoseLandmark.LEFT_SHOULDER, PoseLandmark.LEFT_ELBOW, PoseLandmark.LEFT_WRIST),
+    "right_elbow": (PoseLandmark.RIGHT_SHOULDER, PoseLandmark.RIGHT_ELBOW, PoseLandmark.RIGHT_WRIST),
+    "left_shoulder": (PoseLandmark.LEFT_ELBOW, PoseLandmark.LEFT_SHOULDER, PoseLandmark.LEFT_HIP),
+    "right_shoulder": (PoseLandmark.RIGHT_ELBOW, PoseLandmark.RIGHT_SHOULDER, PoseLandmark.RIGHT_HIP),
+}
+JOINT_NAMES = list(JOINTS)
+JOINT_TRIPLES = np.array([[int(i) for i in triple] for triple in JOINTS.values()], dtype=np.intp)
+_SINGLE_TRIPLE = np.array([[0, 1, 2]], dtype=np.intp) # calculate_angle için
+
+MIN_VISIBILITY = 0.5
+
+
+def landmarks_to_array(landmarks, out=None):
+    """33 landmarkı tek seferde (33, 4) float32 diziye çevirir: x, y, z, visibility.
+
+    landmarks bir landmark dizisi ya da MediaPipe'ın NormalizedLandmarkList
+    (results.pose_landmarks) veya LandmarkList (results.pose_world_landmarks,
+    metre) mesajı olabilir.
+    """
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 4), dtype=np.float32)
+    landmarks = getattr(landmarks, "landmark", landmarks)
+    if len(landmarks) < NUM_LANDMARKS:
+        raise IndexError(f"{NUM_LANDMARKS} landmark bekleniyordu, {len(landmarks)} geldi")
+    out[:] = [(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks[:NUM_LANDMARKS]]
+    return out
+
+
+def joint_angles(points, triples=JOINT_TRIPLES, min_visibility=MIN_VISIBILITY, dims=2):
+    """Tüm eklem üçlülerinin açılarını (derece) tek vektörel geçişte hesaplar.
+
+    points (33, 4) ya da (kare, 33, 4) olabilir; sonuç (..., üçlü sayısı)
+    boyutundadır. Noktalardan biri yeterince görünür değilse açı NaN olur.
+    dims=2 görüntüdeki x, y ile; dims=3 dünya landmarklarının (metre)
+    x, y, z'si ile kamera açısından bağımsız gerçek eklem açısını verir.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    p = points[..., triples, :] # (..., üçlü, 3, 4) tek indeksleme ile
+    ba = p[..., 0, :dims] - p[..., 1, :dims]
+    bc = p[..., 2, :dims] - p[..., 1, :dims]
+
+    # atan2(|ba x bc|, ba . bc): arccos'taki bölme ve kırpma gerekmez
+    if dims == 2:
+        cross = np.abs(ba[..., 0] * bc[..., 1] - ba[..., 1] * bc[..., 0])
+        dot = ba[..., 0] * bc[..., 0] + ba[..., 1] * bc[..., 1]
+    else:
+        cross = np.sqrt((ba[..., 1] * bc[..., 2] - ba[..., 2] * bc[..., 1]) ** 2
+                        + (ba[..., 2] * bc[..., 0] - ba[..., 0] * bc[..., 2]) ** 2
+                        + (ba[..., 0] * bc[..., 1] - ba[..., 1] * bc[..., 0]) ** 2)
+        dot = (ba * bc).sum(axis=-1)
+    angles = np.degrees(np.arctan2(cross, dot))
+
+    # Görünmeyen noktalar ve sıfır uzunluklu kollar için açı tanımsız
+    invalid = (p[..., 3].min(axis=-1) <= min_visibility) | ((cross == 0) & (dot == 0))
+    angles[invalid] = np.nan
+    return angles
+
+
+def angles_by_name(points, names=JOINT_NAMES, triples=JOINT_TRIPLES):
+    """Tek karenin açılarını {eklem adı: derece} sözlüğü olarak döndürür (NaN -> None)"""
+    values = joint_angles(points, triples).tolist()
+    return {name: (None if value != value else value) for name, value in zip(names, values)}
+
+
+def calculate_angle(a, b, c):
+    """Üç nokta arasındaki açıyı (b noktasında) hesaplar.
+
+    Noktalardan biri yeterince görünür değilse None döndürür.
+    """
+    points = np.array([(p.x, p.y, p.z, p.visibility) for p in (a, b, c)], dtype=np.float32)
+    angle = joint_angles(points, _SINGLE_TRIPLE)[0]
+    return None if np.isnan(angle) else float(angle)
+
@@ -0,0 +1,844 @@
+"""Analiz motoru için tekrarlanabilir performans ölçümü (kamera gerektirmez).
+
+Her aşama (açı hesabı, durum makinesi, motor, çizim, PIL/Tk dönüşümü,
+modelsiz uçtan uca akış) yapay ya da kaydedilmiş landmark dizileriyle ayrı
+ayrı ölçülür. Sonuçlar düz bir "aşama.metrik" sözlüğü olarak JSON'a
+yazılabilir ve önceki bir ölçümle (baseline) karşılaştırılabilir; eşiği
+aşan gerileme varsa çıkış kodu 1 olur.
+
+Örnek:
+    python benchmark.py --frames 20000 --output bench.json
+    python benchmark.py --baseline bench.json --threshold 0.15
+    python benchmark.py --session ~/.spor_takip/sessions/20240101_120000
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from angles import JOINT_NAMES, JOINT_TRIPLES, POSE_CONNECTIONS, PoseLandmark, calculate_angle, joint_angles, landmarks_to_array
+from engine import ExerciseEngine
+from frame_buffers import AllocationCounter, DisplayScaler, FrameConverter, FramePool
+from frame_sources import SyntheticSource, open_source, synthetic_pose
+from smoothing import OneEuroFilter
+from metrics import StageMetrics
+from overlay import BONE_COLOR, JOINT_COLOR, OverlayRenderer
+from session_recorder import load_session, world_points
+from view_model import DISPLAY_RATE, ViewModel
+
+ALLOCATION_FRAMES = 200 # tracemalloc yavaş olduğu için bellek ölçümü bu kadar karede yapılır
+
+
+def synthetic_landmarks(n_frames, period=60):
+    """SyntheticSource ile aynı hareketi MediaPipe benzeri landmark listeleri
+    olarak üretir (x, y, z, visibility nitelikli 33 nesne)."""
+    frames = []
+    for i in range(n_frames):
+        points = synthetic_pose(i, period)
+        frames.append([SimpleNamespace(x=float(x), y=float(y), z=float(z), visibility=float(v))
+                       for x, y, z, v in points])
+    return frames
+
+
+def session_landmarks(path, movement=None):
+    """Kaydedilmiş oturumdaki landmarkları synthetic_landmarks biçiminde döndürür.
+
+    Sadece kişinin bulunduğu kareler (ve movement verilirse o hareket) alınır.
+    """
+    from session_recorder import MOVEMENTS
+    frames = load_session(path)[1]
+    mask = frames["has_pose"]
+    if movement:
+        mask &= frames["movement"] == MOVEMENTS.index(movement)
+    return [[SimpleNamespace(x=float(x), y=float(y), z=float(z), visibility=float(v))
+             for x, y, z, v in points] for points in frames["points"][mask]]
+
+
+def allocations(fn, items):
+    """fn(item) çağrısının ilk ALLOCATION_FRAMES öğedeki ortalama bellek ayırması (bayt)"""
+    with AllocationCounter() as counter:
+        for item in items[:ALLOCATION_FRAMES]:
+            counter.measure(fn, item)
+    return counter.bytes_per_frame
+
+
+def bench_engine(landmark_frames, movement):
+    """Motorun verilen karelerdeki işlem hızını (kare/sn) ölçer"""
+    engine = ExerciseEngine(movement)
+    start = time.perf_counter()
+    for i, landmarks in enumerate(landmark_frames):
+        engine.process(landmarks, i / 30.0)
+    elapsed = time.perf_counter() - start
+    reps = engine.correct_count
+    engine.reset()
+    clock = iter(range(len(landmark_frames)))
+    allocated = allocations(lambda landmarks: engine.process(landmarks, next(clock) / 30.0),
+                            landmark_frames)
+    return {
+        "movement": movement,
+        "frames": len(landmark_frames),
+        "fps": len(landmark_frames) / elapsed,
+        "bytes_per_frame": allocated,
+        "reps": reps,
+    }
+
+
+def bench_rep_fsm(landmark_frames, movement="Squat"):
+    """Sadece tekrar sayan durum makinesinin güncelleme hızını ölçer.
+
+    Girdiler (izlenen açı, doğru mu) önce motordan bir kez alınır.
+    """
+    engine = ExerciseEngine(movement, smoothing=False)
+    joint = engine.rep_angles[movement]
+    inputs = []
+    for i, landmarks in enumerate(landmark_frames):
+        analysis = engine.process(landmarks, i / 30.0)
+        inputs.append((analysis.angles.get(joint), analysis.is_correct, analysis.timestamp))
+    engine.reset()
+    fsm = engine.rep_fsm
+    start = time.perf_counter()
+    for angle, correct, timestamp in inputs:
+        fsm.update(angle, correct, timestamp)
+    elapsed = time.perf_counter() - start
+    return {"fps": len(inputs) / elapsed, "reps": fsm.count}
+
+
+def bench_angles(landmark_frames):
+    """Tekil calculate_angle ile vektörel çekirdeği karşılaştırır (kare/sn)"""
+    start = time.perf_counter()
+    for landmarks in landmark_frames:
+        for a, b, c in JOINT_TRIPLES:
+            calculate_angle(landmarks[a], landmarks[b], landmarks[c])
+    scalar = len(landmark_frames) / (time.perf_counter() - start)
+
+    points = np.empty((33, 4), dtype=np.float32)
+    start = time.perf_counter()
+    for landmarks in landmark_frames:
+        joint_angles(landmarks_to_array(landmarks, points))
+    batched = len(landmark_frames) / (time.perf_counter() - start)
+
+    # Çevrim dışı: tüm oturum tek (kare, 33, 4) dizi olarak
+    stack = np.stack([landmarks_to_array(landmarks) for landmarks in landmark_frames])
+    start = time.perf_counter()
+    joint_angles(stack)
+    stacked = len(landmark_frames) / (time.perf_counter() - start)
+
+    return {"scalar_fps": scalar, "batched_fps": batched, "stacked_fps": stacked}
+
+
+def bench_landmark_access(landmark_frames):
+    """Squat'ın sol diz ve kalça açılarına kare başına erişimi karşılaştırır (kare/sn).
+
+    enum: eski analyze_squat gibi her landmark PoseLandmark zinciriyle tek
+    tek alınıp calculate_angle çağrılır. table: landmarklar tek seferde diziye
+    çevrilip aynı iki açı indeks tablosuyla hesaplanır. protobuf kuruluysa
+    ikisi NormalizedLandmarkList mesajları üzerinde de ölçülür.
+    """
+    mp = SimpleNamespace(solutions=SimpleNamespace(pose=SimpleNamespace(PoseLandmark=PoseLandmark)))
+    app = SimpleNamespace(mp_pose=mp.solutions.pose)
+
+    def enum_lookup(landmarks):
+        hip = landmarks[app.mp_pose.PoseLandmark.LEFT_HIP.value]
+        knee = landmarks[app.mp_pose.PoseLandmark.LEFT_KNEE.value]
+        ankle = landmarks[app.mp_pose.PoseLandmark.LEFT_ANKLE.value]
+        shoulder = landmarks[app.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
+        return calculate_angle(hip, knee, ankle), calculate_angle(shoulder, hip, knee)
+
+    triples = JOINT_TRIPLES[[JOINT_NAMES.index("left_knee"), JOINT_NAMES.index("left_hip")]]
+    points = np.empty((33, 4), dtype=np.float32)
+
+    def table(landmarks):
+        landmarks_to_array(landmarks, points)
+        return joint_angles(points, triples)
+
+    def run(prefix, frames, access):
+        for name, fn in (("enum", enum_lookup), ("table", table)):
+            start = time.perf_counter()
+            for landmarks in frames:
+                fn(access(landmarks))
+            results[f"{prefix}{name}_fps"] = len(frames) / (time.perf_counter() - start)
+
+    results = {}
+    run("", landmark_frames, lambda landmarks: landmarks)
+    try:
+        from mediapipe.framework.formats import landmark_pb2
+    except ImportError:
+        return results
+    messages = []
+    for landmarks in landmark_frames[:1000]:
+        message = landmark_pb2.NormalizedLandmarkList()
+        for lm in landmarks:
+            message.landmark.add(x=lm.x, y=lm.y, z=lm.z, visibility=lm.visibility)
+        messages.append(message)
+    run("protobuf_", messages, lambda message: message.landmark)
+    return results
+
+
+def bench_side_selection(n_frames, period=60, movement="Squat", steps=(1, 2, 3), seed=0):
+    """Sadece sol taraf ile iki tarafın birlikte değerlendirilmesini karşılaştırır.
+
+    Yapay karelerde kişi her iki tekrarda bir sol tarafını kameradan
+    çevirir (sol landmarkların görünürlüğü eşiğin altında) ve landmarklara
+    gürültü eklenir. Her taraf seçimi için belirsiz sayılan karelerin oranı
+    ile her step karede bir analiz edildiğinde (daha düşük kare hızı)
+    sayılan tekrarlar döndürülür. Beklenen tekrar sayısı n_frames / period.
+    """
+    rng = np.random.default_rng(seed)
+    left = [int(landmark) for landmark in PoseLandmark if landmark.name.startswith("LEFT_")]
+    frames = []
+    for i in range(n_frames):
+        points = synthetic_pose(i, period).copy()
+        points[:, :2] += rng.normal(0, 0.005, (33, 2)).astype(np.float32)
+        if (i // (2 * period)) % 2:
+            points[left, 3] = 0.2
+        frames.append(points)
+
+    results = {"expected_reps": n_frames // period}
+    for side in ("left", "auto"):
+        for step in steps:
+            engine = ExerciseEngine(movement, smoothing=False)
+            engine.side = side
+            engine.reset()
+            uncertain = 0
+            for i in range(0, n_frames, step):
+                uncertain += engine.process_points(frames[i], i / 30.0).status == "UNCERTAIN"
+            if step == 1:
+                results[f"{side}_uncertain_pct"] = 100.0 * uncertain / n_frames
+            results[f"{side}_reps_{30 // step}hz"] = engine.correct_count
+    return results
+
+
+def bench_world_angles(n_frames, yaws=(0, 30, 60), session=None, seed=0):
+    """2B görüntü açıları ile 3B dünya landmarkı açılarının doğruluğu ve maliyeti.
+
+    Yapay hareket dünya koordinatlarına (metre) taşınıp kameraya göre yaw
+    derece döndürülür; görüntü landmarkları bunun izdüşümüdür. Her iki yola
+    gürültü eklenir ve açıların dönmemiş hareketin gerçek eklem açılarından
+    sapması (RMS, derece) ölçülür. Derinlik gürültüsü yüzünden küçük
+    açılarda 2B, büyük açılarda 3B daha doğrudur; tüm açılar raporlanır.
+    session verilirse kayıttaki dünya landmarklı karelerde iki modun
+    ortalama farkı da döndürülür.
+    """
+    rng = np.random.default_rng(seed)
+    poses = np.stack([synthetic_pose(i) for i in range(n_frames)])
+    world = poses.copy()
+    world[..., 0] = (poses[..., 0] - 0.5) * 1.7
+    world[..., 1] = (poses[..., 1] - 0.55) * 1.7
+    truth = joint_angles(world, dims=3)
+    results = {}
+    for yaw in yaws:
+        c, s = np.cos(np.radians(yaw)), np.sin(np.radians(yaw))
+        turned = world.copy()
+        turned[..., 0], turned[..., 2] = world[..., 0] * c, world[..., 0] * s
+        image = poses.copy()
+        image[..., 0] = 0.5 + turned[..., 0] / 1.7
+        image[..., :2] += rng.normal(0, 0.004, image[..., :2].shape)
+        turned[..., :3] += rng.normal(0, (0.007, 0.007, 0.015), turned[..., :3].shape)
+        for mode, angles in (("2d", joint_angles(image)), ("3d", joint_angles(turned, dims=3))):
+            results[f"{mode}_rms_yaw{yaw}_deg"] = float(np.sqrt(np.nanmean((angles - truth) ** 2)))
+
+    for mode, dims, points in (("2d", 2, poses), ("3d", 3, world)):
+        start = time.perf_counter()
+        for frame in points:
+            joint_angles(frame, dims=dims)
+        results[f"{mode}_us"] = (time.perf_counter() - start) / n_frames * 1e6
+
+    if session:
+        frames = load_session(session)[1]
+        has_world = frames["has_pose"] & ~np.isnan(frames["world"][:, 0, 0])
+        results["session_world_frames"] = int(np.count_nonzero(has_world))
+        if has_world.any():
+            diff = joint_angles(world_points(frames, has_world), dims=3) - frames["angles"][has_world]
+            results["session_mean_diff_deg"] = float(np.nanmean(np.abs(diff)))
+    return results
+
+
+class _CountingLabel:
+    """config çağrılarını sayıp isteğe bağlı olarak gerçek widget'a ileten etiket"""
+
+    def __init__(self, widget=None):
+        self.widget = widget
+        self.calls = 0
+
+    def config(self, **options):
+        self.calls += 1
+        if self.widget is not None:
+            self.widget.config(**options)
+
+
+def bench_widgets(landmark_frames, movement="Squat", fps=30.0):
+    """Durum ve sayaç etiketlerinin kare başına Tk maliyeti: her karede config
+    (eski show_result) ile farka dayalı, ekran hızıyla sınırlı ViewModel.
+
+    Ekran yoksa sadece kare başına config çağrısı sayılır; varsa gizli bir
+    pencerede config ve bekleyen geometri işleri (update_idletasks) dahil
+    kare başına süre (µs) ölçülür.
+    """
+    engine = ExerciseEngine(movement)
+    analyses = [engine.process(landmarks, i / fps) for i, landmarks in enumerate(landmark_frames)]
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+    except ImportError:
+        root = None
+    except tk.TclError: # Ekran yok
+        root = None
+
+    def labels():
+        if root is None:
+            return {name: _CountingLabel() for name in ("status", "counter")}
+        return {name: _CountingLabel(tk.Label(root, text="", font=("Arial", 14, "bold")))
+                for name in ("status", "counter")}
+
+    def direct(widgets):
+        for analysis in analyses:
+            if analysis.status != "NO_POSE":
+                widgets["status"].config(text=analysis.message,
+                                         fg="#27ae60" if analysis.is_correct else "#e74c3c")
+                widgets["counter"].config(text=str(analysis.count))
+            if root is not None:
+                root.update_idletasks()
+
+    def view_model(widgets):
+        view = ViewModel(widgets)
+        next_flush = 0.0
+        for analysis in analyses:
+            if analysis.status != "NO_POSE":
+                view.set("status", text=analysis.message, fg="#27ae60" if analysis.is_correct else "#e74c3c")
+                view.set("counter", text=str(analysis.count))
+            if analysis.timestamp >= next_flush: # Tk'de root.after ile zamanlanır
+                view.flush()
+                next_flush = analysis.timestamp + view.interval
+            if root is not None:
+                root.update_idletasks()
+
+    results = {}
+    try:
+        for name, fn in (("direct", direct), ("view", view_model)):
+            widgets = labels()
+            start = time.perf_counter()
+            fn(widgets)
+            elapsed = time.perf_counter() - start
+            results[f"{name}_configs_per_frame"] = sum(w.calls for w in widgets.values()) / len(analyses)
+            if root is not None:
+                results[f"{name}_us"] = elapsed / len(analyses) * 1e6
+    finally:
+        if root is not None:
+            root.destroy()
+    return results
+
+
+def bench_smoothing(n_frames, noise=0.005, fps=30.0, seed=0):
+    """One-Euro filtresinin kare başına süresini ve açı titreşimine etkisini ölçer.
+
+    Yapay harekete gauss gürültüsü eklenir; ham ve süzülmüş landmarklardan
+    hesaplanan açıların gerçek açılardan RMS sapması karşılaştırılır.
+    """
+    rng = np.random.default_rng(seed)
+    truth = np.stack([synthetic_pose(i) for i in range(n_frames)])
+    noisy = truth.copy()
+    noisy[..., :3] += rng.normal(0.0, noise, truth[..., :3].shape).astype(np.float32)
+
+    smoother = OneEuroFilter()
+    smoothed = np.empty_like(noisy)
+    start = time.perf_counter()
+    for i in range(n_frames):
+        smoothed[i] = smoother.filter(noisy[i], i / fps)
+    elapsed = time.perf_counter() - start
+
+    true_angles = joint_angles(truth)
+    def rms(points):
+        return float(np.sqrt(np.nanmean((joint_angles(points) - true_angles) ** 2)))
+    return {
+        "us_per_frame": elapsed * 1e6 / n_frames,
+        "raw_rms_deg": rms(noisy),
+        "smoothed_rms_deg": rms(smoothed),
+    }
+
+
+def bench_metrics(n_records=200000, stages=12, fps=30.0):
+    """Aşama ölçümünün maliyetini ve gerçek zamanlı çalışmadaki payını ölçer.
+
+    Kare başına stages ölçüm (iki perf_counter ve bir kayıt) varsayılır.
+    """
+    metrics = StageMetrics()
+    names = [f"stage{i}" for i in range(stages)]
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for i in range(n_records):
+        t = perf_counter()
+        metrics.record(names[i % stages], perf_counter() - t)
+    per_record = (perf_counter() - start) / n_records
+    start = perf_counter()
+    summary = metrics.summary()
+    summary_s = perf_counter() - start
+    # Saniyede fps * stages kayıt ve bir özet (ekran katmanı)
+    overhead = per_record * stages * fps + summary_s
+    return {"us_per_record": per_record * 1e6, "summary_ms": summary_s * 1000.0,
+            "overhead_pct": overhead * 100.0}
+
+
+def synthetic_frames(n_frames, size=(640, 480)):
+    """SyntheticSource'tan n_frames adet BGR kare okur"""
+    source = SyntheticSource(n_frames, size=size)
+    return [frame for ok, frame in iter(source.read, (False, None))]
+
+
+def legacy_frame_path(raw):
+    """Eski kare yolu: aynala, kopyala, iki kez renk çevir, PIL ile boyutlandır"""
+    frame = cv2.flip(raw, 1)
+    display_frame = frame.copy()
+    image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) # MediaPipe için
+    img = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
+    img = Image.fromarray(img)
+    return image_rgb, img.resize((640, 480), Image.LANCZOS)
+
+
+def bench_frame_path(frames):
+    """Eski ve yeni kare yolunun hızını ve kare başına bellek ayırmasını ölçer"""
+    results = {}
+    with AllocationCounter() as counter:
+        start = time.perf_counter()
+        for raw in frames:
+            counter.measure(legacy_frame_path, raw)
+        results["legacy"] = (len(frames) / (time.perf_counter() - start), counter.bytes_per_frame)
+
+    pool = FramePool(frames[0].shape)
+    converter = FrameConverter()
+    scaler = DisplayScaler()
+
+    def new_path(raw):
+        rgb = converter.convert(raw, pool.acquire())
+        img = Image.fromarray(scaler.scale(rgb))
+        pool.release(rgb)
+        return img
+
+    new_path(frames[0]) # Tamponları ısıt
+    with AllocationCounter() as counter:
+        start = time.perf_counter()
+        for raw in frames:
+            counter.measure(new_path, raw)
+        results["buffered"] = (len(frames) / (time.perf_counter() - start), counter.bytes_per_frame)
+    return results
+
+
+def bench_render(frames):
+    """Eski (sil + yeni PhotoImage) ve yeni (paste) canvas yolunun kare başına
+    süresini milisaniye olarak ölçer. Ekran yoksa None döndürür."""
+    import tkinter as tk
+    from PIL import ImageTk
+    from canvas_renderer import CanvasRenderer
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    canvas = tk.Canvas(root, width=640, height=480, bg="black")
+    canvas.pack()
+    root.update()
+
+    results = {}
+    start = time.perf_counter()
+    for rgb in frames:
+        photo = ImageTk.PhotoImage(image=Image.fromarray(rgb))
+        canvas.delete("all")
+        canvas.create_image(0, 0, image=photo, anchor=tk.NW)
+        root.update_idletasks()
+    results["legacy"] = (time.perf_counter() - start) * 1000.0 / len(frames)
+
+    renderer = CanvasRenderer(canvas, (640, 480))
+    start = time.perf_counter()
+    for rgb in frames:
+        renderer.show_frame(rgb)
+        root.update_idletasks()
+    results["persistent"] = (time.perf_counter() - start) * 1000.0 / len(frames)
+
+    root.destroy()
+    return results
+
+
+def _draw_full_frame(frame, points, analysis):
+    """Eski çizim: kamera çözünürlüğünde kemik başına cv2.line, landmark başına
+    cv2.circle ve etiketler; kare ekran boyutuna daha sonra küçültülür."""
+    h, w = frame.shape[:2]
+    xy = (points[:, :2] * (w, h)).astype(int)
+    visible = points[:, 3] > 0.5
+    for a, b in POSE_CONNECTIONS:
+        if visible[a] and visible[b]:
+            cv2.line(frame, tuple(xy[a]), tuple(xy[b]), BONE_COLOR, 2)
+    for (x, y), is_visible in zip(xy, visible):
+        if is_visible:
+            cv2.circle(frame, (int(x), int(y)), 2, JOINT_COLOR, 2)
+    OverlayRenderer.draw_labels(frame, xy, analysis)
+
+
+def bench_drawing(landmark_frames, movement="Squat", sizes=((640, 480), (1280, 720), (1920, 1080)),
+                  display=(640, 480)):
+    """İskelet ve açı etiketlerinin kare başına çizim süresi (µs).
+
+    legacy: kamera çözünürlüğündeki karede tek tek çizim (kare sonra
+    küçültülür). overlay: ekran boyutuna küçültülmüş karede OverlayRenderer.
+    Küçültme iki yolda da aynı olduğundan ölçüme dahil değildir.
+    """
+    engine = ExerciseEngine(movement, smoothing=False)
+    inputs = []
+    for i, landmarks in enumerate(landmark_frames):
+        points = landmarks_to_array(landmarks)
+        inputs.append((points, engine.process_points(points, i / 30.0)))
+    overlay = OverlayRenderer()
+    passes = [(f"legacy_{w}x{h}", (w, h), _draw_full_frame) for w, h in sizes]
+    passes.append(("overlay", display, overlay.draw))
+    results = {}
+    for name, (w, h), draw_fn in passes:
+        frame = np.zeros((h, w, 3), dtype=np.uint8)
+
+        def draw(item):
+            draw_fn(frame, *item)
+
+        start = time.perf_counter()
+        for item in inputs:
+            draw(item)
+        results[f"{name}_us"] = (time.perf_counter() - start) / len(inputs) * 1e6
+        results[f"{name}_bytes_per_frame"] = allocations(draw, inputs)
+    return results
+
+
+def bench_pipeline(n_frames, movement="Squat", size=(640, 480)):
+    """Modelsiz uçtan uca arayüzsüz akış: kaynak okuma, renk dönüşümü ve
+    analiz. Poz tespiti yerine kaynağın gerçek landmarkları kullanılır."""
+    source = SyntheticSource(size=size)
+    converter = FrameConverter()
+    engine = ExerciseEngine(movement)
+    buffers = [None, None] # Ham ve RGB kare, ilk karede ayrılır
+
+    def step(i):
+        ret, buffers[0] = source.read(buffers[0])
+        buffers[1] = converter.convert(buffers[0], buffers[1])
+        engine.process_points(source.last_points, i / source.fps)
+
+    step(0)
+    start = time.perf_counter()
+    for i in range(1, n_frames):
+        step(i)
+    fps = (n_frames - 1) / (time.perf_counter() - start)
+    reps = engine.correct_count
+    return {"fps": fps, "reps": reps,
+            "bytes_per_frame": allocations(step, list(range(n_frames, n_frames + ALLOCATION_FRAMES)))}
+
+
+def bench_headless(n_frames, movement="Squat", size=(640, 480)):
+    """headless.analyze_video ile gerçek poz modeli dahil uçtan uca hızı ölçer.
+
+    Yapay kareler geçici bir videoya yazılır. Poz modeli yüklenemezse None.
+    """
+    import tempfile
+    from headless import analyze_video, create_pose
+
+    try:
+        pose = create_pose()
+    except (AttributeError, ImportError, RuntimeError):
+        return None
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "synthetic.avi")
+            writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"MJPG"), 30.0, size)
+            for frame in synthetic_frames(n_frames, size):
+                writer.write(frame)
+            writer.release()
+            start = time.perf_counter()
+            summary = analyze_video(video, movement, tmp, pose=pose)
+            elapsed = time.perf_counter() - start
+    finally:
+        pose.close()
+    return {"fps": summary["frames"] / elapsed, "reps": summary["reps"]}
+
+
+def bench_multi_session(streams=4, seconds=3.0, movement="Squat", workers=None):
+    """MultiSessionEngine'in işçi sayısına göre toplam hızını (kare/sn) ölçer.
+
+    Varsayılan işçi sayıları 1, 2, fiziksel çekirdek ve mantıksal CPU
+    sayısıdır; fiziksel çekirdekten sonra kazancın bitip bitmediği görülür.
+    Poz modeli yüklenemezse None.
+    """
+    from multi_session import MultiSessionEngine, physical_cores
+
+    try:
+        logical = len(os.sched_getaffinity(0))
+    except AttributeError:
+        logical = os.cpu_count() or 1
+    physical = physical_cores()
+    results = {"physical_cores": physical, "logical_cpus": logical}
+    for count in workers or sorted({1, min(2, logical), physical, logical}):
+        engine = MultiSessionEngine(workers=count)
+        try:
+            for i in range(streams):
+                engine.add_stream(f"istasyon-{i + 1}", "synthetic", movement)
+        except (AttributeError, ImportError, RuntimeError):
+            engine.stop()
+            return None
+        engine.start()
+        time.sleep(seconds)
+        stats = engine.stats()
+        engine.stop()
+        results[f"w{count}_fps"] = stats["average_fps"]
+    return results
+
+
+def bench_startup(modules=("pose_kamera", "headless", "replay"), repeat=3):
+    """Modüllerin yeni bir süreçte içe aktarılma süresini (ms, en iyi değer) ve
+    ağır kütüphanelerden (tkinter, PIL, cv2) hangilerini yüklediklerini ölçer"""
+    code = ("import sys, time; start = time.perf_counter(); import {}; "
+            "print((time.perf_counter() - start) * 1000.0, "
+            "*[m for m in ('tkinter', 'PIL', 'cv2') if m in sys.modules])")
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for module in modules:
+        times = []
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, "-c", code.format(module)], cwd=here,
+                                 capture_output=True, text=True, check=True).stdout.split()
+            times.append(float(out[0]))
+        results[module] = {"import_ms": min(times), "loaded": out[1:]}
+    return results
+
+
+# Son eki bu listede olan metrikler karşılaştırılır: True -> büyük olan iyi
+DIRECTIONS = {"_fps": True, "_ms": False, "_us": False, "bytes_per_frame": False, "_pct": False}
+BYTES_SLACK = 1024 # Bellek ölçümündeki küçük oynamalar gerileme sayılmaz
+
+
+def run_suite(landmark_frames, quick=False, log=print, session=None):
+    """Tüm aşamaları ölçer; düz {"aşama.metrik": değer} sözlüğü döndürür"""
+    log = log or (lambda *args: None)
+    results = {}
+    n_frames = len(landmark_frames)
+
+    angles = bench_angles(landmark_frames)
+    results.update({f"angles.{k}": v for k, v in angles.items()})
+    log(f"Açı hesabı ({len(JOINT_TRIPLES)} eklem/kare):")
+    log(f"  calculate_angle  {angles['scalar_fps']:12.0f} kare/sn")
+    log(f"  joint_angles     {angles['batched_fps']:12.0f} kare/sn")
+    log(f"  (kare, 33, 4)    {angles['stacked_fps']:12.0f} kare/sn")
+
+    access = bench_landmark_access(landmark_frames)
+    results.update({f"landmark_access.{k}": v for k, v in access.items()})
+    log("Landmark erişimi (Squat sol diz ve kalça açıları):")
+    for name, label in (("enum", "PoseLandmark zinciri"), ("table", "dizi + indeks tablosu"),
+                        ("protobuf_enum", "protobuf, zincir"), ("protobuf_table", "protobuf, dizi")):
+        if f"{name}_fps" in access:
+            log(f"  {label:22s} {access[f'{name}_fps']:10.0f} kare/sn")
+
+    sides = bench_side_selection(n_frames)
+    results.update({f"side_selection.{k}": v for k, v in sides.items()})
+    log(f"Taraf seçimi (Squat, yarı sürede sol taraf görünmez, beklenen {sides['expected_reps']} tekrar):")
+    for side, label in (("left", "sadece sol"), ("auto", "iki taraf (auto)")):
+        reps = ", ".join(f"{name.rsplit('_', 1)[1]}: {value}" for name, value in sides.items()
+                         if name.startswith(f"{side}_reps_"))
+        log(f"  {label:18s} belirsiz kare %{sides[f'{side}_uncertain_pct']:5.1f}  tekrar {reps}")
+
+    world = bench_world_angles(n_frames, session=session)
+    results.update({f"world_angles.{k}": v for k, v in world.items()})
+    log("Açı modu (2B görüntü / 3B dünya landmarkları), gerçek açıdan sapma:")
+    for name in sorted(k for k in world if k.startswith("2d_rms_yaw")):
+        yaw = name[len("2d_rms_yaw"):-len("_deg")]
+        log(f"  kamera açısı {yaw:>3s}°  2B {world[name]:5.1f}°  3B {world[f'3d_rms_yaw{yaw}_deg']:5.1f}°")
+    log(f"  maliyet: 2B {world['2d_us']:.1f} µs/kare, 3B {world['3d_us']:.1f} µs/kare")
+    if "session_mean_diff_deg" in world:
+        log(f"  kayıt: {world['session_world_frames']} karede 2B-3B ortalama fark "
+            f"{world['session_mean_diff_deg']:.1f}°")
+
+    widgets = bench_widgets(landmark_frames)
+    results.update({f"widgets.{k}": v for k, v in widgets.items()})
+    log(f"Etiket güncellemeleri (30 fps analiz, en fazla {DISPLAY_RATE:.0f} Hz):")
+    for name, label in (("direct", "her karede config"), ("view", "ViewModel (fark)")):
+        timing = f"  {widgets[f'{name}_us']:8.1f} µs/kare" if f"{name}_us" in widgets else ""
+        log(f"  {label:18s} {widgets[f'{name}_configs_per_frame']:5.2f} config/kare{timing}")
+
+    fsm = bench_rep_fsm(landmark_frames)
+    results["rep_fsm.update_fps"] = fsm["fps"]
+    log(f"Tekrar durum makinesi: {fsm['fps']:12.0f} güncelleme/sn ({fsm['reps']} tekrar)")
+
+    smoothing = bench_smoothing(n_frames)
+    results.update({f"smoothing.{k}": v for k, v in smoothing.items()})
+    log("Landmark yumuşatma (One-Euro):")
+    log(f"  {smoothing['us_per_frame']:.1f} µs/kare, açı hatası (RMS) "
+        f"ham {smoothing['raw_rms_deg']:.1f}° -> süzülmüş {smoothing['smoothed_rms_deg']:.1f}°")
+
+    cost = bench_metrics()
+    results.update({f"metrics.{k}": v for k, v in cost.items()})
+    log("Aşama ölçümü:")
+    log(f"  {cost['us_per_record']:.2f} µs/ölçüm, özet {cost['summary_ms']:.2f} ms, "
+        f"30 fps'te toplam pay %{cost['overhead_pct']:.3f}")
+
+    log("Analiz motoru:")
+    for movement in ExerciseEngine.movement_types:
+        result = bench_engine(landmark_frames, movement)
+        key = movement.lower().replace(" ", "_").replace("-", "")
+        results[f"engine.{key}_fps"] = result["fps"]
+        results[f"engine.{key}.bytes_per_frame"] = result["bytes_per_frame"]
+        log(f"  {movement:15s} {result['fps']:10.0f} kare/sn  "
+            f"{result['bytes_per_frame']:8.0f} B/kare  ({result['reps']} tekrar)")
+
+    drawing = bench_drawing(landmark_frames[:1000])
+    results.update({f"drawing.{k}": v for k, v in drawing.items()})
+    log("Çizim (iskelet + açı etiketleri):")
+    for key in (k[:-len("_us")] for k in drawing if k.endswith("_us")):
+        label = "overlay (640x480)" if key == "overlay" else key
+        log(f"  {label:18s} {drawing[key + '_us']:8.1f} µs/kare  {drawing[key + '_bytes_per_frame']:8.0f} B/kare")
+
+    for size in ((640, 480),) if quick else ((640, 480), (1280, 720)):
+        frame_path = bench_frame_path(synthetic_frames(100, size))
+        log(f"Kare yolu (PIL dönüşümü) {size[0]}x{size[1]}:")
+        for name, (fps, allocated) in frame_path.items():
+            results[f"frame_path.{size[0]}x{size[1]}.{name}_fps"] = fps
+            results[f"frame_path.{size[0]}x{size[1]}.{name}.bytes_per_frame"] = allocated
+            log(f"  {name:15s}  {fps:8.0f} kare/sn  {allocated / 1024:8.0f} KB/kare")
+
+    render = bench_render([frame[..., ::-1].copy() for frame in synthetic_frames(100)])
+    if render is None:
+        log("Canvas çizimi (Tk): ekran bulunamadı, atlandı")
+    else:
+        log("Canvas çizimi (Tk):")
+        for name, ms in render.items():
+            results[f"render.{name}_ms"] = ms
+            log(f"  {name:15s}  {ms:8.2f} ms/kare")
+
+    log("İçe aktarma (yeni süreç):")
+    for module, result in bench_startup().items():
+        results[f"startup.{module}.import_ms"] = result["import_ms"]
+        log(f"  {module:15s} {result['import_ms']:8.0f} ms"
+            f"{'  (' + '/'.join(result['loaded']) + ' yüklü)' if result['loaded'] else ''}")
+
+    pipeline = bench_pipeline(min(n_frames, 300 if quick else 1000))
+    results["pipeline.no_model_fps"] = pipeline["fps"]
+    results["pipeline.bytes_per_frame"] = pipeline["bytes_per_frame"]
+    log(f"Uçtan uca, modelsiz: {pipeline['fps']:8.0f} kare/sn  "
+        f"{pipeline['bytes_per_frame'] / 1024:8.1f} KB/kare")
+
+    headless = None if quick else bench_headless(min(n_frames, 300))
+    if headless is None:
+        log("Uçtan uca, poz modeliyle: atlandı")
+    else:
+        results["headless.analyze_video_fps"] = headless["fps"]
+        log(f"Uçtan uca, poz modeliyle: {headless['fps']:8.1f} kare/sn ({headless['reps']} tekrar)")
+
+    multi = None if quick else bench_multi_session()
+    if multi is None:
+        log("Çok istasyon (4 akış): atlandı")
+    else:
+        results.update({f"multi_session.{k}": v for k, v in multi.items() if k.endswith("_fps")})
+        log(f"Çok istasyon (4 akış, {multi['physical_cores']} fiziksel çekirdek, "
+            f"{multi['logical_cpus']} mantıksal CPU):")
+        for name in sorted((k for k in multi if k.endswith("_fps")), key=lambda k: int(k[1:-len("_fps")])):
+            log(f"  {name[1:-len('_fps')]:>3s} işçi  {multi[name]:8.1f} kare/sn")
+    return results
+
+
+def direction(name):
+    """Metrik için True (büyük iyi), False (küçük iyi) ya da None (karşılaştırılmaz)"""
+    for suffix, higher_is_better in DIRECTIONS.items():
+        if name.endswith(suffix):
+            return higher_is_better
+    return None
+
+
+def best_of(runs):
+    """Tekrarlanan ölçümlerden her metriğin en iyi değerini seçer"""
+    merged = {}
+    for name in runs[0]:
+        values = [run[name] for run in runs if name in run]
+        higher = direction(name)
+        merged[name] = max(values) if higher else min(values) if higher is False else values[-1]
+    return merged
+
+
+def compare(results, baseline, threshold=0.1):
+    """Eşikten (oran) fazla gerileyen metrikleri (ad, önceki, şimdiki) listesi olarak döndürür"""
+    regressions = []
+    for name, old in sorted(baseline.items()):
+        higher = direction(name)
+        new = results.get(name)
+        if higher is None or new is None:
+            continue
+        if higher:
+            worse = new < old * (1.0 - threshold)
+        else:
+            slack = BYTES_SLACK if name.endswith("bytes_per_frame") else 0.0
+            worse = new > old * (1.0 + threshold) + slack
+        if worse:
+            regressions.append((name, old, new))
+    return regressions
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.platform(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analiz motoru performans ölçümü")
+    parser.add_argument("--frames", type=int, default=10000, help="Ölçülecek kare sayısı")
+    parser.add_argument("--session", help="Yapay hareket yerine bu kayıtlı oturumun landmarkları")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Ölçüm tekrarı; her metriğin en iyi değeri alınır")
+    parser.add_argument("--quick", action="store_true",
+                        help="Büyük kare ve poz modeli ölçümlerini atla")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki JSON sonucu")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Gerileme sayılacak oran (0.1: %%10)")
+    args = parser.parse_args(argv)
+
+    if args.session:
+        landmark_frames = session_landmarks(args.session)[:args.frames]
+        if not landmark_frames:
+            raise SystemExit(f"Oturumda landmark bulunamadı: {args.session}")
+    else:
+        landmark_frames = synthetic_landmarks(args.frames)
+
+    runs = [run_suite(landmark_frames, args.quick, log=print if i == 0 else None, session=args.session)
+            for i in range(max(1, args.repeat))]
+    results = best_of(runs)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "frames": len(landmark_frames),
+        "source": args.session or "synthetic",
+        "environment": environment(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar yazıldı: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("environment") != report["environment"]:
+            print("Uyarı: baseline farklı bir ortamda ölçülmüş")
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"Gerileme (eşik %{args.threshold * 100:g}):")
+            for name, old, new in regressions:
+                print(f"  {name:45s} {old:12.1f} -> {new:12.1f} ({(new - old) / old * 100 if old else 0:+.1f}%)")
+            sys.exit(1)
+        print(f"Gerileme yok (eşik %{args.threshold * 100:g})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Hızlı kamera bulma ve yakalama ayarlarının belirlenmesi.
+
+Kamera indeksleri paralel ve zaman aşımlı olarak denenir; çalışan son
+kamera ve ayarları diske kaydedilir, sonraki açılışta önce o denenir.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+from frame_sources import CameraSource
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".spor_takip", "camera.json")
+
+# İstenen yakalama ayarları; kamera desteklemiyorsa kendi değerlerini kullanır
+DEFAULT_SETTINGS = {"width": 640, "height": 480, "fps": 30, "fourcc": "MJPG"}
+
+
+def _fourcc_to_str(value):
+    value = int(value)
+    return "".join(chr((value >> 8 * i) & 0xFF) for i in range(4)).strip("\x00")
+
+
+def negotiate(source, settings):
+    """Piksel formatı, çözünürlük ve FPS ayarlarını uygular; gerçekleşen değerleri döndürür"""
+    if settings.get("fourcc"):
+        source.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*settings["fourcc"]))
+    source.set(cv2.CAP_PROP_FRAME_WIDTH, settings["width"])
+    source.set(cv2.CAP_PROP_FRAME_HEIGHT, settings["height"])
+    source.set(cv2.CAP_PROP_FPS, settings["fps"])
+    return {
+        "width": int(source.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(source.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": round(source.get(cv2.CAP_PROP_FPS), 1),
+        "fourcc": _fourcc_to_str(source.get(cv2.CAP_PROP_FOURCC)),
+    }
+
+
+def probe_camera(index, settings):
+    """Kamerayı açar, ayarları uygular ve ilk kareyi okur.
+
+    Başarılıysa (kaynak, bilgi) döndürür, değilse None.
+    """
+    start = time.perf_counter()
+    source = CameraSource(index)
+    if not source.isOpened():
+        source.release()
+        return None
+    opened = time.perf_counter()
+    actual = negotiate(source, settings)
+    ret, _ = source.read()
+    if not ret:
+        source.release()
+        return None
+    return source, {
+        "index": index,
+        "settings": actual,
+        "open_ms": (opened - start) * 1000.0,
+        "first_frame_ms": (time.perf_counter() - start) * 1000.0,
+    }
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_cache(info, path=CACHE_PATH):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"index": info["index"], "settings": info["settings"]}, f)
+    except OSError:
+        pass # Önbellek yazılamazsa bir sonraki açılış sadece biraz yavaş olur
+
+
+def _probe_all(indices, settings, timeout):
+    """İndeksleri ayrı iş parçacıklarında aynı anda dener.
+
+    Takılan bir açılış beklenmez; zaman aşımında o ana kadar açılanlar
+    arasından listedeki ilk indeks seçilir, diğerleri kapatılır. (sonuç,
+    zaman aşımına kadar sonuçlanmayan indeksler) döndürür.
+    """
+    results = queue.Queue()
+
+    def worker(index):
+        try:
+            results.put((index, probe_camera(index, settings)))
+        except Exception:
+            results.put((index, None))
+
+    for index in indices:
+        threading.Thread(target=worker, args=(index,), name=f"probe-{index}", daemon=True).start()
+
+    found, resolved = {}, set()
+    deadline = time.perf_counter() + timeout
+    while len(resolved) < len(indices):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        try:
+            index, result = results.get(timeout=remaining)
+        except queue.Empty:
+            break
+        resolved.add(index)
+        if result is not None:
+            found[index] = result
+        # Sırada önde olan tüm indeksler sonuçlandıysa daha fazla bekleme
+        if _first_found(indices, found, resolved) is not None:
+            break
+
+    # Zaman aşımında sonuçlanmayan indeksler beklenmez; açılanların ilki seçilir
+    best = next((index for index in indices if index in found), None)
+    for index, (source, _) in found.items():
+        if index != best:
+            source.release()
+    # Zaman aşımından sonra açılan kameraları da kapat
+    pending = [index for index in indices if index not in resolved]
+    if pending:
+        threading.Thread(target=_release_late, args=(results, len(pending)), daemon=True).start()
+    return found.get(best), pending
+
+
+def _first_found(indices, found, resolved):
+    """Kendinden önceki tüm indeksler sonuçlanmış ilk çalışan indeks"""
+    for index in indices:
+        if index in found:
+            return index
+        if index not in resolved:
+            return None
+    return None
+
+
+def _release_late(results, pending):
+    for _ in range(pending):
+        try:
+            _, result = results.get(timeout=30.0)
+        except queue.Empty:
+            return
+        if result is not None:
+            result[0].release()
+
+
+def discover_camera(preferred=None, indices=range(5), timeout=3.0, settings=None, cache_path=CACHE_PATH):
+    """Çalışan bir kamera bulur; (CameraSource, bilgi) döndürür.
+
+    preferred verilmezse önce önbellekteki kamera kayıtlı ayarlarıyla
+    denenir. Olmazsa tercih edilen indeks başta olmak üzere tüm indeksler
+    paralel denenir; önbellekteki kamera zaman aşımına uğradıysa açılışı
+    hâlâ sürdüğünden yeniden denenmez. bilgi sözlüğü indeks, gerçekleşen ayarlar ve ilk
+    kareye kadar geçen süreyi içerir. Kamera bulunamazsa RuntimeError
+    fırlatır.
+    """
+    start = time.perf_counter()
+    cached = load_cache(cache_path) or {}
+    settings = dict(settings or DEFAULT_SETTINGS)
+    first = preferred if preferred is not None else cached.get("index")
+
+    result, hung = None, []
+    if first is not None and first == cached.get("index"):
+        result, hung = _probe_all([first], {**settings, **cached.get("settings", {})}, timeout)
+    if result is None:
+        order = ([first] if first is not None else []) + [i for i in indices if i != first]
+        order = [i for i in order if i not in hung] # Takılan açılışla aynı cihaz ikinci kez açılmaz
+        if order:
+            result, _ = _probe_all(order, settings, timeout)
+    if result is None:
+        raise RuntimeError(f"Kamera açılamadı ({list(indices)} denendi).")
+
+    source, info = result
+    info["time_to_first_frame_ms"] = (time.perf_counter() - start) * 1000.0
+    save_cache(info, cache_path)
+    return source, info
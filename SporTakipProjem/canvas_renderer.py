@@ -0,0 +1,49 @@
+import tkinter as tk
+
+
+class CanvasRenderer:
+    """Canvas üzerinde kalıcı tek bir görüntü öğesi ve PhotoImage tutar.
+
+    Her karede yeni PhotoImage ve canvas öğesi oluşturmak yerine mevcut
+    PhotoImage'in piksel verisi paste() ile yerinde güncellenir. PIL ve
+    PhotoImage ilk karede oluşturulur; pencere açılışını geciktirmez.
+    """
+
+    def __init__(self, canvas, size=(640, 480)):
+        self.canvas = canvas
+        self.size = size
+        self.photo = None
+        self._from_array = None
+        self.image_item = canvas.create_image(0, 0, anchor=tk.NW)
+        self.text_item = canvas.create_text(size[0] // 2, size[1] // 2, text="",
+                                            fill="white", font=("Arial", 16))
+        # İsteğe bağlı performans katmanı (aşama gecikmeleri), görüntünün üstünde
+        self.overlay_item = canvas.create_text(8, 8, text="", anchor=tk.NW, fill="#f1c40f",
+                                               font=("Courier", 9), state=tk.HIDDEN)
+        self._showing_image = True
+
+    def show_frame(self, rgb):
+        """size boyutundaki RGB kareyi ekrana basar"""
+        if self.photo is None:
+            from PIL import Image, ImageTk
+            self._from_array = Image.fromarray
+            self.photo = ImageTk.PhotoImage("RGB", self.size)
+            self.canvas.itemconfigure(self.image_item, image=self.photo)
+        self.photo.paste(self._from_array(rgb))
+        if not self._showing_image:
+            self.canvas.itemconfigure(self.image_item, state=tk.NORMAL)
+            self.canvas.itemconfigure(self.text_item, state=tk.HIDDEN)
+            self._showing_image = True
+
+    def show_overlay(self, text):
+        """Sol üst köşede performans katmanını gösterir"""
+        self.canvas.itemconfigure(self.overlay_item, text=text, state=tk.NORMAL)
+
+    def hide_overlay(self):
+        self.canvas.itemconfigure(self.overlay_item, state=tk.HIDDEN)
+
+    def show_message(self, text):
+        """Görüntüyü gizleyip siyah zemin üzerinde mesaj gösterir"""
+        self.canvas.itemconfigure(self.image_item, state=tk.HIDDEN)
+        self.canvas.itemconfigure(self.text_item, text=text, state=tk.NORMAL)
+        self._showing_image = False
@@ -0,0 +1,188 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from angles import joint_angles, landmarks_to_array
+from exercises import (ANGLE_LABELS, ANGLE_MODES, EXERCISES, MINIMUM, MOVEMENTS, STATUS_CODES, STATUS_MESSAGES,
+                       CompiledExercise)
+from rep_counter import TOP, RepStateMachine
+from smoothing import OneEuroFilter
+
+
+@dataclass
+class RepEvent:
+    """Sayılan bir tekrar"""
+    movement: str
+    timestamp: float
+    count: int
+
+
+@dataclass
+class AnalysisResult:
+    """Bir karenin analiz sonucu"""
+    timestamp: float
+    movement: str
+    status: str                                 # STATUS_MESSAGES anahtarı
+    is_correct: bool = False
+    angles: dict = field(default_factory=dict)  # Açı adı -> derece (hesaplanamadıysa None)
+    checks: dict = field(default_factory=dict)  # Açı adı -> hedefe uygun mu
+    count: int = 0
+    rep_event: RepEvent = None
+    phase: str = TOP                            # Tekrar durum makinesinin evresi
+    side: str = None                            # Açıların ölçüldüğü taraf ("left"/"right")
+    world: bool = False                         # Açılar 3B dünya landmarklarından mı
+
+    @property
+    def message(self):
+        return STATUS_MESSAGES[self.status]
+
+
+class ExerciseEngine:
+    """Landmark listesinden hareket doğruluğunu ve tekrarları hesaplar.
+
+    Arayüze, kameraya ve çizime bağımlı değildir; Tk uygulaması, headless
+    çalıştırıcı ve benchmark aynı motoru kullanır.
+    """
+
+    # Hareketler exercises.py'de veriyle tanımlanır
+    movement_types = MOVEMENTS
+
+    def __init__(self, movement=None, smoothing=True):
+        self.movement = movement or self.movement_types[0]
+        # Ölçülen landmarklar açı hesabından önce zamansal olarak yumuşatılır
+        self.smoother = OneEuroFilter() if smoothing else None
+        self.world_smoother = OneEuroFilter() if smoothing else None
+        self.smoothed_points = None # Son analizde kullanılan landmarklar
+        self.smoothed_world = None  # Son analizdeki dünya landmarkları (verildiyse)
+
+        # Ayarlanabilir parametreler; varsayılanlar hareket tanımlarından gelir.
+        # Hedef açı (eklemdeki açı) ve toleransı
+        self.target_angles = {name: ex.target_angle for name, ex in EXERCISES.items()}
+        self.angle_tolerance = 20 # Açı toleransı (derece)
+        # Değerlendirilen taraf: "auto" iki tarafı birlikte değerlendirir,
+        # "left"/"right" sadece o tarafı kullanır
+        self.side = "auto"
+        # Açı modu (hareket -> "2d"/"3d"). "3d" hareketlerde açılar dünya
+        # landmarklarından hesaplanır; dünya landmarkı olmayan karelerde
+        # (ör. uyarlamalı modda tahmin edilen kareler) 2B açılar kullanılır.
+        # 3B sadece kameraya eğik durulan çekimlerde daha doğrudur.
+        self.angle_modes = {name: ex.angle_mode for name, ex in EXERCISES.items()}
+
+        # Tekrar sayımı: hangi açı izlenir ve hareketin başlangıç (tepe) açısı.
+        # Tekrar, başlangıçtan hedef açıya inip geri dönünce sayılır.
+        self.rep_angles = {name: ex.rep_angle for name, ex in EXERCISES.items()}
+        self.rest_angles = {name: ex.rest_angle for name, ex in EXERCISES.items()}
+        self.rep_hysteresis = 10  # Bölgeden çıkış için ek mesafe (derece)
+        self.rep_min_dwell = 0.1  # Dipte doğru formun korunması gereken süre (sn)
+
+        # Alt sınır kontrolleri (ör. Squat'ta gövde açısı): hareket -> açı adı -> derece
+        self.min_angles = {
+            name: {check.name: check.minimum for check in ex.checks if check.kind == MINIMUM}
+            for name, ex in EXERCISES.items()
+        }
+
+        self._points = np.empty((33, 4), dtype=np.float32) # Her karede yeniden kullanılır
+        self._world = np.empty((33, 4), dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        """Sayaç durumunu sıfırlar ve hareket tanımını güncel parametrelerle derler"""
+        self.correct_count = 0
+        movement = self.movement
+        if self.angle_modes[movement] not in ANGLE_MODES:
+            raise ValueError(f"Bilinmeyen açı modu: {self.angle_modes[movement]}")
+        self.world_angles = self.angle_modes[movement] == "3d"
+        self.exercise = CompiledExercise(
+            EXERCISES[movement], self.target_angles[movement], self.angle_tolerance,
+            self.min_angles[movement], self.side
+        )
+        self.rep_fsm = RepStateMachine(
+            self.rest_angles[movement], self.target_angles[movement],
+            tolerance=self.angle_tolerance, hysteresis=self.rep_hysteresis,
+            min_dwell=self.rep_min_dwell
+        )
+
+    def set_movement(self, movement):
+        """Hareketi değiştirir ve sayacı sıfırlar"""
+        self.movement = movement
+        self.reset()
+
+    def process(self, landmarks, timestamp, world=None):
+        """Bir karenin MediaPipe landmarklarını analiz eder.
+
+        landmarks results.pose_landmarks ya da landmark listesi olabilir;
+        None ise (kişi bulunamadı) sayaç durumu değişmez. world
+        results.pose_world_landmarks'tır (bkz. process_points).
+        """
+        points = None
+        if landmarks is not None:
+            try:
+                points = landmarks_to_array(landmarks, self._points)
+            except IndexError:
+                return self._finish(timestamp, "MISSING_LANDMARKS", {}, {})
+        return self.process_points(points, timestamp, world=world)
+
+    def process_points(self, points, timestamp, predicted=False, world=None):
+        """(33, 4) landmark dizisini analiz eder.
+
+        predicted=True ise landmarklar zaten yumuşatılmış verilerden tahmin
+        edilmiştir ve filtreden geçirilmez. world dünya landmarkları
+        ((33, 4) dizi ya da results.pose_world_landmarks); verilirse
+        yumuşatılıp smoothed_world'de tutulur ve 3B açı modundaki
+        hareketlerde açılar bunlardan hesaplanır.
+        """
+        if self.smoother is not None and not predicted:
+            points = self.smoother.filter(points, timestamp)
+        self.smoothed_points = points
+        if points is not None and world is not None:
+            if not isinstance(world, np.ndarray):
+                try:
+                    world = landmarks_to_array(world, self._world)
+                except IndexError:
+                    world = None
+            if world is not None and self.world_smoother is not None:
+                world = self.world_smoother.filter(world, timestamp)
+        elif self.world_smoother is not None and not predicted:
+            self.world_smoother.reset()
+        self.smoothed_world = world if points is not None else None
+        if points is None:
+            return AnalysisResult(timestamp, self.movement, "NO_POSE", count=self.correct_count,
+                                  phase=self.rep_fsm.phase)
+
+        angles, checks = {}, {}
+        try:
+            # Tüm eklem açıları (iki taraf) karede bir kez, tek vektörel geçişte
+            # hesaplanır; hareketin kontrolleri derlenmiş indeks ve sınır
+            # dizileriyle uygulanır
+            exercise = self.exercise
+            world = self.world_angles and self.smoothed_world is not None
+            if world:
+                angles_all = joint_angles(self.smoothed_world, dims=3)
+                visibility = self.smoothed_world[:, 3] # Açıların geçerliliğiyle aynı görünürlük
+            else:
+                angles_all = joint_angles(points)
+                visibility = None
+            status, values, ok, side = exercise.evaluate_frame(angles_all, points, visibility)
+            for name, value, passed in zip(exercise.names, values, ok):
+                if value != value: # NaN: açı hesaplanamadı
+                    angles[name] = None
+                else:
+                    angles[name] = value
+                    checks[name] = passed
+            status = STATUS_CODES[status]
+        except Exception:
+            status, side, world = "ERROR", None, False
+        return self._finish(timestamp, status, angles, checks, side, world)
+
+    def _finish(self, timestamp, status, angles, checks, side=None, world=False):
+        """Sayaç durumunu günceller ve sonucu oluşturur"""
+        is_correct = status.startswith("CORRECT")
+        rep_event = None
+        # Tekrar, dipte doğru form korunup tepeye dönülünce bir kez sayılır
+        angle = angles.get(self.rep_angles[self.movement])
+        if self.rep_fsm.update(angle, is_correct, timestamp):
+            self.correct_count += 1
+            rep_event = RepEvent(self.movement, timestamp, self.correct_count)
+
+        return AnalysisResult(timestamp, self.movement, status, is_correct,
+                              angles, checks, self.correct_count, rep_event, self.rep_fsm.phase, side, world)
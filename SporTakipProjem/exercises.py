@@ -0,0 +1,346 @@
+"""Veriyle tanımlanan hareketler ve tanımlardan derlenen vektörel değerlendirici.
+
+Her hareket bir Exercise'tır: hangi eklem açılarının hangi sınırlarla
+kontrol edildiği, tekrarı hangi açının saydığı ve kontrol sonuçlarının
+hangi durum koduna karşılık geldiği. Tanım, hareket seçildiğinde (ve
+parametreler değiştiğinde) eklem indeksi ve sınır dizilerine derlenir;
+canlı analiz ve kayıtların yeniden puanlanması aynı derlenmiş tanımı kullanır.
+
+Yeni hareket eklemek için bir Exercise tanımlayıp register() ile
+kaydetmek yeterlidir; kare başına ek bir dallanma olmaz.
+
+Sol ve sağ taraf açıları aynı vektörel geçişte hesaplandığından taraf
+seçimi kare başınadır: side="auto" iken simetrik hareketlerde iki taraf
+görünürlükle ağırlıklandırılarak birleştirilir, Lunge'da önde olan bacak
+hareketin tarafı sayılır. Kişi kameraya diğer tarafını döndüğünde kareler
+"Pozisyon Belirsiz" olarak boşa gitmez.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from angles import JOINT_NAMES, JOINT_TRIPLES, JOINTS, MIN_VISIBILITY, NUM_LANDMARKS, PoseLandmark
+
+# Durum kodları ve arayüzde gösterilen mesajları. Kayıtlarda durum bu
+# sıradaki indeksle saklanır; yeni kodlar sadece sona eklenir.
+STATUS_MESSAGES = {
+    "CORRECT": "DOĞRU",
+    "CORRECT_TOP": "DOĞRU (TEPE)",
+    "LEG_WRONG": "BACAK YANLIŞ",
+    "TORSO_WRONG": "GÖVDE YANLIŞ",
+    "LEG_TORSO_WRONG": "BACAK & GÖVDE YANLIŞ",
+    "ANGLE_WRONG": "AÇI YANLIŞ",
+    "FRONT_KNEE_WRONG": "ÖN DİZ YANLIŞ",
+    "BACK_KNEE_WRONG": "ARKA DİZ YANLIŞ",
+    "KNEES_WRONG": "ÖN DİZ & ARKA DİZ YANLIŞ",
+    "UNCERTAIN": "Pozisyon Belirsiz",
+    "MISSING_LANDMARKS": "Landmarklar Eksik",
+    "ERROR": "Analiz Hatası",
+    "NO_POSE": "Kişi Bulunamadı",
+}
+STATUS_CODES = list(STATUS_MESSAGES)
+
+# Kontrol türleri
+RANGE = "range"     # hedef ± tolerans
+UPPER = "upper"     # en fazla hedef + tolerans
+LOWER = "lower"     # en az hedef - tolerans
+MINIMUM = "minimum" # en az minimum (toleranssız)
+
+OTHER_SIDE = {"left": "right", "right": "left"}
+SIDES = ("auto", "left", "right")
+
+# Açıların hesaplandığı koordinatlar: görüntüdeki 2B landmarklar ya da
+# MediaPipe'ın 3B dünya landmarkları (pose_world_landmarks, metre). 3B sadece
+# eğik çekimlerde kazandırır (bkz. Exercise)
+ANGLE_MODES = ("2d", "3d")
+
+# side="auto" iken iki tarafın birleştirilmesi
+FUSE = "fuse"   # Görünürlükle ağırlıklı ortalama (simetrik hareketler)
+FRONT = "front" # Dizi görüntüde daha yukarıda olan (öndeki) bacak hareketin tarafıdır
+
+
+@dataclass(frozen=True)
+class AngleCheck:
+    """Bir eklem açısının kontrolü ve kare üzerine yazılan etiketi.
+
+    joint taraf öneki olmadan verilir ("knee", "hip", "elbow", "shoulder");
+    side="same" karede seçilen tarafı, "other" karşı tarafı kullanır. Etiket,
+    açının ölçüldüğü landmarkın yanına yazılır; bad_color verilmişse
+    kontrol başarısızken o renk kullanılır (renkler RGB).
+    """
+    name: str
+    joint: str
+    kind: str = RANGE
+    minimum: float = None
+    side: str = "same"
+    label: str = ""
+    label_offset: tuple = (10, 0)
+    label_scale: float = 0.7
+    color: tuple = (50, 255, 255)
+    bad_color: tuple = None
+
+
+@dataclass(frozen=True)
+class Exercise:
+    """Veriyle tanımlanan bir hareket.
+
+    statuses: kontrol sonuçlarının durum kodları; indeksi başarısız
+    kontrollerin bit maskesidir (i. bit: checks[i] başarısız). Kontrol
+    açılarından biri hesaplanamazsa durum UNCERTAIN olur. rest_angle ve
+    target_angle tekrar sayımının tepe ve dip açılarıdır. pairing, taraf
+    otomatik seçilirken sol ve sağ açıların nasıl birleştirileceğidir.
+    angle_mode="3d" ise açılar dünya landmarklarından hesaplanır; sınırlar
+    kameranın bakış açısına bağlı olmayan gerçek eklem açılarına göredir.
+    Dünya landmarklarının derinliği daha gürültülü olduğundan 3B mod sadece
+    hareket düzlemi kameraya eğik durduğunda daha doğrudur; kameraya
+    yandan ya da önden bakılan çekimlerde 2B açıların hatası daha azdır.
+    """
+    name: str
+    target_angle: float
+    rest_angle: float
+    rep_angle: str
+    checks: tuple
+    statuses: tuple
+    pairing: str = FUSE
+    angle_mode: str = "2d"
+    messages: dict = field(default_factory=dict) # Bu harekete özgü yeni durum kodları
+
+
+EXERCISES = {}
+MOVEMENTS = []     # Kayıt sırası; kayıtlarda hareket bu indeksle saklanır
+ANGLE_LABELS = {}  # Hareket -> açı adı -> (ön ek, {taraf: landmark}, kayma, boyut, renk, hatalı renk)
+
+
+def register(exercise):
+    """Hareketi doğrulayıp kullanılabilir hareketlere ekler.
+
+    Önce tüm doğrulama yapılır; hareket reddedilirse durum mesajları ve
+    hareket tabloları değişmez.
+    """
+    names = [check.name for check in exercise.checks]
+    if len(exercise.statuses) != 2 ** len(names):
+        raise ValueError(f"{exercise.name}: {2 ** len(names)} durum kodu bekleniyordu")
+    if exercise.pairing not in (FUSE, FRONT):
+        raise ValueError(f"{exercise.name}: bilinmeyen taraf birleştirme: {exercise.pairing}")
+    if exercise.angle_mode not in ANGLE_MODES:
+        raise ValueError(f"{exercise.name}: bilinmeyen açı modu: {exercise.angle_mode}")
+    if exercise.rep_angle not in names:
+        raise ValueError(f"{exercise.name}: tekrar açısı kontroller arasında yok: {exercise.rep_angle}")
+    # Durum kodu ya kayıtlı olmalı ya da hareketin kendi mesajlarında tanımlanmalı
+    unknown = [code for code in exercise.statuses if code not in STATUS_MESSAGES and code not in exercise.messages]
+    if unknown:
+        raise ValueError(f"{exercise.name}: bilinmeyen durum kodları: {unknown}")
+    unknown = [joint_name(check, side) for check in exercise.checks for side in OTHER_SIDE
+               if joint_name(check, side) not in JOINTS]
+    if unknown:
+        raise ValueError(f"{exercise.name}: bilinmeyen eklemler: {unknown}")
+
+    for code, message in exercise.messages.items():
+        if code not in STATUS_MESSAGES:
+            STATUS_MESSAGES[code] = message
+            STATUS_CODES.append(code)
+    if exercise.name not in EXERCISES:
+        MOVEMENTS.append(exercise.name)
+    EXERCISES[exercise.name] = exercise
+    ANGLE_LABELS[exercise.name] = {
+        check.name: (check.label, {side: int(JOINTS[joint_name(check, side)][1]) for side in OTHER_SIDE},
+                     check.label_offset, check.label_scale, check.color, check.bad_color)
+        for check in exercise.checks
+    }
+    return exercise
+
+
+def joint_name(check, side):
+    """Kontrolün, karede seçilen taraf side iken ölçüldüğü eklem"""
+    if check.side == "other":
+        side = OTHER_SIDE[side]
+    return f"{side}_{check.joint}"
+
+
+class CompiledExercise:
+    """Hareketin verilen hedef, tolerans, minimumlar ve tarafla derlenmiş hali.
+
+    evaluate() JOINT_NAMES sırasındaki (kare, eklem) açı dizisini, canlı
+    analizdeki tek kare için evaluate_frame() (eklem,) dizisini alır; ikisi
+    aynı derlenmiş sınırları kullanır. side="auto" iken taraf seçimi için
+    landmarklar da (points) verilmelidir.
+    """
+
+    def __init__(self, exercise, target_angle, tolerance, minimums=None, side="auto"):
+        if side not in SIDES:
+            raise ValueError(f"Bilinmeyen taraf: {side}")
+        minimums = minimums or {}
+        self.exercise = exercise
+        self.side = side
+        self.names = [check.name for check in exercise.checks]
+        # (taraf, kontrol) eklem indeksleri; taraf otomatikse sol ve sağ iki satır
+        sides = tuple(OTHER_SIDE) if side == "auto" else (side,)
+        self.joints = np.array([[JOINT_NAMES.index(joint_name(check, s)) for check in exercise.checks]
+                                for s in sides], dtype=np.intp)
+        self._visibility = JOINT_TRIPLES[self.joints] # (taraf, kontrol, 3) landmark indeksleri
+        bounds = {
+            RANGE: (target_angle - tolerance, target_angle + tolerance),
+            UPPER: (-np.inf, target_angle + tolerance),
+            LOWER: (target_angle - tolerance, np.inf),
+        }
+        lower, upper = [], []
+        for check in exercise.checks:
+            if check.kind == MINIMUM:
+                low, high = minimums.get(check.name, check.minimum), np.inf
+            else:
+                low, high = bounds[check.kind]
+            lower.append(low)
+            upper.append(high)
+        self.lower = np.array(lower, dtype=np.float64)
+        self.upper = np.array(upper, dtype=np.float64)
+        self.bits = 1 << np.arange(len(self.names))
+        # İndeks: başarısız kontrollerin bit maskesi; açılardan biri NaN ise
+        # ayrıca 2^n eklenir ve tablonun ikinci yarısı UNCERTAIN'dır
+        uncertain = STATUS_CODES.index("UNCERTAIN")
+        self.status_table = np.array([STATUS_CODES.index(code) for code in exercise.statuses]
+                                     + [uncertain] * len(exercise.statuses), dtype=np.uint8)
+        self.rep_check = self.names.index(exercise.rep_angle)
+        self._frame_joints = self.joints.tolist()
+        self._frame_visibility = self._visibility.tolist()
+        self._frame_bounds = list(zip(lower, upper))
+        self._frame_table = self.status_table.tolist()
+
+    def check_angles(self, angles, points=None, visibility=None):
+        """Kontrol açılarını (..., kontrol) ve sağ tarafın seçildiği kareleri (...) döndürür.
+
+        FUSE birleştirmede her kontrolün sol ve sağ açısı, eklem üçlüsünün
+        en düşük görünürlüğünün MIN_VISIBILITY'yi aştığı miktarla
+        ağırlıklandırılır; hesaplanamayan tarafın ağırlığı sıfırdır. Sağ
+        tarafın toplam ağırlığı büyükse kare sağ taraftan sayılır.
+        visibility (..., 33) açıların hesaplandığı landmarkların
+        görünürlüğüdür (3B modda dünya landmarkları); verilmezse points'inki
+        kullanılır. Ağırlıklar negatif olamaz.
+        """
+        values = angles.take(self.joints, axis=-1) # (..., taraf, kontrol)
+        if len(self.joints) == 1:
+            return values[..., 0, :], np.full(values.shape[:-2], self.side == "right")
+        if self.exercise.pairing == FRONT:
+            right = points[..., PoseLandmark.RIGHT_KNEE, 1] < points[..., PoseLandmark.LEFT_KNEE, 1]
+            return np.where(right[..., None], values[..., 1, :], values[..., 0, :]), right
+        values = values.astype(np.float64)
+        valid = ~np.isnan(values)
+        if visibility is None and points is not None:
+            visibility = points[..., 3]
+        if visibility is None:
+            weight = valid.astype(np.float64)
+        else:
+            visibility = visibility.take(self._visibility, axis=-1).min(axis=-1).astype(np.float64)
+            weight = np.where(valid, np.clip(visibility - MIN_VISIBILITY, 0.0, None), 0.0)
+        values = np.where(valid, values, 0.0)
+        left, right = weight[..., 0, :], weight[..., 1, :]
+        with np.errstate(invalid="ignore"):
+            fused = (values[..., 0, :] * left + values[..., 1, :] * right) / (left + right)
+        return fused, right.sum(axis=-1) > left.sum(axis=-1)
+
+    def evaluate(self, angles, points=None, visibility=None):
+        """(kare, eklem) açılarından (durum indeksleri, kontrol açıları, kontrol
+        sonuçları) döndürür.
+
+        Kontrol açıları ve sonuçları (kare, kontrol) boyutludur; NaN açının
+        kontrolü False sayılır ve durum UNCERTAIN olur.
+        """
+        values, _ = self.check_angles(angles, points, visibility)
+        ok = (values >= self.lower) & (values <= self.upper)
+        index = np.dot(~ok, self.bits) + (np.isnan(values).any(axis=-1) << len(self.names))
+        return self.status_table[index], values, ok
+
+    def evaluate_frame(self, angles, points=None, visibility=None):
+        """Tek karenin (eklem,) açılarından (durum indeksi, açı listesi, sonuç
+        listesi, seçilen taraf) döndürür.
+
+        Birkaç elemanlık dizilerde NumPy çağrı maliyeti hesabın kendisinden
+        büyük olduğundan check_angles() ile aynı işlemler Python sayılarıyla
+        aynı sırada uygulanır.
+        """
+        angles = angles.tolist()
+        joints = self._frame_joints
+        if len(joints) == 1:
+            side = self.side
+            values = [angles[joint] for joint in joints[0]]
+        elif self.exercise.pairing == FRONT:
+            right = bool(points[PoseLandmark.RIGHT_KNEE, 1] < points[PoseLandmark.LEFT_KNEE, 1])
+            side = "right" if right else "left"
+            values = [angles[joint] for joint in joints[right]]
+        else:
+            if visibility is None:
+                visibility = [1.0 + MIN_VISIBILITY] * NUM_LANDMARKS if points is None else points[:, 3].tolist()
+            else:
+                visibility = visibility.tolist()
+            values, totals = [], [0.0, 0.0]
+            for joint_left, joint_right, triple_left, triple_right in zip(*joints, *self._frame_visibility):
+                left, right = angles[joint_left], angles[joint_right]
+                weight_left = weight_right = 0.0
+                if left == left:
+                    weight_left = max(min(visibility[i] for i in triple_left) - MIN_VISIBILITY, 0.0)
+                else:
+                    left = 0.0
+                if right == right:
+                    weight_right = max(min(visibility[i] for i in triple_right) - MIN_VISIBILITY, 0.0)
+                else:
+                    right = 0.0
+                total = weight_left + weight_right
+                values.append((left * weight_left + right * weight_right) / total if total else float("nan"))
+                totals[0] += weight_left
+                totals[1] += weight_right
+            side = "right" if totals[1] > totals[0] else "left"
+
+        ok = []
+        index = 0
+        uncertain = False
+        for bit, (value, (low, high)) in enumerate(zip(values, self._frame_bounds)):
+            passed = low <= value <= high
+            ok.append(passed)
+            if not passed:
+                index |= 1 << bit
+                uncertain |= value != value
+        if uncertain:
+            index += len(self._frame_table) // 2
+        return self._frame_table[index], values, ok, side
+
+
+for _exercise in (
+    Exercise(
+        "Squat", target_angle=90, rest_angle=170, rep_angle="leg",
+        checks=(
+            # Dizdeki açı
+            AngleCheck("leg", "knee", label="Bacak: ", color=(50, 255, 50)),
+            # Kalçadaki açı (omuz-kalça-diz): gövdenin femura göre ne kadar dik
+            # olduğunu gösterir; aşırı öne eğilmeyi engellemek için alt sınır
+            AngleCheck("torso", "hip", MINIMUM, minimum=70, label="Govde: ", label_offset=(-80, -20),
+                       color=(50, 255, 50), bad_color=(50, 50, 255)),
+        ),
+        statuses=("CORRECT", "LEG_WRONG", "TORSO_WRONG", "LEG_TORSO_WRONG"),
+    ),
+    Exercise(
+        "Push-up", target_angle=90, rest_angle=160, rep_angle="elbow",
+        checks=(AngleCheck("elbow", "elbow"),),
+        statuses=("CORRECT", "ANGLE_WRONG"),
+    ),
+    Exercise(
+        # Ön bacak karede seçilen taraf, arka bacak karşı taraf; iki diz de hedefe yakın olmalı
+        "Lunge", target_angle=90, rest_angle=170, rep_angle="front_knee", pairing=FRONT,
+        checks=(
+            AngleCheck("front_knee", "knee", label="On: ", label_scale=0.6),
+            AngleCheck("back_knee", "knee", side="other", label="Arka: ", label_scale=0.6),
+        ),
+        statuses=("CORRECT", "FRONT_KNEE_WRONG", "BACK_KNEE_WRONG", "KNEES_WRONG"),
+    ),
+    Exercise(
+        # Tepe noktasında kol bükülü: açı hedef + toleranstan küçük olmalı
+        "Bicep Curl", target_angle=30, rest_angle=160, rep_angle="elbow",
+        checks=(AngleCheck("elbow", "elbow", UPPER),),
+        statuses=("CORRECT_TOP", "ANGLE_WRONG"),
+    ),
+    Exercise(
+        # Kollar yukarıdayken düz: açı hedef - toleranstan büyük olmalı
+        "Shoulder Press", target_angle=170, rest_angle=90, rep_angle="elbow",
+        checks=(AngleCheck("elbow", "elbow", LOWER, label="Dirsek: "),),
+        statuses=("CORRECT_TOP", "ANGLE_WRONG"),
+    ),
+):
+    register(_exercise)
@@ -0,0 +1,136 @@
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import cv2
+import numpy as np
+
+DISPLAY_SIZE = (640, 480) # Canvas boyutu (genişlik, yükseklik)
+
+
+class FramePool:
+    """Aynı boyutlu kare tamponlarını yeniden kullanmak için havuz.
+
+    Boş tampon kalmazsa yenisi ayrılır; iade edilen tamponlar tekrar verilir.
+    Böylece kararlı durumda kare başına bellek ayrılmaz.
+    """
+
+    def __init__(self, shape, dtype=np.uint8, size=6):
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.allocated = 0
+        self._free = deque()
+        self._lock = threading.Lock()
+        for _ in range(size):
+            self._free.append(self._allocate())
+
+    def _allocate(self):
+        self.allocated += 1
+        return np.empty(self.shape, dtype=self.dtype)
+
+    def acquire(self):
+        """Boş bir tampon verir"""
+        with self._lock:
+            if self._free:
+                return self._free.popleft()
+            return self._allocate()
+
+    def release(self, buf):
+        """Tamponu havuza iade eder"""
+        if buf is not None and buf.shape == self.shape:
+            with self._lock:
+                self._free.append(buf)
+
+
+class FrameConverter:
+    """Ham BGR kareyi aynalanmış RGB tampona çevirir.
+
+    RGB kare hem MediaPipe'a hem ekrana verilir; ara tampon yeniden kullanılır.
+    metrics verilirse aynalama ve renk çevrimi süreleri ayrı ayrı kaydedilir.
+    """
+
+    def __init__(self, mirror=True, metrics=None):
+        self.mirror = mirror
+        self.metrics = metrics
+        self._tmp = None
+
+    def convert(self, raw, out):
+        """raw (BGR) -> out (RGB, gerekirse aynalanmış)"""
+        start = time.perf_counter()
+        src = raw
+        if self.mirror:
+            if self._tmp is None or self._tmp.shape != raw.shape:
+                self._tmp = np.empty_like(raw)
+            src = cv2.flip(raw, 1, dst=self._tmp)
+        flipped = time.perf_counter()
+        out = cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=out)
+        if self.metrics is not None:
+            if self.mirror:
+                self.metrics.record("flip", flipped - start)
+            self.metrics.record("color", time.perf_counter() - flipped)
+        return out
+
+
+class DisplayScaler:
+    """RGB kareyi canvas boyutuna getirir; boyut zaten uygunsa kopyalamaz"""
+
+    def __init__(self, size=DISPLAY_SIZE):
+        self.size = size
+        self._buf = None
+
+    def scale(self, rgb):
+        if (rgb.shape[1], rgb.shape[0]) == self.size:
+            return rgb
+        if self._buf is None:
+            self._buf = np.empty((self.size[1], self.size[0], 3), dtype=np.uint8)
+        return cv2.resize(rgb, self.size, dst=self._buf, interpolation=cv2.INTER_AREA)
+
+
+def scale_frame(frame, scale, out=None):
+    """Kareyi çıkarım giriş ölçeğine küçültür; ölçek 1 ise kareyi olduğu gibi döndürür.
+
+    out boyutu uygunsa yeniden kullanılır; çağıran dönen diziyi saklamalıdır.
+    """
+    if scale >= 1.0:
+        return frame
+    h, w = frame.shape[:2]
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    if out is None or out.shape[:2] != (size[1], size[0]):
+        out = np.empty((size[1], size[0], 3), dtype=np.uint8)
+    return cv2.resize(frame, size, dst=out, interpolation=cv2.INTER_AREA)
+
+
+class AllocationCounter:
+    """tracemalloc ile kare başına ayrılan bellek tepe değerini ölçer.
+
+    NumPy ve OpenCV dizileri izlenir; PIL'in kendi ayırdığı bellek görünmez.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.total_bytes = 0
+        self._started_here = False
+
+    def __enter__(self):
+        self._started_here = not tracemalloc.is_tracing()
+        if self._started_here:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._started_here:
+            tracemalloc.stop()
+
+    def measure(self, fn, *args):
+        """fn(*args) çağrısı sırasında ayrılan ek belleği kaydeder"""
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn(*args)
+        self.total_bytes += tracemalloc.get_traced_memory()[1] - before
+        self.frames += 1
+        return result
+
+    @property
+    def bytes_per_frame(self):
+        return self.total_bytes / self.frames if self.frames else 0.0
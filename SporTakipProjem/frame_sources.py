@@ -0,0 +1,223 @@
+"""Kare kaynakları: kamera, video dosyası, resim klasörü, RTSP ve yapay kaynak.
+
+Tüm kaynaklar cv2.VideoCapture ile aynı read()/isOpened()/release()
+arayüzünü sunar; analiz döngüsü hangisinin kullanıldığını bilmez.
+"""
+import math
+import os
+import time
+
+import cv2
+import numpy as np
+
+from angles import POSE_CONNECTIONS
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class FrameSource:
+    """Kare kaynağı arayüzü.
+
+    mirror: kareler analizden önce aynalanmalı mı (ön kamera görüntüsü).
+    realtime: kaynak kendi hızında mı üretir (kamera, RTSP), yoksa
+    okunduğu kadar hızlı mı (dosya, yapay kaynak).
+    """
+
+    mirror = False
+    realtime = False
+
+    def read(self, image=None):
+        """(ret, BGR kare) döndürür; image verilirse mümkünse onun içine okur"""
+        raise NotImplementedError
+
+    def isOpened(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    @property
+    def fps(self):
+        return 30.0
+
+
+class CaptureSource(FrameSource):
+    """cv2.VideoCapture tabanlı kaynak (kamera, video dosyası, RTSP)"""
+
+    def __init__(self, target, api=cv2.CAP_ANY):
+        self.target = target
+        self.vid = cv2.VideoCapture(target, api)
+
+    def read(self, image=None):
+        return self.vid.read(image)
+
+    def isOpened(self):
+        return self.vid.isOpened()
+
+    def release(self):
+        self.vid.release()
+
+    def get(self, prop):
+        return self.vid.get(prop)
+
+    def set(self, prop, value):
+        return self.vid.set(prop, value)
+
+    @property
+    def fps(self):
+        return self.vid.get(cv2.CAP_PROP_FPS) or 30.0
+
+
+class CameraSource(CaptureSource):
+    """Yerel kamera; görüntü ayna gibi gösterilir"""
+
+    mirror = True
+    realtime = True
+
+    def __init__(self, index=0):
+        super().__init__(index)
+
+
+class VideoFileSource(CaptureSource):
+    """Kayıtlı video dosyası; codec'in izin verdiği hızda okunur"""
+
+    def __init__(self, path, mirror=True):
+        super().__init__(path)
+        self.mirror = mirror # Kamera kaydıysa canlı görüntüyle aynı yön
+
+
+class RtspSource(CaptureSource):
+    """Ağ kamerası (RTSP/HTTP); gecikmeyi azaltmak için tampon 1 kare"""
+
+    realtime = True
+
+    def __init__(self, url):
+        super().__init__(url, cv2.CAP_FFMPEG)
+        self.vid.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+
+class ImageDirectorySource(FrameSource):
+    """Klasördeki resimleri ad sırasıyla kare olarak verir"""
+
+    def __init__(self, path, fps=30.0, mirror=False):
+        self.paths = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.mirror = mirror
+        self._fps = fps
+        self._index = 0
+
+    def read(self, image=None):
+        while self._index < len(self.paths):
+            frame = cv2.imread(self.paths[self._index])
+            self._index += 1
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    @property
+    def fps(self):
+        return self._fps
+
+
+def synthetic_pose(frame_index, period=60, out=None):
+    """Bilinen harekete sahip yapay (33, 4) landmark dizisi üretir.
+
+    Diz ve dirsek açıları period karede bir 180° ile 30° arasında salınır;
+    gövde dik kalır. Sütunlar: x, y, z, visibility (normalize koordinat).
+    """
+    if out is None:
+        out = np.empty((33, 4), dtype=np.float32)
+    phase = 0.5 - 0.5 * math.cos(2 * math.pi * frame_index / period)
+    theta = math.radians(180 - 150 * phase)
+    bend_x, bend_y = 0.15 * math.sin(theta), -0.15 * math.cos(theta)
+
+    out[:] = (0.5, 0.2, 0.0, 0.99) # Yüz noktaları başın üstünde toplanır
+    for side, dx in ((0, -0.05), (1, 0.05)):
+        shoulder, elbow, wrist = 11 + side, 13 + side, 15 + side
+        hip, knee, ankle = 23 + side, 25 + side, 27 + side
+        out[shoulder, :2] = (0.5 + dx, 0.3)
+        out[elbow, :2] = (0.5 + dx, 0.45)
+        out[wrist, :2] = (0.5 + dx + bend_x, 0.45 + bend_y)
+        out[hip, :2] = (0.5 + dx, 0.55)
+        out[knee, :2] = (0.5 + dx, 0.7)
+        out[ankle, :2] = (0.5 + dx + bend_x, 0.7 + bend_y)
+        for foot in (29 + side, 31 + side):
+            out[foot, :2] = out[ankle, :2]
+        for hand in (17 + side, 19 + side, 21 + side):
+            out[hand, :2] = out[wrist, :2]
+    return out
+
+
+class SyntheticSource(FrameSource):
+    """Bilinen landmark hareketini çöp adam olarak çizen deterministik kaynak.
+
+    Her karenin gerçek landmarkları last_points içinde tutulur; böylece
+    kamera olmadan yük testi ve doğruluk karşılaştırması yapılabilir.
+    realtime=False iken kareler beklemeden üretilir.
+    """
+
+    def __init__(self, n_frames=None, size=(640, 480), fps=30.0, period=60, realtime=False):
+        self.n_frames = n_frames
+        self.size = size
+        self.period = period
+        self.realtime = realtime
+        self._fps = fps
+        self._index = 0
+        self._next_time = None
+        self._connections = list(POSE_CONNECTIONS)
+        self.last_points = np.empty((33, 4), dtype=np.float32)
+
+    def read(self, image=None):
+        if self.n_frames is not None and self._index >= self.n_frames:
+            return False, None
+        if self.realtime:
+            now = time.perf_counter()
+            if self._next_time is not None and now < self._next_time:
+                time.sleep(self._next_time - now)
+            self._next_time = max(now, self._next_time or now) + 1.0 / self._fps
+
+        w, h = self.size
+        if image is None or image.shape != (h, w, 3):
+            image = np.empty((h, w, 3), dtype=np.uint8)
+        image[:] = 0
+        points = synthetic_pose(self._index, self.period, self.last_points)
+        xy = (points[:, :2] * (w, h)).astype(np.int32)
+        for a, b in self._connections:
+            cv2.line(image, (int(xy[a, 0]), int(xy[a, 1])), (int(xy[b, 0]), int(xy[b, 1])),
+                     (255, 255, 255), 4)
+        self._index += 1
+        return True, image
+
+    def isOpened(self):
+        return True
+
+    @property
+    def fps(self):
+        return self._fps
+
+
+def open_source(spec, mirror=None):
+    """Kaynak tanımından uygun FrameSource nesnesini oluşturur.
+
+    spec: kamera indeksi (0, "1"), "rtsp://..." adresi, resim klasörü,
+    "synthetic" ya da video dosyası yolu. mirror verilirse kaynağın
+    varsayılan aynalama ayarını ezer.
+    """
+    if isinstance(spec, int) or str(spec).isdigit():
+        source = CameraSource(int(spec))
+    elif str(spec).startswith(("rtsp://", "http://", "https://")):
+        source = RtspSource(spec)
+    elif spec == "synthetic":
+        source = SyntheticSource(realtime=True)
+    elif os.path.isdir(spec):
+        source = ImageDirectorySource(spec)
+    else:
+        source = VideoFileSource(spec)
+    if mirror is not None:
+        source.mirror = mirror
+    return source
@@ -0,0 +1,187 @@
+"""Kayıtlı videolar için arayüzsüz (headless) toplu analiz.
+
+Örnek:
+    python headless.py kayitlar/ --movement Squat --output sonuclar/ --workers 4
+"""
+import argparse
+import csv
+import os
+import logging
+from dataclasses import replace
+from multiprocessing import Pool
+
+from engine import ExerciseEngine
+from frame_buffers import FrameConverter
+from frame_sources import open_source
+from roi import RoiTracker
+from pose_settings import PoseSettings
+
+# TensorFlow ve MediaPipe uyarılarını bastır
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+logging.getLogger('mediapipe').setLevel(logging.ERROR)
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv")
+
+# Her işçi süreçte bir kez oluşturulan Pose modeli
+_worker_pose = None
+
+
+def create_pose(static_image_mode=False, settings=None):
+    """Pose modeli oluşturur; ayar verilmezse varsayılan (en doğru) ayarlar kullanılır.
+
+    static_image_mode=True iken kareler arası takip yapılmaz; model
+    birbirinden bağımsız akışların kareleri arasında paylaşılabilir.
+    """
+    settings = settings or PoseSettings()
+    if static_image_mode:
+        settings = replace(settings, static_image_mode=True)
+    return settings.create_pose()
+
+
+def find_videos(path):
+    """Verilen yol bir klasörse içindeki videoları, değilse kendisini döndürür.
+
+    Video içermeyen klasör tek bir resim dizisi kaynağı olarak ele alınır.
+    """
+    if os.path.isdir(path):
+        videos = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(VIDEO_EXTENSIONS)
+        )
+        return videos or [path]
+    return [path]
+
+
+def analyze_video(video_path, movement, output_dir, pose=None, mirror=True, roi=False):
+    """Videoyu (veya open_source'un açabildiği herhangi bir kaynağı) kare kare
+    analiz eder, kare bazlı açıları CSV'ye yazar.
+
+    Kareler codec'in izin verdiği hızda okunur; bekleme yapılmaz.
+    roi=True ise kişi bulunduktan sonra çıkarım etrafındaki kırpılmış
+    bölgede yapılır. Özet bilgileri içeren bir sözlük döndürür.
+    """
+    own_pose = pose is None
+    if own_pose:
+        pose = create_pose()
+    engine = ExerciseEngine(movement)
+
+    vid = open_source(video_path, mirror=mirror)
+    if not vid.isOpened():
+        raise RuntimeError(f"Video açılamadı: {video_path}")
+    fps = vid.fps
+
+    converter = FrameConverter(mirror=vid.mirror) # Canlı kamerayla aynı yön
+    tracker = RoiTracker() if roi else None
+    raw = image_rgb = None # İlk karede ayrılır, sonra yeniden kullanılır
+
+    name = os.path.splitext(os.path.basename(os.path.normpath(video_path)))[0]
+    csv_path = os.path.join(output_dir, f"{name}.{movement.replace(' ', '_')}.csv")
+    frame_idx = 0
+    try:
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "time_s", "angles", "status", "rep", "count"])
+            while True:
+                ret, raw = vid.read(raw)
+                if not ret:
+                    break
+                image_rgb = converter.convert(raw, image_rgb)
+                if tracker:
+                    results, points = tracker.process(pose, image_rgb)
+                    analysis = engine.process_points(points, frame_idx / fps,
+                                                     world=results.pose_world_landmarks)
+                else:
+                    results = pose.process(image_rgb)
+                    analysis = engine.process(results.pose_landmarks, frame_idx / fps,
+                                              results.pose_world_landmarks)
+
+                angles = ";".join(
+                    f"{key}={value:.1f}" for key, value in analysis.angles.items()
+                    if value is not None
+                )
+                writer.writerow([
+                    frame_idx, f"{analysis.timestamp:.3f}", angles, analysis.status,
+                    int(analysis.rep_event is not None), analysis.count
+                ])
+                frame_idx += 1
+    finally:
+        vid.release()
+        if own_pose:
+            pose.close()
+
+    summary = {
+        "video": video_path,
+        "movement": movement,
+        "frames": frame_idx,
+        "duration_s": round(frame_idx / fps, 2),
+        "reps": engine.correct_count,
+        "output": csv_path,
+    }
+    if tracker:
+        summary["crop_hit_rate"] = round(tracker.stats()["crop_hit_rate"], 3)
+    return summary
+
+
+def _init_worker():
+    global _worker_pose
+    _worker_pose = create_pose()
+
+
+def _analyze_in_worker(args):
+    video_path, movement, output_dir, mirror, roi = args
+    try:
+        return analyze_video(video_path, movement, output_dir, pose=_worker_pose, mirror=mirror, roi=roi)
+    except Exception as e:
+        return {"video": video_path, "movement": movement, "error": str(e)}
+
+
+def analyze_batch(paths, movement, output_dir, workers=None, mirror=True, roi=False):
+    """Videoları süreç havuzunda paralel analiz eder ve özet CSV yazar.
+
+    Her işçi süreç kendi Pose modelini bir kez yükler.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    videos = [video for path in paths for video in find_videos(path)]
+    jobs = [(video, movement, output_dir, mirror, roi) for video in videos]
+
+    summaries = []
+    with Pool(processes=workers, initializer=_init_worker) as pool:
+        for summary in pool.imap_unordered(_analyze_in_worker, jobs):
+            summaries.append(summary)
+            if "error" in summary:
+                print(f"HATA {summary['video']}: {summary['error']}")
+            else:
+                print(f"{summary['video']}: {summary['reps']} tekrar, {summary['frames']} kare")
+
+    summary_path = os.path.join(output_dir, "summary.csv")
+    with open(summary_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(
+            f, fieldnames=["video", "movement", "frames", "duration_s", "reps", "crop_hit_rate",
+                           "output", "error"]
+        )
+        writer.writeheader()
+        for summary in sorted(summaries, key=lambda s: s["video"]):
+            writer.writerow(summary)
+    return summaries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kayıtlı videolarda arayüzsüz hareket analizi")
+    parser.add_argument("paths", nargs="+", help="Video dosyası veya videoların bulunduğu klasör")
+    parser.add_argument("--movement", default="Squat", choices=ExerciseEngine.movement_types,
+                        help="Analiz edilecek hareket")
+    parser.add_argument("--output", default="sonuclar", help="Çıktı klasörü")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Paralel işçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--no-mirror", action="store_true",
+                        help="Kareleri aynalama (kamera görüntüsü zaten aynalıysa)")
+    parser.add_argument("--roi", action="store_true",
+                        help="Kişi bulunduktan sonra çıkarımı kırpılmış bölgede yap (720p/1080p için)")
+    args = parser.parse_args(argv)
+
+    analyze_batch(args.paths, args.movement, args.output,
+                  workers=args.workers, mirror=not args.no_mirror, roi=args.roi)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Aşama bazında gecikme ölçümü ve dışa aktarımı.
+
+Her aşamanın son ölçümleri sabit boyutlu bir halka tamponda tutulur;
+kayıt bir dizi atamasından ibarettir. Yüzdelikler sadece istendiğinde
+(ör. saniyede bir) hesaplanır. Sonuçlar JSON ya da Prometheus metin
+formatında alınabilir.
+"""
+import json
+import threading
+import time
+
+import numpy as np
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    """Son window ölçümün kayan penceresi (saniye cinsinden)"""
+
+    def __init__(self, window=1024):
+        self._values = np.zeros(window, dtype=np.float64)
+        self._index = 0
+        self.count = 0   # Toplam ölçüm sayısı
+        self.total = 0.0 # Toplam süre (sn)
+
+    def record(self, seconds):
+        self._values[self._index] = seconds
+        self._index = (self._index + 1) % len(self._values)
+        self.count += 1
+        self.total += seconds
+
+    def summary(self):
+        """Penceredeki ölçümlerin yüzdeliklerini (ms) döndürür"""
+        values = self._values[:min(self.count, len(self._values))]
+        if not len(values):
+            return {"count": 0}
+        p = np.percentile(values, [q * 100 for q in QUANTILES]) * 1000.0
+        return {
+            "count": self.count,
+            "mean_ms": float(values.mean() * 1000.0),
+            "p50_ms": float(p[0]),
+            "p95_ms": float(p[1]),
+            "p99_ms": float(p[2]),
+        }
+
+
+class _Timer:
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.stage, time.perf_counter() - self.start)
+
+
+class StageMetrics:
+    """Aşama adı -> LatencyHistogram.
+
+    Ölçüm için record(aşama, saniye) ya da "with metrics.measure(aşama):"
+    kullanılır. Her aşama tek bir iş parçacığından kaydedilmelidir.
+    """
+
+    def __init__(self, window=1024, enabled=True):
+        self.window = window
+        self.enabled = enabled
+        self.stages = {}
+        self._lock = threading.Lock() # Sadece yeni aşama eklenirken
+
+    def record(self, stage, seconds):
+        if not self.enabled:
+            return
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.stages.setdefault(stage, LatencyHistogram(self.window))
+        histogram.record(seconds)
+
+    def measure(self, stage):
+        """Blok süresini ölçen bağlam yöneticisi"""
+        return _Timer(self, stage)
+
+    def summary(self):
+        return {stage: histogram.summary() for stage, histogram in list(self.stages.items())}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.summary(), **kwargs)
+
+    def to_prometheus(self, prefix="spor_takip"):
+        """Prometheus metin formatında özet (summary) metriği döndürür"""
+        name = f"{prefix}_stage_latency_seconds"
+        lines = [f"# HELP {name} Aşama gecikmesi (son {self.window} ölçüm)",
+                 f"# TYPE {name} summary"]
+        for stage, histogram in sorted(self.stages.items()):
+            values = histogram._values[:min(histogram.count, self.window)]
+            if len(values):
+                for q, value in zip(QUANTILES, np.percentile(values, [q * 100 for q in QUANTILES])):
+                    lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.total:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def format_overlay(self):
+        """Ekran katmanı için aşama başına tek satırlık özet"""
+        lines = []
+        for stage, s in self.summary().items():
+            if s["count"]:
+                lines.append(f"{stage:10s} p50 {s['p50_ms']:6.2f}  p95 {s['p95_ms']:6.2f}  "
+                             f"p99 {s['p99_ms']:6.2f} ms")
+        return "\n".join(lines)
+
+
+def serve(metrics, port=9100, host=""):
+    """/metrics (Prometheus) ve /metrics.json adreslerini arka planda sunar"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer # Sadece sunucu açılınca
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = metrics.to_json(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,292 @@
+"""Tek süreçte birden çok istasyonun (kamera akışının) analizi.
+
+Örnek:
+    python multi_session.py 0 1 synthetic --movement Squat --seconds 30
+"""
+import argparse
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from angles import landmarks_to_array
+from engine import ExerciseEngine
+from frame_sources import open_source
+from headless import create_pose
+from metrics import StageMetrics, serve
+from pipeline import CaptureThread, LatestFrameQueue, StageStats
+
+
+class _NotifyingQueue(LatestFrameQueue):
+    """Her yeni karede on_put çağıran en yeni kare kuyruğu"""
+
+    def __init__(self, on_put, on_drop=None):
+        super().__init__(maxsize=1, on_drop=on_drop)
+        self._on_put = on_put
+
+    def put(self, item):
+        super().put(item)
+        self._on_put()
+
+
+class StreamSession:
+    """Bir istasyon: kendi kaynağı, hareket seçimi, sayacı ve zamanlayıcısı.
+
+    Kareler bir seferde tek işçi tarafından işlenir; böylece Pose modelinin
+    kareler arası takip durumu ve sayaç sırası korunur.
+    """
+
+    def __init__(self, name, source, movement, pose=None, latency_window=300):
+        self.name = name
+        self.source = source
+        self.engine = ExerciseEngine(movement)
+        self.pose = pose # None ise işçinin paylaşılan modeli kullanılır
+        self.started_at = None
+        self.last_result = None
+        self.stats = StageStats(name)
+        self.latencies = deque(maxlen=latency_window) # Yakalamadan analize (ms)
+        self.scheduled = False # Hazır kuyruğunda ya da işleniyor
+        self.errors = 0        # İşlenirken hata veren kareler
+        self.lock = threading.Lock() # scheduled bayrağı için (kısa süreli)
+        self.process_lock = threading.Lock() # Model ve sayaç kullanımı için
+        self.queue = None
+        self.capture = None
+
+    @property
+    def elapsed(self):
+        """Oturumun başından beri geçen süre (saniye)"""
+        return time.perf_counter() - self.started_at if self.started_at else 0.0
+
+    def release_frame(self, frame):
+        if self.capture.pool is not None:
+            self.capture.pool.release(frame)
+
+
+def physical_cores():
+    """Sürecin kullanabildiği fiziksel çekirdek sayısı (varsayılan işçi sayısı).
+
+    Poz çıkarımı hesaplama yoğun olduğundan aynı çekirdeğin SMT
+    (hyper-threading) kardeşi belirgin hız kazandırmaz; fazladan işçi sadece
+    model belleğini ve gecikmeyi artırır. psutil kuruluysa ondan okunur;
+    yoksa sürecin CPU kümesi SMT açıksa yarıya indirilir.
+    """
+    try:
+        logical = len(os.sched_getaffinity(0))
+    except AttributeError: # Windows, macOS
+        logical = os.cpu_count() or 1
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return max(1, min(cores, logical))
+    try:
+        with open("/sys/devices/system/cpu/smt/active") as f:
+            smt = f.read().strip() == "1"
+    except OSError:
+        smt = False
+    return max(1, logical // 2 if smt else logical)
+
+
+class MultiSessionEngine:
+    """N bağımsız akışı fiziksel çekirdek sayısı kadar işçiyle analiz eder.
+
+    Her akışın yakalama iş parçacığı en yeni kareyi kendi kuyruğuna koyar;
+    yeni karesi olan akış hazır kuyruğuna girer ve boştaki ilk işçi onu
+    işler. MediaPipe çıkarımı GIL'i bıraktığından işçiler paralel çalışır.
+
+    shared_models=False iken her akışın kendi Pose modeli vardır (takip
+    durumu korunur). shared_models=True iken her işçi tek bir
+    static_image_mode modelini tüm akışlar için kullanır; akış sayısı
+    çekirdek sayısını aştığında yüklenen model sayısı işçi sayısıyla sınırlı
+    kalır.
+    """
+
+    def __init__(self, workers=None, shared_models=False):
+        self.workers = workers or physical_cores()
+        self.shared_models = shared_models
+        self.sessions = {}
+        self._ready = queue.Queue()
+        self._threads = []
+        self._running = False
+        self._started_at = None
+        # Aşama süreleri akış bazında ("istasyon-1.pose" gibi) tutulur
+        self.metrics = StageMetrics()
+
+    def add_stream(self, name, source_spec, movement="Squat"):
+        """Yeni bir istasyon ekler; motor çalışıyorsa hemen başlatır"""
+        source = open_source(source_spec)
+        if not source.isOpened():
+            raise RuntimeError(f"Kaynak açılamadı: {source_spec}")
+        pose = None if self.shared_models else create_pose()
+        session = StreamSession(name, source, movement, pose)
+        session.queue = _NotifyingQueue(
+            on_put=lambda: self._schedule(session),
+            on_drop=lambda item: session.release_frame(item[2]),
+        )
+        session.capture = CaptureThread(source, session.queue, StageStats(f"{name}-capture"))
+        self.sessions[name] = session
+        if self._running:
+            self._start_session(session)
+        return session
+
+    def remove_stream(self, name):
+        """İstasyonu durdurur ve kaynaklarını serbest bırakır"""
+        session = self.sessions.pop(name)
+        session.capture.stop()
+        session.capture.join(1.0)
+        if not session.capture.release_source():
+            logging.warning("%s: kaynak okuması sürüyor; okuma bitince kapatılacak", session.name)
+        with session.process_lock:
+            if session.pose is not None:
+                session.pose.close()
+                session.pose = None
+
+    def start(self):
+        self._running = True
+        self._started_at = time.perf_counter()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"session-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        for session in self.sessions.values():
+            self._start_session(session)
+
+    def stop(self):
+        self._running = False
+        for name in list(self.sessions):
+            self.remove_stream(name)
+        for _ in self._threads:
+            self._ready.put(None)
+        for thread in self._threads:
+            thread.join(1.0)
+        self._threads = []
+
+    def _start_session(self, session):
+        session.started_at = time.perf_counter()
+        session.capture.start()
+
+    def _schedule(self, session):
+        """Yeni karesi olan akışı (zaten sırada değilse) hazır kuyruğuna koyar"""
+        with session.lock:
+            if session.scheduled:
+                return
+            session.scheduled = True
+        self._ready.put(session)
+
+    def _worker(self):
+        shared_pose = create_pose(static_image_mode=True) if self.shared_models else None
+        try:
+            while True:
+                session = self._ready.get()
+                if session is None:
+                    break
+                more = False
+                try:
+                    with session.process_lock:
+                        item = session.queue.get_nowait()
+                        pose = session.pose or shared_pose
+                        if item is not None and pose is not None:
+                            self._process(session, item, pose)
+                except Exception:
+                    # Hatalı bir kare işçiyi ve akışı durdurmaz; kare atlanır
+                    session.errors += 1
+                    logging.exception("%s: kare işlenemedi", session.name)
+                finally:
+                    with session.lock:
+                        session.scheduled = False
+                        more = session.queue.pending
+                if more:
+                    self._schedule(session)
+        finally:
+            if shared_pose is not None:
+                shared_pose.close()
+
+    def _process(self, session, item, pose):
+        frame_id, timestamp, frame = item
+        start = time.perf_counter()
+        try:
+            results = pose.process(frame)
+        finally:
+            session.release_frame(frame)
+        inferred = time.perf_counter()
+        points = None
+        if results.pose_landmarks:
+            points = landmarks_to_array(results.pose_landmarks)
+        session.last_result = session.engine.process_points(points, timestamp,
+                                                            world=results.pose_world_landmarks)
+        end = time.perf_counter()
+        self.metrics.record(f"{session.name}.pose", inferred - start)
+        self.metrics.record(f"{session.name}.analysis", end - inferred)
+        session.latencies.append((end - timestamp) * 1000.0)
+        session.stats.tick()
+
+    def stats(self):
+        """Toplam işlem hızını ve akış bazında gecikmeyi döndürür"""
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        streams = {}
+        total_frames = 0
+        for name, session in list(self.sessions.items()):
+            latencies = np.array(session.latencies) if session.latencies else np.zeros(1)
+            total_frames += session.stats.frames
+            streams[name] = {
+                "movement": session.engine.movement,
+                "fps": session.stats.fps,
+                "frames": session.stats.frames,
+                "reps": session.engine.correct_count,
+                "elapsed_s": session.elapsed,
+                "latency_p50_ms": float(np.percentile(latencies, 50)),
+                "latency_p95_ms": float(np.percentile(latencies, 95)),
+                "dropped": session.queue.dropped,
+                "errors": session.errors,
+            }
+        return {
+            "workers": self.workers,
+            "streams": streams,
+            "total_fps": sum(s["fps"] for s in streams.values()),
+            "total_frames": total_frames,
+            "average_fps": total_frames / elapsed if elapsed else 0.0,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Çok istasyonlu hareket analizi")
+    parser.add_argument("sources", nargs="+", help="Kamera indeksi, video, klasör, rtsp://... ya da synthetic")
+    parser.add_argument("--movement", default="Squat", choices=ExerciseEngine.movement_types)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="İşçi sayısı (varsayılan: fiziksel çekirdek sayısı)")
+    parser.add_argument("--shared-models", action="store_true",
+                        help="Her işçide tek model (akışlar arası paylaşılan, takipsiz)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Çalışma süresi")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Aşama gecikmelerini bu portta /metrics (Prometheus) olarak sun")
+    args = parser.parse_args(argv)
+
+    engine = MultiSessionEngine(workers=args.workers, shared_models=args.shared_models)
+    if args.metrics_port:
+        serve(engine.metrics, args.metrics_port)
+    for i, spec in enumerate(args.sources):
+        engine.add_stream(f"istasyon-{i + 1}", spec, args.movement)
+    engine.start()
+    try:
+        end = time.perf_counter() + args.seconds
+        while time.perf_counter() < end:
+            time.sleep(1.0)
+            stats = engine.stats()
+            print(f"Toplam: {stats['total_fps']:.1f} kare/sn ({stats['workers']} işçi)")
+            for name, s in stats["streams"].items():
+                print(f"  {name}: {s['fps']:5.1f} kare/sn  gecikme p50 {s['latency_p50_ms']:.0f} ms"
+                      f"  p95 {s['latency_p95_ms']:.0f} ms  {s['reps']} tekrar"
+                      + (f"  {s['errors']} hatalı kare" if s["errors"] else ""))
+    finally:
+        engine.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""İskelet ve açı etiketlerinin ekran karesine çizimi.
+
+Çizim, kare canvas boyutuna getirildikten sonra ekran çözünürlüğünde
+yapılır; kamera çözünürlüğü ne olursa olsun çizilen piksel sayısı aynı
+kalır. Renk ve kalınlıklar bir kez tanımlanır, tüm kemikler tek bir
+cv2.polylines çağrısıyla çizilir.
+"""
+import cv2
+import numpy as np
+
+from angles import MIN_VISIBILITY, POSE_CONNECTIONS
+from exercises import ANGLE_LABELS
+
+# MediaPipe draw_landmarks ile aynı görünüm (RGB)
+BONE_COLOR = (230, 66, 245)
+JOINT_COLOR = (66, 117, 245)
+THICKNESS = 2
+JOINT_RADIUS = 2
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+_CONNECTIONS = np.array(sorted(POSE_CONNECTIONS), dtype=np.intp)
+
+
+class OverlayRenderer:
+    """Landmarkları ve analiz sonucunun açı etiketlerini RGB kare üzerine çizer"""
+
+    def __init__(self):
+        self._size = None
+        self._scale = None # Normalize koordinatı piksele çeviren (genişlik, yükseklik)
+
+    def draw(self, image, points, analysis=None):
+        """(33, 4) landmarkları ve (verilirse) analizin açılarını image üzerine çizer"""
+        h, w = image.shape[:2]
+        if self._size != (w, h):
+            self._size = (w, h)
+            self._scale = np.array((w, h), dtype=np.float32)
+        xy = (points[:, :2] * self._scale).astype(np.int32)
+        visible = points[:, 3] > MIN_VISIBILITY
+        bones = _CONNECTIONS[visible[_CONNECTIONS].all(axis=1)]
+        if len(bones):
+            cv2.polylines(image, xy[bones], False, BONE_COLOR, THICKNESS)
+        for x, y in xy[visible].tolist():
+            cv2.circle(image, (x, y), JOINT_RADIUS, JOINT_COLOR, THICKNESS)
+        if analysis is not None:
+            self.draw_labels(image, xy, analysis)
+
+    @staticmethod
+    def draw_labels(image, xy, analysis):
+        """Hesaplanan açıları ölçüldükleri landmarkın yanına yazar"""
+        labels = ANGLE_LABELS.get(analysis.movement, {})
+        side = analysis.side or "left"
+        for name, angle in analysis.angles.items():
+            if angle is None or name not in labels:
+                continue
+            prefix, landmarks, (dx, dy), scale, color, bad_color = labels[name]
+            if bad_color and not analysis.checks.get(name, True):
+                color = bad_color
+            x, y = xy[landmarks[side]].tolist()
+            cv2.putText(image, f"{prefix}{int(angle)}", (x + dx, y + dy), LABEL_FONT, scale, color, 2)
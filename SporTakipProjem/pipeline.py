@@ -0,0 +1,273 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from frame_buffers import FrameConverter, FramePool
+
+
+class LatestFrameQueue:
+    """Sınırlı, en yeni kare kazanır kuyruğu.
+
+    Kuyruk doluyken gelen kare en eski kareyi düşürür; üretici asla beklemez.
+    Düşen öğe on_drop ile bildirilir (tamponu havuza iade etmek için).
+    """
+
+    def __init__(self, maxsize=1, on_drop=None):
+        self._items = deque()
+        self._maxsize = maxsize
+        self._on_drop = on_drop
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        """Kareyi ekler, kuyruk doluysa en eskisini düşürür"""
+        dropped = None
+        with self._cond:
+            if len(self._items) >= self._maxsize:
+                dropped = self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+        if dropped is not None and self._on_drop:
+            self._on_drop(dropped)
+
+    def get(self, timeout=None):
+        """Kare gelene kadar bekler; zaman aşımında veya kapanınca None döner"""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def get_nowait(self):
+        """Bekleyen kare varsa döndürür, yoksa None"""
+        with self._cond:
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    @property
+    def pending(self):
+        """Bekleyen kare var mı"""
+        with self._cond:
+            return bool(self._items)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        """Bekleyen tüketicileri uyandırır"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class StageStats:
+    """Bir aşamanın kayan pencere üzerinden FPS değerini hesaplar"""
+
+    def __init__(self, name, window=1.0):
+        self.name = name
+        self.window = window
+        self.frames = 0
+        self._stamps = deque()
+        self._lock = threading.Lock()
+
+    def tick(self):
+        """İşlenen bir kareyi kaydeder"""
+        now = time.perf_counter()
+        with self._lock:
+            self.frames += 1
+            self._stamps.append(now)
+            while self._stamps and now - self._stamps[0] > self.window:
+                self._stamps.popleft()
+
+    @property
+    def fps(self):
+        with self._lock:
+            if len(self._stamps) < 2:
+                return 0.0
+            span = self._stamps[-1] - self._stamps[0]
+            return (len(self._stamps) - 1) / span if span > 0 else 0.0
+
+
+class CaptureThread(threading.Thread):
+    """Kaynaktan kare okur, RGB tampona çevirip (gerekirse aynalayıp) kuyruğa koyar.
+
+    Ham kare tamponu ve RGB tamponları yeniden kullanılır; kararlı durumda
+    kare başına bellek ayrılmaz. Kaynak release_source() ile kapatılır;
+    read() sürerken kapatılmaz (OpenCV'de tanımsız davranış).
+    """
+
+    def __init__(self, source, out_queue, stats, metrics=None):
+        super().__init__(name="capture", daemon=True)
+        self.source = source
+        self.out_queue = out_queue
+        self.stats = stats
+        self.metrics = metrics
+        self.pool = None # İlk karenin boyutuyla oluşturulur
+        self.converter = FrameConverter(mirror=source.mirror, metrics=metrics)
+        self.ended = False # Kare okunamadığında True olur
+        self._stop_event = threading.Event()
+        self._release_lock = threading.Lock()
+        self._exited = False
+        self._release_requested = False
+
+    def run(self):
+        try:
+            self._capture()
+        finally:
+            self.out_queue.close()
+            with self._release_lock:
+                self._exited = True
+                if self._release_requested:
+                    self.source.release()
+
+    def _capture(self):
+        frame_id = 0
+        raw = None
+        while not self._stop_event.is_set():
+            start = time.perf_counter()
+            ret, raw = self.source.read(raw)
+            if not ret:
+                self.ended = True
+                break
+            if self.metrics is not None:
+                self.metrics.record("capture", time.perf_counter() - start)
+            if self.pool is None or self.pool.shape != raw.shape:
+                self.pool = FramePool(raw.shape)
+            frame = self.converter.convert(raw, self.pool.acquire())
+            self.out_queue.put((frame_id, time.perf_counter(), frame))
+            self.stats.tick()
+            frame_id += 1
+
+    def stop(self):
+        self._stop_event.set()
+
+    def release_source(self):
+        """Kaynağı kapatır; iş parçacığı hâlâ okuyorsa kapatmayı ona bırakır.
+
+        Kaynak hemen kapatıldıysa True döndürür.
+        """
+        with self._release_lock:
+            if self._exited or self.ident is None: # Bitti ya da hiç başlamadı
+                self.source.release()
+                return True
+            self._release_requested = True
+            return False
+
+
+class InferenceWorker(threading.Thread):
+    """Kuyruktaki en yeni kare üzerinde process_fn çalıştırır.
+
+    process_fn(frame, timestamp) sonucu (analiz kapalıysa None) kareyle birlikte
+    çıkış kuyruğuna konur. process_fn hata verirse hata kaydedilip sayılır,
+    kare sonuçsuz (None) gösterilir ve çıkarım sonraki karelerle sürer.
+    """
+
+    def __init__(self, in_queue, out_queue, process_fn, stats, metrics=None):
+        super().__init__(name="inference", daemon=True)
+        self.in_queue = in_queue
+        self.out_queue = out_queue
+        self.process_fn = process_fn
+        self.stats = stats
+        self.metrics = metrics
+        self.errors = 0 # İşlenemeyen kareler
+        self.last_error = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            item = self.in_queue.get(timeout=0.1)
+            if item is None:
+                if self.in_queue.closed: # Yakalama bitti
+                    break
+                continue
+            frame_id, timestamp, frame = item
+            start = time.perf_counter()
+            try:
+                results = self.process_fn(frame, timestamp)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+                logging.exception("Kare işlenemedi")
+                results = None
+            if self.metrics is not None:
+                self.metrics.record("queue_wait", start - timestamp)
+                self.metrics.record("inference", time.perf_counter() - start)
+            self.out_queue.put((frame_id, timestamp, frame, results))
+            self.stats.tick()
+
+    def stop(self):
+        self._stop_event.set()
+        self.in_queue.close()
+
+
+class FramePipeline:
+    """Yakalama -> çıkarım -> ekran aşamalarını birbirine bağlar.
+
+    Yakalama ve çıkarım kendi iş parçacıklarında çalışır; ekran aşaması
+    Tk ana döngüsünden poll() ile en yeni sonucu çeker ve işi bitince
+    kareyi release() ile havuza iade eder. metrics verilirse yakalama ve
+    çıkarım aşamalarının süreleri kaydedilir.
+    """
+
+    def __init__(self, source, process_fn, metrics=None):
+        self.capture_stats = StageStats("capture")
+        self.inference_stats = StageStats("inference")
+        self.render_stats = StageStats("render")
+        self.capture_queue = LatestFrameQueue(maxsize=1, on_drop=self._release_item)
+        self.result_queue = LatestFrameQueue(maxsize=1, on_drop=self._release_item)
+        self.capture = CaptureThread(source, self.capture_queue, self.capture_stats, metrics)
+        self.inference = InferenceWorker(self.capture_queue, self.result_queue,
+                                         process_fn, self.inference_stats, metrics)
+
+    def start(self):
+        self.capture.start()
+        self.inference.start()
+
+    def stop(self, timeout=1.0, release_source=True):
+        """İş parçacıklarını durdurur, bitmelerini bekler ve kaynağı kapatır.
+
+        Yakalama iş parçacığı süre dolduğunda hâlâ okuyorsa (ör. takılan
+        RTSP/USB okuması) kaynak okuma bitince o iş parçacığında kapatılır.
+        """
+        self.capture.stop()
+        self.inference.stop()
+        self.capture.join(timeout)
+        self.inference.join(timeout)
+        if release_source and not self.capture.release_source():
+            logging.warning("Kaynak okuması %.1f sn içinde bitmedi; okuma bitince kapatılacak", timeout)
+
+    @property
+    def ended(self):
+        return self.capture.ended
+
+    def release(self, frame):
+        """Ekranda işi biten kareyi havuza iade eder"""
+        if self.capture.pool is not None:
+            self.capture.pool.release(frame)
+
+    def _release_item(self, item):
+        self.release(item[2])
+
+    def poll(self):
+        """Ekran için bekleyen en yeni sonucu döndürür (yoksa None)"""
+        item = self.result_queue.get_nowait()
+        if item is not None:
+            self.render_stats.tick()
+        return item
+
+    def stats(self):
+        """Aşama bazında FPS, düşen ve işlenemeyen kare sayılarını döndürür"""
+        return {
+            "capture_fps": self.capture_stats.fps,
+            "inference_fps": self.inference_stats.fps,
+            "render_fps": self.render_stats.fps,
+            "inference_dropped": self.capture_queue.dropped,
+            "render_dropped": self.result_queue.dropped,
+            "inference_errors": self.inference.errors,
+        }
@@ -1,69 +1,87 @@
-import cv2
+import time
+STARTED_AT = time.perf_counter() # Açılış süreleri bu andan itibaren ölçülür
+
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
-import numpy as np
 from datetime import datetime
 import os
 import logging
-import mediapipe as mp
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import replace
+
+# OpenCV ve PIL kullanan modüller (kaynaklar, yakalama, çizim, kırpma)
+# pencere açıldıktan sonra, kamera başlatılırken yüklenir
+from engine import ExerciseEngine
+from adaptive import AdaptiveInference
+from canvas_renderer import CanvasRenderer
+from session_recorder import SessionRecorder
+from pose_settings import PoseSettings, auto_tune, load_settings, sample_frames, save_settings
+from metrics import StageMetrics
+from view_model import ViewModel
 
 # TensorFlow ve MediaPipe uyarılarını bastır
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 logging.getLogger('mediapipe').setLevel(logging.ERROR)
 
+SIDE_NAMES = {"auto": "Otomatik", "left": "Sol", "right": "Sağ"}
+
 class SporHareketApp:
-    def __init__(self, window, window_title):
+    def __init__(self, window, window_title, video_source=None):
         self.window = window
         self.window.title(window_title)
         
-        # MediaPipe yapılandırması
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        # Model ayarları kayıtlı değilse ilk başlatmada bu makinede ölçülür.
+        # MediaPipe ve model arka planda yüklenir; pencere beklemeden açılır.
+        self.pose_settings = load_settings()
+        self.pose = None
+        self.pose_lock = threading.Lock() # Model çıkarım sırasında değiştirilmesin
+        self.background = ThreadPoolExecutor(max_workers=2, thread_name_prefix="background")
+        self.model_future = None
+        self.startup_ms = {} # Açılıştan arayüzün ve modelin hazır olmasına kadar geçen süre
         
         # Kamera ve analiz değişkenleri
-        self.video_source = 0
+        # None: kamerayı otomatik bul. Ayrıca kamera indeksi, video, klasör, RTSP ya da "synthetic"
+        self.video_source = video_source
+        self.source_info = "" # Açılan kaynağın ayarları
+        self.start_clock = None # Başlat'a basıldığı an (ilk kare süresi için)
+        self.first_frame_ms = None
         self.vid = None
+        self.pipeline = None # Yakalama/çıkarım iş parçacıkları
+        self.display_scaler = None # Ekran küçültme ve çizim (ilk başlatmada oluşturulur)
+        self.overlay = None
+        self.minimized = False
         self.analyzing = False
-        self.movement_correct = None
-        self.prev_movement_state = None # Sayaç için önceki durumu tutar
         
-        # Sayaç ve zamanlayıcı
-        self.correct_count = 0
+        # Zamanlayıcı
         self.timer_running = False
         self.start_time = None
         
-        # Hareket konfigürasyonları
-        self.movement_types = [
-            "Squat", "Push-up", "Lunge",  
-            "Bicep Curl", "Shoulder Press"
-        ]
-        self.current_movement = self.movement_types[0]
-        
-        # Hedef açılar (eklemdeki açı)
-        self.target_angles = {
-            "Squat": 90,          # Diz açısı
-            "Push-up": 90,        # Dirsek açısı
-            "Lunge": 90,          # Ön diz açısı (veya arka diz)
-            "Bicep Curl": 30,     # Dirsek açısı (kapanışta)
-            "Shoulder Press": 170 # Dirsek açısı (yukarıda)
-        }
-        self.angle_tolerance = 20 # Açı toleransı (derece)
-
-        # Squat için minimum gövde açısı (omuz-kalça-diz)
-        # Bu açı, gövdenin ne kadar dik durduğunu gösterir.
-        # Daha büyük bir açı, daha dik bir gövde anlamına gelir.
-        # Aşırı öne eğilmeyi engellemek için bir minimum eşik belirleriz.
-        self.min_torso_angles = {
-            "Squat": 70  # Örnek bir değer, duruma göre ayarlanabilir
-        }
+        # Hareket, hedef açı ve sayaç durumu motorda tutulur.
+        # Motor çıkarım iş parçacığında çalıştığı için erişim kilitle korunur.
+        self.engine = ExerciseEngine()
+        self.engine_lock = threading.Lock()
+        
+        # Uyarlamalı çıkarım: yoğun CPU'da her N karede bir poz tespiti
+        self.adaptive = AdaptiveInference(budget_ms=20.0, max_interval=4)
+        self.adaptive_enabled = False
+        self.adaptive_lock = threading.Lock() # Arayüz sıfırlarken çıkarım iş parçacığı kullanmasın
+        
+        # Kişi bulunduktan sonra çıkarım etrafındaki kırpılmış bölgede yapılır
+        # (ilk başlatmada oluşturulur; ölçek yüklü modelin ayarından gelir)
+        self.roi_tracker = None
+        self.input_scale = (self.pose_settings or PoseSettings()).input_scale
+        
+        # Aşama süreleri: isteğe bağlı ekran katmanı ve JSON/Prometheus çıktısı
+        self.metrics = StageMetrics()
+        
+        # Oturum kaydı: kare bazlı landmark, açı, durum ve tekrarlar diske yazılır
+        self.recorder = None
         
         # GUI Ayarları
         self.setup_gui()
+        self.window.after_idle(self.on_ui_ready)
+        self.load_model(self.pose_settings or PoseSettings(), remember=self.pose_settings is not None)
         
     def setup_gui(self):
         """Arayüz bileşenlerini oluşturur"""
@@ -80,11 +98,11 @@ class SporHareketApp:
         
         tk.Label(movement_frame, text="Hareket:", font=("Arial", 12), bg="#f0f0f0").pack(side=tk.LEFT)
         
-        self.movement_var = tk.StringVar(value=self.current_movement)
+        self.movement_var = tk.StringVar(value=self.engine.movement)
         movement_menu = ttk.Combobox(
             movement_frame,  
             textvariable=self.movement_var,
-            values=self.movement_types,
+            values=ExerciseEngine.movement_types,
             state="readonly",
             width=15,
             font=("Arial", 12)
@@ -92,9 +110,58 @@ class SporHareketApp:
         movement_menu.pack(side=tk.LEFT, padx=10)
         movement_menu.bind("<<ComboboxSelected>>", self.change_movement)
         
+        tk.Label(movement_frame, text="Taraf:", font=("Arial", 10), bg="#f0f0f0").pack(side=tk.LEFT)
+        self.side_var = tk.StringVar(value=SIDE_NAMES[self.engine.side])
+        side_menu = ttk.Combobox(
+            movement_frame, textvariable=self.side_var, values=list(SIDE_NAMES.values()),
+            state="readonly", width=8, font=("Arial", 10)
+        )
+        side_menu.pack(side=tk.LEFT, padx=5)
+        side_menu.bind("<<ComboboxSelected>>", self.change_side)
+        
+        self.world_var = tk.BooleanVar(value=self.engine.angle_modes[self.engine.movement] == "3d")
+        tk.Checkbutton(
+            movement_frame, text="3B açılar", variable=self.world_var,
+            command=self.toggle_world_angles, font=("Arial", 10), bg="#f0f0f0"
+        ).pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.adaptive_var = tk.BooleanVar(value=self.adaptive_enabled)
+        tk.Checkbutton(
+            movement_frame, text="Uyarlamalı çıkarım", variable=self.adaptive_var,
+            command=self.toggle_adaptive, font=("Arial", 10), bg="#f0f0f0"
+        ).pack(side=tk.LEFT, padx=10)
+        
+        self.recording_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            movement_frame, text="Oturumu kaydet", variable=self.recording_var,
+            font=("Arial", 10), bg="#f0f0f0"
+        ).pack(side=tk.LEFT)
+        
+        self.overlay_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            movement_frame, text="Performans katmanı", variable=self.overlay_var,
+            command=self.update_overlay, font=("Arial", 10), bg="#f0f0f0"
+        ).pack(side=tk.LEFT, padx=(10, 0))
+        
+        tk.Label(movement_frame, text="Model:", font=("Arial", 10), bg="#f0f0f0").pack(side=tk.LEFT, padx=(10, 0))
+        self.model_var = tk.StringVar(value=str((self.pose_settings or PoseSettings()).model_complexity))
+        model_menu = ttk.Combobox(
+            movement_frame, textvariable=self.model_var, values=["0", "1", "2"],
+            state="readonly", width=2, font=("Arial", 10)
+        )
+        model_menu.pack(side=tk.LEFT, padx=5)
+        model_menu.bind("<<ComboboxSelected>>", self.change_model)
+        
         # Video görüntüleme
         self.canvas = tk.Canvas(self.window, width=640, height=480, bg="black")
         self.canvas.pack(pady=10)
+        # Tek, kalıcı görüntü öğesi; kareler yerinde güncellenir
+        self.renderer = CanvasRenderer(self.canvas, (640, 480))
+        self.renderer.show_message("")
+        
+        # Aşama bazında performans bilgisi
+        self.perf_label = tk.Label(self.window, text="", font=("Arial", 9), bg="#f0f0f0", fg="#7f8c8d")
+        self.perf_label.pack()
         
         # Bilgi paneli
         info_frame = tk.Frame(self.window, bg="#f0f0f0")
@@ -114,6 +181,23 @@ class SporHareketApp:
         self.status_label = tk.Label(self.window, text="Kamerayı Başlatın", font=("Arial", 14, "bold"), bg="#f0f0f0", fg="#34495e")
         self.status_label.pack(pady=(5,10)) # Altına biraz daha boşluk
         
+        # Etiketler doğrudan değil, farka dayalı ve ekran yenileme hızıyla
+        # sınırlı olarak güncellenir; değişmeyen metin ve renk Tk'ye gitmez
+        self.view = ViewModel({
+            "status": self.status_label,
+            "counter": self.counter_label,
+            "timer": self.timer_label,
+            "perf": self.perf_label,
+        }, self.window, metrics=self.metrics)
+        
+        # Model yükleme ve kamera açılışı sürerken gösterilir
+        self.progress_frame = tk.Frame(self.window, bg="#f0f0f0")
+        self.progress = ttk.Progressbar(self.progress_frame, mode="indeterminate", length=200)
+        self.progress.pack(side=tk.LEFT)
+        self.progress_label = tk.Label(self.progress_frame, text="", font=("Arial", 10), bg="#f0f0f0", fg="#7f8c8d")
+        self.progress_label.pack(side=tk.LEFT, padx=10)
+        self.tasks = {} # Süren arka plan işleri: ad -> mesaj
+        
         # Kontrol butonları
         button_frame = tk.Frame(self.window, bg="#f0f0f0")
         button_frame.pack(pady=10)
@@ -147,51 +231,260 @@ class SporHareketApp:
         self.btn_stop.pack(side=tk.LEFT, padx=5)
         
         self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.window.bind("<Unmap>", self.on_visibility_changed)
+        self.window.bind("<Map>", self.on_visibility_changed)
     
     def change_movement(self, event):
         """Seçilen hareketi günceller"""
-        self.current_movement = self.movement_var.get()
+        with self.engine_lock:
+            self.engine.set_movement(self.movement_var.get())
+        self.world_var.set(self.engine.angle_modes[self.engine.movement] == "3d")
         self.reset_counter_and_timer() # Sayaç ve zamanlayıcıyı sıfırla
         if self.vid and self.analyzing: # Eğer analiz açıksa ve kamera çalışıyorsa, durumu da sıfırla
-             self.status_label.config(text=f"{self.current_movement} bekleniyor...", fg="#34495e")
+             self.view.set("status", text=f"{self.engine.movement} bekleniyor...", fg="#34495e")
         elif self.vid:
-            self.status_label.config(text="Analizi Başlatın", fg="#34495e")
-
+            self.view.set("status", text="Analizi Başlatın", fg="#34495e")
+
+
+    def change_side(self, event):
+        """Değerlendirilen tarafı günceller; sayaç korunur"""
+        side = next(key for key, name in SIDE_NAMES.items() if name == self.side_var.get())
+        with self.engine_lock:
+            self.engine.side = side
+            self.recompile_engine()
+
+    def toggle_world_angles(self):
+        """Seçili hareketin açılarını 3B dünya landmarklarından hesaplar ya da 2B'ye döner.
+
+        3B sadece kameraya eğik durulan çekimlerde daha doğrudur.
+        """
+        with self.engine_lock:
+            self.engine.angle_modes[self.engine.movement] = "3d" if self.world_var.get() else "2d"
+            self.recompile_engine()
+
+    def recompile_engine(self):
+        """Değişen ayarlarla hareketi yeniden derler; sayaç korunur (engine_lock altında çağrılır)"""
+        count = self.engine.correct_count
+        self.engine.reset()
+        self.engine.correct_count = count
+
+    def change_model(self, event):
+        """Seçilen model karmaşıklığını uygular ve kaydeder"""
+        settings = replace(self.pose_settings or PoseSettings(),
+                           model_complexity=int(self.model_var.get()), measured_fps=None)
+        save_settings(settings)
+        self.load_model(settings)
+
+    def run_background(self, fn, on_done, *args):
+        """fn(*args)'ı arka planda çalıştırır; bitince on_done(future) Tk döngüsünde çağrılır"""
+        future = self.background.submit(fn, *args)
+        def poll():
+            if future.done():
+                on_done(future)
+            else:
+                self.window.after(20, poll)
+        poll()
+        return future
+
+    def show_progress(self, task, text):
+        """İlerleme göstergesini açar; task bitince hide_progress ile kapatılır"""
+        self.tasks[task] = text
+        self.progress_label.config(text=text)
+        if len(self.tasks) == 1:
+            self.progress_frame.pack(after=self.status_label, pady=(0, 5))
+            self.progress.start(10)
+
+    def hide_progress(self, task):
+        self.tasks.pop(task, None)
+        if self.tasks:
+            self.progress_label.config(text=list(self.tasks.values())[-1])
+        else:
+            self.progress.stop()
+            self.progress_frame.pack_forget()
+
+    def on_ui_ready(self):
+        """Pencere ilk kez çizildiğinde açılış süresini kaydeder"""
+        self.startup_ms["ui"] = (time.perf_counter() - STARTED_AT) * 1000.0
+        self.show_startup_times()
+
+    def show_startup_times(self):
+        if self.pipeline:
+            return # Kamera açıkken satırı performans bilgisi kullanır
+        self.view.set("perf", text="Açılış: " + ", ".join(
+            f"{name} {ms:.0f} ms" for name, ms in
+            (("arayüz", self.startup_ms.get("ui")), ("model", self.startup_ms.get("model")))
+            if ms is not None
+        ))
+
+    def load_model(self, settings, remember=True):
+        """Pose modelini arka planda oluşturur; hazır olunca eski modelin yerine geçer.
+
+        remember=False iken ayar seçilmiş sayılmaz (ilk başlatmada ölçülür).
+        """
+        self.show_progress("model", "Model yükleniyor...")
+        self.model_future = self.run_background(
+            settings.create_pose, lambda future: self.on_model_loaded(future, settings, remember))
+
+    def on_model_loaded(self, future, settings, remember):
+        if future is not self.model_future:
+            # Arkasından yeni bir model istendi; ilerleme ve model onundur
+            if not future.exception():
+                future.result().close()
+            return
+        self.hide_progress("model")
+        try:
+            pose = future.result()
+        except Exception as e:
+            messagebox.showerror("Hata", f"Poz modeli yüklenemedi:\n{str(e)}")
+            return
+        with self.pose_lock:
+            old_pose, self.pose = self.pose, pose
+            self.input_scale = settings.input_scale
+            if self.roi_tracker is not None:
+                self.roi_tracker.input_scale = settings.input_scale
+                self.roi_tracker.reset()
+        if old_pose:
+            old_pose.close()
+        if remember:
+            self.pose_settings = settings
+            self.model_var.set(str(settings.model_complexity))
+        if "model" not in self.startup_ms:
+            self.startup_ms["model"] = (time.perf_counter() - STARTED_AT) * 1000.0
+            self.show_startup_times()
+
+    def tune_pose(self):
+        """Model karmaşıklığı ve giriş ölçeğini açılan kaynakta ölçüp seçer (arka planda).
+
+        Dosya gibi baştan okunan kaynaklar ayrıca açılır; analiz ilk kareden
+        başlar. Ölçüm, açılışta yüklenen varsayılan model bittikten sonra
+        yapılır; iki iş aynı anda işlemciyi paylaşıp sonucu bozmaz.
+        """
+        if self.model_future is not None:
+            wait([self.model_future])
+        from frame_sources import open_source
+        source = self.vid if self.vid.realtime else open_source(self.video_source)
+        try:
+            frames = sample_frames(source)
+        finally:
+            if source is not self.vid:
+                source.release()
+        return auto_tune(frames, log=None) if frames else None
+
+    def toggle_adaptive(self):
+        """Uyarlamalı çıkarımı açıp kapatır"""
+        with self.adaptive_lock:
+            self.adaptive.reset()
+            self.adaptive_enabled = self.adaptive_var.get()
 
     def start_camera(self):
-        """Kamerayı başlatır"""
-        try:
-            self.vid = cv2.VideoCapture(self.video_source)
+        """Kamerayı (veya komut satırında verilen kaynağı) arka planda açar"""
+        self.start_clock = time.perf_counter()
+        self.first_frame_ms = None
+        self.btn_start.config(state=tk.DISABLED)
+        self.show_progress("camera", "Kamera açılıyor..." if self.pose_settings else
+                           "Kamera açılıyor, model bu bilgisayara göre ayarlanıyor...")
+        self.run_background(self.open_camera, self.on_camera_opened)
+
+    def open_camera(self):
+        """Kaynağı açar; ilk çalıştırmada model ayarlarını bu kaynakta ölçer.
+
+        Arka plan iş parçacığında çalışır; seçilen yeni ayarları ya da None döndürür.
+        OpenCV de ilk kez burada, arayüzü bekletmeden yüklenir.
+        """
+        from camera_discovery import discover_camera
+        from frame_sources import open_source
+        if self.video_source is None or str(self.video_source).isdigit():
+            # Kameralar paralel denenir, son çalışan kamera önbellekten gelir
+            preferred = None if self.video_source is None else int(self.video_source)
+            self.vid, info = discover_camera(preferred)
+            settings = info["settings"]
+            self.source_info = (
+                f"Kamera {info['index']}: {settings['width']}x{settings['height']} "
+                f"{settings['fourcc']} {settings['fps']} fps | "
+            )
+        else:
+            self.vid = open_source(self.video_source)
             if not self.vid.isOpened():
-                # Alternatif kamera kaynaklarını dene
-                for i in range(1, 5):
-                    self.vid = cv2.VideoCapture(i)
-                    if self.vid.isOpened():
-                        self.video_source = i
-                        break
-                if not self.vid.isOpened():
-                    raise RuntimeError(f"Kamera açılamadı (kaynak {self.video_source} ve 1-4 denendi).")
-            
+                raise RuntimeError(f"Kaynak açılamadı: {self.video_source}")
+            self.source_info = ""
+        
+        if self.pose_settings is None:
+            return self.tune_pose() # Sadece ilk çalıştırmada; seçim kaydedilir
+        return None
+
+    def on_camera_opened(self, future):
+        """Kaynak açılınca (model de hazırsa) yakalama ve çıkarımı başlatır"""
+        self.hide_progress("camera")
+        try:
+            settings = future.result()
+        except Exception as e:
+            self.camera_failed(e)
+            return
+        if settings is not None:
+            self.load_model(settings)
+        self.start_pipeline()
+
+    def start_pipeline(self):
+        if self.pose is None or self.tasks.get("model"):
+            if self.model_future.done() and self.model_future.exception():
+                self.camera_failed(self.model_future.exception())
+            else:
+                self.window.after(20, self.start_pipeline) # Model yükleniyor
+            return
+        try:
             self.btn_start.config(state=tk.DISABLED)
             self.btn_analyze.config(state=tk.NORMAL)
             self.btn_reset.config(state=tk.NORMAL)
             self.btn_stop.config(state=tk.NORMAL)
-            self.status_label.config(text="Analizi Başlatın", fg="#34495e")
+            self.view.set("status", text="Analizi Başlatın", fg="#34495e")
+            
+            if self.recording_var.get():
+                self.recorder = SessionRecorder()
             
+            # OpenCV open_camera'da yüklendi; bu modüller ek süre getirmez
+            from frame_buffers import DisplayScaler
+            from overlay import OverlayRenderer
+            from pipeline import FramePipeline
+            from roi import RoiTracker
+            if self.roi_tracker is None:
+                self.display_scaler = DisplayScaler((640, 480))
+                self.overlay = OverlayRenderer()
+                with self.pose_lock:
+                    self.roi_tracker = RoiTracker(input_scale=self.input_scale)
+            self.roi_tracker.reset()
+            
+            # Yakalama ve çıkarım ayrı iş parçacıklarında, ekran Tk döngüsünde
+            self.metrics = StageMetrics()
+            self.view.metrics = self.metrics
+            self.pipeline = FramePipeline(self.vid, self.run_inference, self.metrics)
+            self.pipeline.start()
             self.update_video()
+            self.update_perf_stats()
         except Exception as e:
-            messagebox.showerror("Hata", f"Kamera başlatılamadı:\n{str(e)}")
-            self.status_label.config(text="Kamera Hatası", fg="#e74c3c")
-            if self.vid:
-                self.vid.release()
-                self.vid = None
-            self.btn_start.config(state=tk.NORMAL) # Başlat butonunu tekrar aktif et
-            self.btn_analyze.config(state=tk.DISABLED)
-            self.btn_reset.config(state=tk.DISABLED)
-            self.btn_stop.config(state=tk.DISABLED)
+            self.camera_failed(e)
+
+    def camera_failed(self, error):
+        messagebox.showerror("Hata", f"Kamera başlatılamadı:\n{str(error)}")
+        self.view.set("status", text="Kamera Hatası", fg="#e74c3c")
+        if self.vid:
+            self.vid.release()
+            self.vid = None
+        self.btn_start.config(state=tk.NORMAL) # Başlat butonunu tekrar aktif et
+        self.btn_analyze.config(state=tk.DISABLED)
+        self.btn_reset.config(state=tk.DISABLED)
+        self.btn_stop.config(state=tk.DISABLED)
 
     def stop_camera(self):
         """Kamerayı durdurur"""
+        if self.pipeline:
+            self.pipeline.stop() # Kaynağı yakalama iş parçacığı bitince kapatır
+            self.pipeline = None
+            self.vid = None
+        if self.recorder:
+            self.recorder.close() # Bekleyen kareler diske yazılır
+            self.recorder = None
+        self.export_metrics()
+        self.renderer.hide_overlay()
         if self.vid:      
             self.vid.release()
             self.vid = None
@@ -202,16 +495,17 @@ class SporHareketApp:
         self.btn_stop.config(state=tk.DISABLED)
         
         self.analyzing = False
-        self.status_label.config(text="Kamerayı Başlatın", fg="#34495e")
-        self.canvas.delete("all") # Kamerayı durdurunca canvası temizle
-        self.canvas.create_text(320, 240, text="Kamera Kapalı", fill="white", font=("Arial", 16))
+        self.view.set("status", text="Kamerayı Başlatın", fg="#34495e")
+        self.renderer.show_message("Kamera Kapalı") # Kamerayı durdurunca canvası temizle
+        self.show_startup_times()
 
 
         if self.timer_running:
             self.toggle_timer() # Zamanlayıcıyı durdur
-        self.timer_label.config(text="00:00") # Zamanlayıcıyı sıfırla
-        self.correct_count = 0 # Sayacı sıfırla
-        self.counter_label.config(text="0")
+        self.view.set("timer", text="00:00") # Zamanlayıcıyı sıfırla
+        with self.engine_lock:
+            self.engine.reset() # Sayacı sıfırla
+        self.view.set("counter", text="0")
 
 
     def toggle_analysis(self):
@@ -220,12 +514,12 @@ class SporHareketApp:
         
         if self.analyzing:
             self.btn_analyze.config(text="Analizi Durdur", bg="#f39c12")
-            self.status_label.config(text=f"{self.current_movement} bekleniyor...", fg="#34495e")
+            self.view.set("status", text=f"{self.engine.movement} bekleniyor...", fg="#34495e")
             if not self.timer_running:
                 self.toggle_timer()
         else:
             self.btn_analyze.config(text="Analiz Et", bg="#2ecc71")
-            self.status_label.config(text="Analiz Durduruldu", fg="#34495e")
+            self.view.set("status", text="Analiz Durduruldu", fg="#34495e")
             # Analiz durduğunda zamanlayıcıyı da durdur
             if self.timer_running:
                 self.toggle_timer()
@@ -248,16 +542,16 @@ class SporHareketApp:
             elapsed = datetime.now() - self.start_time
             seconds = elapsed.seconds % 60
             minutes = elapsed.seconds // 60
-            self.timer_label.config(text=f"{minutes:02d}:{seconds:02d}")
+            self.view.set("timer", text=f"{minutes:02d}:{seconds:02d}")
             self.window.after(1000, self.update_timer)
     
     def reset_counter_and_timer(self):
         """Sayaçları ve zamanlayıcıyı sıfırlar"""
-        self.correct_count = 0
-        self.counter_label.config(text="0")
-        self.prev_movement_state = None # Önceki durumu sıfırla
+        with self.engine_lock:
+            self.engine.reset() # Sayacı ve önceki durumu sıfırla
+        self.view.set("counter", text="0")
         
-        self.timer_label.config(text="00:00")
+        self.view.set("timer", text="00:00")
         if self.timer_running: # Eğer zamanlayıcı çalışıyorsa
             self.start_time = datetime.now() # Baştan başlat
         else: # Çalışmıyorsa
@@ -265,336 +559,184 @@ class SporHareketApp:
             self.elapsed_time = timedelta() # Geçen süreyi de sıfırla
 
         if self.analyzing:
-             self.status_label.config(text=f"{self.current_movement} bekleniyor...", fg="#34495e")
+             self.view.set("status", text=f"{self.engine.movement} bekleniyor...", fg="#34495e")
 
 
     def update_video(self):
-        """Video akışını günceller"""
-        if self.vid and self.vid.isOpened():
-            ret, frame = self.vid.read()
-            
-            if ret:
-                frame = cv2.flip(frame, 1)
-                display_frame = frame.copy() # Çizimler için kopya oluştur
-                
-                if self.analyzing:
-                    self.analyze_frame(frame, display_frame) # display_frame'i de yolla
-                
-                # Görüntüyü Tkinter formatına çevir
-                img = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-                img = Image.fromarray(img)
-                img = img.resize((640, 480), Image.LANCZOS)
-                self.photo = ImageTk.PhotoImage(image=img)
-                
-                self.canvas.delete("all")
-                self.canvas.create_image(0, 0, image=self.photo, anchor=tk.NW)
-                
-                # Bilgileri ekrana yaz (canvas üzerine)
-                # self.canvas.create_text(10, 20, text=f"Hareket: {self.current_movement}",  
-                #                         anchor=tk.W, fill="yellow", font=("Arial", 12, "bold"))
-                
-                # Sonraki kareyi planla
-                self.window.after(15, self.update_video)
-            else:
-                # messagebox.showinfo("Video Sonu", "Video akışı sonlandı veya kare okunamadı.")
-                self.stop_camera() # Kare okunamıyorsa kamerayı durdur
-        # else:
-            # self.stop_camera() # vid None ise veya kapalıysa kamerayı durdur
-
-    def analyze_frame(self, frame_to_process, frame_to_draw):
-        """Görüntüde hareket analizi yapar ve frame_to_draw üzerine çizer"""
-        image_rgb = cv2.cvtColor(frame_to_process, cv2.COLOR_BGR2RGB)
-        image_rgb.flags.writeable = False # Performans için
-        results = self.pose.process(image_rgb)
-        image_rgb.flags.writeable = True # Tekrar yazılabilir yap
-        
-        if results.pose_landmarks:
-            self.mp_drawing.draw_landmarks(
-                frame_to_draw, results.pose_landmarks, self.mp_pose.POSE_CONNECTIONS,
-                self.mp_drawing.DrawingSpec(color=(245,117,66), thickness=2, circle_radius=2),
-                self.mp_drawing.DrawingSpec(color=(245,66,230), thickness=2, circle_radius=2)
-            )
-            
-            landmarks = results.pose_landmarks.landmark
-            
-            # Hareket analizi
-            if self.current_movement == "Squat":
-                self.analyze_squat(frame_to_draw, landmarks)
-            elif self.current_movement == "Push-up":
-                self.analyze_pushup(frame_to_draw, landmarks)
-            elif self.current_movement == "Lunge":
-                self.analyze_lunge(frame_to_draw, landmarks)
-            elif self.current_movement == "Bicep Curl":
-                self.analyze_bicep_curl(frame_to_draw, landmarks)
-            elif self.current_movement == "Shoulder Press":
-                self.analyze_shoulder_press(frame_to_draw, landmarks)
-            # Diğer hareket analizleri buraya eklenebilir
-    
-    def calculate_angle(self, a, b, c):
-        """Üç nokta arasındaki açıyı (b noktasında) hesaplar"""
-        # Noktaların görünür olup olmadığını kontrol et
-        if not (a.visibility > 0.5 and b.visibility > 0.5 and c.visibility > 0.5):
-            return None # Eğer landmarklardan biri yeterince görünür değilse None döndür
-
-        a = np.array([a.x, a.y])
-        b = np.array([b.x, b.y])
-        c = np.array([c.x, c.y])
-        
-        ba = a - b
-        bc = c - b
+        """İşlenmiş en yeni kareyi ekrana çizer"""
+        if not self.pipeline:
+            return
+        if self.pipeline.ended:
+            self.stop_camera() # Kare okunamıyorsa kamerayı durdur
+            return
         
-        cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
-        # Kırpmayı -1 ile 1 arasında yap, np.arccos argümanı bu aralıkta olmalı
-        cosine_angle = np.clip(cosine_angle, -1.0, 1.0)
-        angle = np.arccos(cosine_angle)
-        
-        return np.degrees(angle)
-
-    def analyze_squat(self, frame, landmarks):
-        """Squat analizi (Bacak açısı ve gövde duruşu)"""
-        try:
-            # Bacak açısı için landmarklar (Sol taraf)
-            hip_l = landmarks[self.mp_pose.PoseLandmark.LEFT_HIP.value]
-            knee_l = landmarks[self.mp_pose.PoseLandmark.LEFT_KNEE.value]
-            ankle_l = landmarks[self.mp_pose.PoseLandmark.LEFT_ANKLE.value]
-            
-            # Gövde açısı için landmarklar (Sol taraf)
-            shoulder_l = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-
-            # Bacak açısı (Dizdeki açı)
-            leg_angle = self.calculate_angle(hip_l, knee_l, ankle_l)
-            
-            # Gövde açısı (Kalçadaki açı: Omuz-Kalça-Diz)
-            # Bu açı, gövdenin femura göre ne kadar dik olduğunu gösterir.
-            # Squat sırasında bu açı çok küçülmemeli (aşırı öne eğilme).
-            torso_angle = self.calculate_angle(shoulder_l, hip_l, knee_l)
-
-            leg_angle_correct = False
-            torso_angle_correct = False
-
-            if leg_angle is not None:
-                cv2.putText(frame, f"Bacak: {int(leg_angle)}",  
-                            (int(knee_l.x * frame.shape[1]) + 10, int(knee_l.y * frame.shape[0])),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (50, 255, 50), 2)
-                
-                target_leg = self.target_angles["Squat"]
-                if target_leg - self.angle_tolerance <= leg_angle <= target_leg + self.angle_tolerance:
-                    leg_angle_correct = True
-            
-            if torso_angle is not None:
-                cv2.putText(frame, f"Govde: {int(torso_angle)}",  
-                            (int(hip_l.x * frame.shape[1]) - 80, int(hip_l.y * frame.shape[0]) - 20), # Pozisyonu ayarla
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (50, 255, 50) if torso_angle >= self.min_torso_angles["Squat"] else (255,50,50), 2)
-                
-                min_torso = self.min_torso_angles["Squat"]
-                if torso_angle >= min_torso:
-                    torso_angle_correct = True
-
-            # Hem bacak açısı hem de gövde açısı doğruysa hareket doğru kabul edilir
-            if leg_angle is not None and torso_angle is not None: # İki açı da hesaplanabildiyse
-                if leg_angle_correct and torso_angle_correct:
-                    self.update_status(True, "DOĞRU")
-                elif not leg_angle_correct and torso_angle_correct:
-                    self.update_status(False, "BACAK YANLIŞ")
-                elif leg_angle_correct and not torso_angle_correct:
-                     self.update_status(False, "GÖVDE YANLIŞ")
-                else:
-                    self.update_status(False, "BACAK & GÖVDE YANLIŞ")
-            else: # Eğer açılardan biri veya ikisi de hesaplanamadıysa (landmark görünür değilse)
-                self.update_status(False, "Pozisyon Belirsiz")
-
-        except IndexError:
-            self.update_status(False, "Landmarklar Eksik")
-        except Exception as e:
-            # print(f"Squat analiz hatası: {e}")
-            self.update_status(False, "Analiz Hatası")
-
-
-    def analyze_pushup(self, frame, landmarks):
-        """Push-up analizi"""
-        try:
-            # Sol tarafı kullanalım, sağ da kullanılabilir veya ortalaması alınabilir
-            shoulder = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-            elbow = landmarks[self.mp_pose.PoseLandmark.LEFT_ELBOW.value]
-            wrist = landmarks[self.mp_pose.PoseLandmark.LEFT_WRIST.value]
-            
-            angle = self.calculate_angle(shoulder, elbow, wrist)
-            
-            if angle is not None:
-                cv2.putText(frame, f"{int(angle)}",  
-                            (int(elbow.x * frame.shape[1]) + 10, int(elbow.y * frame.shape[0])),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 50), 2)
-                
-                target = self.target_angles["Push-up"]
-                if target - self.angle_tolerance <= angle <= target + self.angle_tolerance:
-                    self.update_status(True, "DOĞRU")
-                else:
-                    self.update_status(False, "AÇI YANLIŞ")
-            else:
-                self.update_status(False, "Pozisyon Belirsiz")
-        except IndexError:
-            self.update_status(False, "Landmarklar Eksik")
-        except Exception as e:
-            self.update_status(False, "Analiz Hatası")
-
-
-    def analyze_lunge(self, frame, landmarks):
-        """Lunge analizi (Ön diz ve Arka diz açıları)"""
-        try:
-            # Ön bacak (Sol varsayalım, kullanıcıya göre değişebilir)
-            hip_l = landmarks[self.mp_pose.PoseLandmark.LEFT_HIP.value]
-            knee_l = landmarks[self.mp_pose.PoseLandmark.LEFT_KNEE.value]
-            ankle_l = landmarks[self.mp_pose.PoseLandmark.LEFT_ANKLE.value]
-
-            # Arka bacak (Sağ varsayalım)
-            hip_r = landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP.value]
-            knee_r = landmarks[self.mp_pose.PoseLandmark.RIGHT_KNEE.value]
-            ankle_r = landmarks[self.mp_pose.PoseLandmark.RIGHT_ANKLE.value]
-
-            front_knee_angle = self.calculate_angle(hip_l, knee_l, ankle_l)
-            back_knee_angle = self.calculate_angle(hip_r, knee_r, ankle_r)
-            
-            # Lunge için genellikle her iki dizin de 90 dereceye yakın olması hedeflenir.
-            # Visibility check'i calculate_angle içinde yapılıyor.
-            
-            front_correct = False
-            back_correct = False
-            
-            target_lunge = self.target_angles["Lunge"]
-
-            if front_knee_angle is not None:
-                cv2.putText(frame, f"On: {int(front_knee_angle)}",
-                            (int(knee_l.x * frame.shape[1]) + 10, int(knee_l.y * frame.shape[0])),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,50), 2)
-                if target_lunge - self.angle_tolerance <= front_knee_angle <= target_lunge + self.angle_tolerance:
-                    front_correct = True
+        item = self.pipeline.poll()
+        if item is not None:
+            if self.first_frame_ms is None:
+                self.first_frame_ms = (time.perf_counter() - self.start_clock) * 1000.0
+            # frame aynalanmış RGB tampondur ve artık bu aşamaya aittir;
+            # ekran boyutuna getirilen kare (640x480 ise frame'in kendisi)
+            # üzerine doğrudan çizilir, kopya gerekmez
+            frame_id, timestamp, frame, output = item
+            points, analysis = output if self.analyzing and output is not None else (None, None)
+            if analysis is not None:
+                self.show_result(analysis)
             
-            if back_knee_angle is not None:
-                cv2.putText(frame, f"Arka: {int(back_knee_angle)}",
-                            (int(knee_r.x * frame.shape[1]) + 10, int(knee_r.y * frame.shape[0])),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,50), 2)
-                # Arka diz için de benzer bir kontrol, belki tolerans farklı olabilir.
-                if target_lunge - self.angle_tolerance <= back_knee_angle <= target_lunge + self.angle_tolerance:
-                    back_correct = True
-
-            if front_knee_angle is not None and back_knee_angle is not None:
-                if front_correct and back_correct:
-                    self.update_status(True, "DOĞRU")
-                else:
-                    status_msg = []
-                    if not front_correct: status_msg.append("ÖN DİZ")
-                    if not back_correct: status_msg.append("ARKA DİZ")
-                    self.update_status(False, f"{' & '.join(status_msg)} YANLIŞ")
-            else:
-                self.update_status(False, "Pozisyon Belirsiz")
-
-        except IndexError:
-            self.update_status(False, "Landmarklar Eksik")
-        except Exception as e:
-            self.update_status(False, "Analiz Hatası")
-
-
-    def analyze_bicep_curl(self, frame, landmarks):
-        """Bicep Curl analizi"""
-        try:
-            shoulder = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-            elbow = landmarks[self.mp_pose.PoseLandmark.LEFT_ELBOW.value]
-            wrist = landmarks[self.mp_pose.PoseLandmark.LEFT_WRIST.value]
-            
-            angle = self.calculate_angle(shoulder, elbow, wrist)
-
-            # Bicep curl için iki aşama olabilir: başlangıç (kol düz) ve bitiş (kol bükülü)
-            # Şimdilik sadece bükülü halini (tepe noktası) kontrol edelim.
-            # Hedef açı, kolun ne kadar büküldüğünü gösterir (örn: 30 derece çok bükülü)
-            
-            if angle is not None:
-                cv2.putText(frame, f"{int(angle)}",  
-                            (int(elbow.x * frame.shape[1]) + 10, int(elbow.y * frame.shape[0])),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255,255,50), 2)
-                
-                target = self.target_angles["Bicep Curl"] # Örneğin 30 derece (tam bükülü)
-                # Bicep curl'de hareketin tepe noktasında açı küçük olmalı
-                if angle <= target + self.angle_tolerance : # Alt eşik de eklenebilir: angle >= target - self.angle_tolerance
-                    self.update_status(True, "DOĞRU (TEPE)")
-                # Başlangıç pozisyonu (kol düz) kontrolü de eklenebilir.
-                # elif angle >= 160 - self.angle_tolerance: # Kol düzken
-                #    self.update_status(False, "BAŞLANGIÇ") # Bu sayılmaz, sadece durum bilgisi
-                else:
-                    self.update_status(False, "AÇI YANLIŞ")
-            else:
-                self.update_status(False, "Pozisyon Belirsiz")
-
-        except IndexError:
-            self.update_status(False, "Landmarklar Eksik")
-        except Exception as e:
-            self.update_status(False, "Analiz Hatası")
-
+            if not self.minimized: # Simge durumundaki pencereye çizim ve boyama yapılmaz
+                start = time.perf_counter()
+                display = self.display_scaler.scale(frame)
+                scaled = time.perf_counter()
+                self.metrics.record("resize", scaled - start)
+                if analysis is not None:
+                    self.draw_result(display, points, analysis)
+                # Görüntüyü kalıcı PhotoImage'e bas
+                start = time.perf_counter()
+                self.renderer.show_frame(display)
+                end = time.perf_counter()
+                self.metrics.record("paint", end - start)
+                self.metrics.record("total", end - timestamp) # Yakalamadan ekrana
+            self.pipeline.release(frame)
+        
+        # Yeni kare gelmemiş olabilir, kısa aralıkla tekrar yokla
+        self.window.after(5, self.update_video)
+
+    def update_perf_stats(self):
+        """Aşama FPS ve düşen kare sayılarını gösterir"""
+        if not self.pipeline:
+            return
+        stats = self.pipeline.stats()
+        adaptive = self.adaptive.stats()
+        first_frame = f"{self.first_frame_ms:.0f} ms" if self.first_frame_ms is not None else "-"
+        settings = self.pose_settings or PoseSettings()
+        self.view.set("perf", text=(
+            f"{self.source_info}Model {settings.model_complexity} (ölçek {settings.input_scale:g}) | "
+            f"İlk kare: {first_frame}\n"
+            f"Kamera: {stats['capture_fps']:.1f} fps | "
+            f"Çıkarım: {stats['inference_fps']:.1f} fps | "
+            f"Ekran: {stats['render_fps']:.1f} fps | "
+            f"Atlanan: {stats['inference_dropped'] + stats['render_dropped']}"
+        ) + (
+            f" | Tahmin: %{adaptive['interpolated_ratio'] * 100:.0f} "
+            f"(her {adaptive['interval']} karede bir çıkarım)"
+            if self.adaptive_enabled else ""
+        ) + (
+            f" | Kayıt: {self.recorder.frames} kare" if self.recorder else ""
+        ) + f" | Kırpma isabeti: %{self.roi_tracker.stats()['crop_hit_rate'] * 100:.0f}" + (
+            f" | Hatalı kare: {stats['inference_errors']} ({self.pipeline.inference.last_error})"
+            if stats["inference_errors"] else ""
+        ))
+        self.update_overlay()
+        self.window.after(1000, self.update_perf_stats)
+
+    def update_overlay(self):
+        """Performans katmanını aşama gecikmeleriyle günceller ya da gizler"""
+        if self.overlay_var.get() and self.pipeline:
+            self.renderer.show_overlay(self.metrics.format_overlay())
+        else:
+            self.renderer.hide_overlay()
 
-    def analyze_shoulder_press(self, frame, landmarks):
-        """Shoulder Press analizi"""
+    def export_metrics(self):
+        """Aşama gecikmelerini JSON ve Prometheus metin dosyası olarak yazar"""
+        if not self.metrics.stages:
+            return
+        base = os.path.join(os.path.expanduser("~"), ".spor_takip")
         try:
-            # Dirsek açısı ve omuzun kulak hizasında olup olmadığı kontrol edilebilir.
-            shoulder_l = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-            elbow_l = landmarks[self.mp_pose.PoseLandmark.LEFT_ELBOW.value]
-            wrist_l = landmarks[self.mp_pose.PoseLandmark.LEFT_WRIST.value]
-            
-            # Dirsek açısı
-            elbow_angle = self.calculate_angle(shoulder_l, elbow_l, wrist_l)
-            
-            # Omuzların pozisyonu da önemli olabilir (çok yukarı kalkmaması vb.)
-            # Şimdilik sadece dirsek açısına odaklanalım (kollar yukarıdayken)
-            
-            if elbow_angle is not None:
-                cv2.putText(frame, f"Dirsek: {int(elbow_angle)}",  
-                            (int(elbow_l.x * frame.shape[1]) + 10, int(elbow_l.y * frame.shape[0])),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255,255,50), 2)
-                
-                target = self.target_angles["Shoulder Press"] # Örneğin 170-180 derece (kollar düz)
-                
-                # Kollar yukarıdayken (hareketin tepe noktası)
-                if elbow_angle >= target - self.angle_tolerance:
-                    self.update_status(True, "DOĞRU (TEPE)")
-                # Başlangıç pozisyonu (dirsekler 90 derece veya omuz hizası) da kontrol edilebilir.
-                # elif abs(elbow_angle - 90) < self.angle_tolerance:
-                #     self.update_status(False, "BAŞLANGIÇ")
-                else:
-                    self.update_status(False, "AÇI YANLIŞ")
-            else:
-                self.update_status(False, "Pozisyon Belirsiz")
-
-        except IndexError:
-            self.update_status(False, "Landmarklar Eksik")
-        except Exception as e:
-            self.update_status(False, "Analiz Hatası")
-
-    def update_status(self, is_correct_phase, status_message):
-        """Durumu günceller ve sayacı artırır"""
-        current_time = datetime.now()
-
-        if is_correct_phase:
-            self.status_label.config(text=status_message, fg="#27ae60") # Yeşil
-            # Sadece "YANLIŞ" durumundan "DOĞRU" durumuna geçişte sayacı artır
-            if self.prev_movement_state == False or self.prev_movement_state is None:
-                self.correct_count += 1
-                self.counter_label.config(text=str(self.correct_count))
-            self.movement_correct = True
-        else:
-            self.status_label.config(text=status_message, fg="#e74c3c") # Kırmızı
-            self.movement_correct = False
+            os.makedirs(base, exist_ok=True)
+            with open(os.path.join(base, "metrics.json"), "w", encoding="utf-8") as f:
+                f.write(self.metrics.to_json(indent=2))
+            with open(os.path.join(base, "metrics.prom"), "w", encoding="utf-8") as f:
+                f.write(self.metrics.to_prometheus())
+        except OSError:
+            pass
+
+    def detect_pose(self, frame):
+        """RGB karede poz tespiti yapar; (tam kare koordinatlı (33, 4) landmark
+        dizisi ya da None, dünya landmarkları) döndürür.
+
+        Dünya landmarkları kalçaya göre metre cinsinden olduğundan kırpılmış
+        bölgedeki çıkarımdan etkilenmez.
+        """
+        with self.pose_lock:
+            results, points = self.roi_tracker.process(self.pose, frame)
+        return points, results.pose_world_landmarks
+
+    def run_inference(self, frame, timestamp):
+        """Çıkarım iş parçacığında poz tespiti ve hareket analizi yapar.
+
+        Analiz kapalıysa None, açıksa (points, analysis) döndürür. Uyarlamalı
+        modda atlanan karelerde points son çıkarımlardan tahmin edilir.
+        """
+        if not self.analyzing:
+            return None
+        world = None
+        with self.adaptive_lock:
+            adaptive = self.adaptive_enabled
+            predicted = adaptive and not self.adaptive.should_infer()
+            if predicted:
+                points = self.adaptive.extrapolate(timestamp)
+        if not predicted:
+            start = time.perf_counter()
+            points, world = self.detect_pose(frame)
+            elapsed = time.perf_counter() - start
+            self.metrics.record("pose", elapsed)
+            latency_ms = elapsed * 1000.0
         
-        self.prev_movement_state = self.movement_correct
+        with self.engine_lock:
+            start = time.perf_counter()
+            analysis = self.engine.process_points(points, timestamp, predicted, world)
+            self.metrics.record("analysis", time.perf_counter() - start)
+            if adaptive and not predicted:
+                # Atlanan kareler yumuşatılmış landmarklardan ve filtre hızından tahmin edilir
+                smoother = self.engine.smoother
+                with self.adaptive_lock:
+                    self.adaptive.update(self.engine.smoothed_points, timestamp, latency_ms,
+                                         smoother.velocity if smoother else None)
+            if self.recorder:
+                self.recorder.record(analysis, self.engine.smoothed_points, self.engine.smoothed_world)
+        return points, analysis
+
+    def draw_result(self, display, points, analysis):
+        """İskeleti ve hesaplanan açıları ekran boyutundaki kare üzerine çizer"""
+        if points is None:
+            return
+        start = time.perf_counter()
+        self.overlay.draw(display, points, analysis)
+        self.metrics.record("overlay", time.perf_counter() - start)
+
+    def show_result(self, analysis):
+        """Durum etiketini ve sayacı günceller"""
+        if analysis.status == "NO_POSE":
+            return # Kişi bulunamadıysa önceki durum ekranda kalır
+        if analysis.is_correct:
+            self.view.set("status", text=analysis.message, fg="#27ae60") # Yeşil
+        else:
+            self.view.set("status", text=analysis.message, fg="#e74c3c") # Kırmızı
+        # Sonuç kuyruğu eski sonuçları düşürdüğünden tekrarın sayıldığı kare
+        # ekrana hiç gelmeyebilir; sayaç her sonuçta yazılır (değişmediyse
+        # ViewModel Tk'ye göndermez)
+        self.view.set("counter", text=str(analysis.count))
+
 
+    def on_visibility_changed(self, event):
+        """Pencere simge durumuna küçültülünce ya da geri açılınca çağrılır"""
+        if event.widget is self.window:
+            self.minimized = event.type == tk.EventType.Unmap
 
     def on_closing(self):
         """Pencere kapatılırken temizlik yapar"""
         self.stop_camera()
+        self.view.cancel()
+        self.background.shutdown(wait=False, cancel_futures=True)
         if self.pose:
             self.pose.close() # MediaPipe pose modelini serbest bırak
         self.window.destroy()
 
 # Uygulamayı başlat
 if __name__ == "__main__":
+    import sys
     from datetime import timedelta # toggle_timer ve reset_counter_and_timer için eklendi
+    # İsteğe bağlı kaynak: python pose_kamera.py [kamera indeksi | video | klasör | rtsp://... | synthetic]
+    source = sys.argv[1] if len(sys.argv) > 1 else None
     root = tk.Tk()
-    app = SporHareketApp(root, "Spor Hareket Analiz Uygulaması v2.0")
+    app = SporHareketApp(root, "Spor Hareket Analiz Uygulaması v2.0", source)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""Poz modeli ayarları ve makineye göre otomatik ayar seçimi.
+
+Ayarlar ~/.spor_takip/pose_settings.json dosyasında saklanır. Otomatik
+ayar, model karmaşıklığı (0/1/2) ve giriş ölçeği kombinasyonlarını bu
+makinede ölçer; hedef FPS'i tutturan en doğru ayarı seçip kaydeder.
+
+Örnek:
+    python pose_settings.py --tune 0 --target-fps 25
+"""
+import argparse
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, fields, replace
+
+import numpy as np
+
+SETTINGS_PATH = os.path.join(os.path.expanduser("~"), ".spor_takip", "pose_settings.json")
+TARGET_FPS = 25.0 # Gerçek zamanlı sayılan en düşük çıkarım hızı
+
+
+@dataclass
+class PoseSettings:
+    """mp_pose.Pose parametreleri ve çıkarım giriş ölçeği"""
+    model_complexity: int = 1           # 0: hızlı, 1: dengeli, 2: en doğru
+    smooth_landmarks: bool = True
+    static_image_mode: bool = False     # True: kareler arası takip yok
+    min_detection_confidence: float = 0.5
+    min_tracking_confidence: float = 0.5
+    input_scale: float = 1.0            # Kare çıkarımdan önce bu oranda küçültülür
+    measured_fps: float = None          # Otomatik ayarda ölçülen hız
+
+    def create_pose(self):
+        """Bu ayarlarla MediaPipe Pose modeli oluşturur"""
+        import mediapipe as mp # Yüklemesi uzun sürer; sadece model gerektiğinde
+        return mp.solutions.pose.Pose(
+            static_image_mode=self.static_image_mode,
+            model_complexity=self.model_complexity,
+            smooth_landmarks=self.smooth_landmarks,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+def load_settings(path=SETTINGS_PATH):
+    """Kayıtlı ayarları döndürür; yoksa None"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return PoseSettings.from_dict(json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save_settings(settings, path=SETTINGS_PATH):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(asdict(settings), f, indent=2)
+    except OSError:
+        pass # Kaydedilemezse bir sonraki açılışta yeniden ölçülür
+
+
+def measure_fps(settings, frames, warmup=5):
+    """Ayarın verilen RGB karelerdeki çıkarım hızını (kare/sn) ölçer.
+
+    İlk warmup kare (model yükleme, ilk tespit) ölçüme katılmaz; ortanca
+    kare süresi kullanılır.
+    """
+    from frame_buffers import scale_frame # OpenCV sadece ölçümde gerekir
+    pose = settings.create_pose()
+    buf = None
+    times = []
+    try:
+        for i, frame in enumerate(frames):
+            start = time.perf_counter()
+            buf = scale_frame(frame, settings.input_scale, buf)
+            pose.process(buf)
+            if i >= warmup:
+                times.append(time.perf_counter() - start)
+    finally:
+        pose.close()
+    return 1.0 / float(np.median(times)) if times else 0.0
+
+
+def candidates(complexities=(2, 1, 0), scales=(1.0, 0.75, 0.5), base=None):
+    """Denenecek ayarları en doğrudan en hızlıya doğru sıralar.
+
+    Model karmaşıklığı giriş çözünürlüğünden daha önemli kabul edilir.
+    """
+    base = base or PoseSettings()
+    return [replace(base, model_complexity=c, input_scale=s)
+            for c in sorted(complexities, reverse=True)
+            for s in sorted(scales, reverse=True)]
+
+
+def auto_tune(frames, target_fps=TARGET_FPS, complexities=(2, 1, 0), scales=(1.0, 0.75, 0.5),
+              base=None, path=SETTINGS_PATH, log=print):
+    """Hedef FPS'i tutturan en doğru ayarı seçer ve kaydeder.
+
+    Adaylar doğruluk sırasıyla denenir ve hedefi tutturan ilk adayda
+    durulur. Hiçbiri tutturamazsa en hızlı aday seçilir.
+    """
+    best = None
+    for settings in candidates(complexities, scales, base):
+        settings.measured_fps = round(measure_fps(settings, frames), 1)
+        if log:
+            log(f"model_complexity={settings.model_complexity} "
+                f"input_scale={settings.input_scale:g}: {settings.measured_fps} kare/sn")
+        if best is None or settings.measured_fps > best.measured_fps:
+            best = settings
+        if settings.measured_fps >= target_fps:
+            best = settings
+            break
+    if best is not None and path:
+        save_settings(best, path)
+    return best
+
+
+def sample_frames(source, count=30):
+    """Kaynaktan RGB örnek kareler okur"""
+    import cv2
+    frames = []
+    for _ in range(count):
+        ret, frame = source.read()
+        if not ret:
+            break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    return frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Poz modeli otomatik ayarı")
+    parser.add_argument("--tune", metavar="KAYNAK", default="0",
+                        help="Ölçümde kullanılacak kaynak (kamera indeksi, video, synthetic)")
+    parser.add_argument("--target-fps", type=float, default=TARGET_FPS, help="Hedef çıkarım hızı")
+    parser.add_argument("--frames", type=int, default=30, help="Aday başına ölçülecek kare")
+    args = parser.parse_args(argv)
+
+    from frame_sources import open_source
+    source = open_source(args.tune)
+    try:
+        frames = sample_frames(source, args.frames)
+    finally:
+        source.release()
+    if not frames:
+        raise SystemExit(f"Kaynaktan kare okunamadı: {args.tune}")
+    best = auto_tune(frames, args.target_fps)
+    print(f"Seçilen: model_complexity={best.model_complexity} input_scale={best.input_scale:g} "
+          f"({best.measured_fps} kare/sn) -> {SETTINGS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Tekrar sayımı için histerezisli durum makinesi.
+
+Bir tekrar tepe -> iniş -> dip -> çıkış -> tepe döngüsüdür. Bölge
+sınırlarında giriş ve çıkış eşikleri farklı olduğundan açıdaki titreşim
+sahte tekrar üretmez; dipte doğru formda toplam en az min_dwell saniye
+geçirilmesi gerekir.
+"""
+
+TOP = "TOP"
+DESCENDING = "DESCENDING"
+BOTTOM = "BOTTOM"
+ASCENDING = "ASCENDING"
+
+# Dipte geçen sürenin eşikle karşılaştırılmasında kayan nokta payı; toplama
+# sırası farklı olan vektörel sayımın (replay) aynı sonucu vermesi için
+DWELL_EPSILON = 1e-9
+
+
+class RepStateMachine:
+    """Tek bir açıdan tekrar sayan durum makinesi.
+
+    rest_angle: hareketin başlangıç (tepe) açısı. goal_angle: hedef açı
+    (dip). Açı her iki yönde de değişebilir (Shoulder Press'te artar).
+    Açılar ilerleme derinliğine çevrilir: tepede 0, hedefte
+    |rest_angle - goal_angle|.
+
+    top_band: tepe bölgesinin genişliği (derece). tolerance: hedefe bu
+    kadar yaklaşınca dibe girilir. hysteresis: bölgeden çıkmak için giriş
+    eşiğinin ötesinde gidilmesi gereken ek mesafe.
+    """
+
+    def __init__(self, rest_angle, goal_angle, tolerance=20, top_band=20,
+                 hysteresis=10, min_dwell=0.1):
+        self.sign = 1.0 if goal_angle < rest_angle else -1.0
+        self.rest_angle = rest_angle
+        depth = abs(rest_angle - goal_angle)
+        self.top_enter = top_band
+        self.top_exit = top_band + hysteresis
+        self.bottom_enter = depth - tolerance
+        self.bottom_exit = depth - tolerance - hysteresis
+        self.min_dwell = min_dwell
+        self.reset()
+
+    def reset(self):
+        self.phase = TOP
+        self.count = 0
+        self._held = 0.0        # Bu dip ziyaretinde doğru formda geçen süre
+        self._last_time = None  # Dipteki önceki ölçümün zamanı
+        self._valid = False     # Bu tekrarda dip şartı sağlandı mı
+
+    def update(self, angle, correct, timestamp):
+        """Yeni bir açı ölçümüyle durumu ilerletir; tekrar tamamlandıysa True.
+
+        angle None ise (eklem görünmüyor) durum değişmez.
+        """
+        if angle is None:
+            return False
+        depth = (self.rest_angle - angle) * self.sign
+        phase = self.phase
+
+        if phase == TOP:
+            if depth > self.top_exit:
+                self.phase = DESCENDING
+                self._valid = False
+        elif phase == DESCENDING:
+            if depth >= self.bottom_enter:
+                self.phase = BOTTOM
+                self._held, self._last_time = 0.0, None
+            elif depth <= self.top_enter:
+                self.phase = TOP # Dibe inilmeden geri dönüldü
+        elif phase == ASCENDING:
+            if depth >= self.bottom_enter:
+                self.phase = BOTTOM
+                self._held, self._last_time = 0.0, None
+            elif depth <= self.top_enter:
+                self.phase = TOP
+                if self._valid:
+                    self.count += 1
+                    return True
+
+        if self.phase == BOTTOM:
+            if correct and self._last_time is not None:
+                self._held += timestamp - self._last_time
+                if self._held >= self.min_dwell - DWELL_EPSILON:
+                    self._valid = True
+            self._last_time = timestamp
+            if depth < self.bottom_exit:
+                self.phase = ASCENDING
+        return False
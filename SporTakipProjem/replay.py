@@ -0,0 +1,248 @@
+"""Kaydedilmiş oturumların poz tespiti yapılmadan yeniden puanlanması.
+
+Hareket kontrolleri tüm oturum üzerinde vektörel olarak, tekrar sayımı
+sadece eşik geçişlerinin olduğu karelerde çalışır. Parametre ızgaraları
+(ör. angle_tolerance) süreç havuzunda paralel denenip antrenör etiketleriyle
+uyumu ölçülebilir.
+
+Örnek:
+    python replay.py ~/.spor_takip/sessions/20240101_120000 --movement Squat \\
+        --sweep angle_tolerance=10,15,20,25 --labels etiketler.npy
+"""
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engine import ExerciseEngine
+from angles import joint_angles
+from exercises import ANGLE_MODES, SIDES
+from rep_counter import DWELL_EPSILON
+from session_recorder import MOVEMENTS, STATUS_CODES, load_session, world_points
+
+_STATUS = {code: i for i, code in enumerate(STATUS_CODES)}
+
+# Izgarada denenebilecek parametreler: ad -> (motor tablosu, anahtar).
+# Tablo None ise motor niteliği, anahtar None ise seçili hareket kullanılır.
+PARAMETERS = {
+    "angle_tolerance": (None, None),
+    "rep_hysteresis": (None, None),
+    "rep_min_dwell": (None, None),
+    "target_angle": ("target_angles", None),
+    "rest_angle": ("rest_angles", None),
+    "min_torso_angle": ("min_angles", "torso"),
+}
+
+
+def configure(engine, **params):
+    """PARAMETERS içindeki değerleri motora uygular ve sayacı sıfırlar"""
+    for name, value in params.items():
+        table, key = PARAMETERS[name]
+        if table is None:
+            setattr(engine, name, value)
+        elif key is None:
+            getattr(engine, table)[engine.movement] = value
+        else:
+            getattr(engine, table)[engine.movement][key] = value
+    engine.reset()
+    return engine
+
+
+def score_frames(engine, angles, points=None):
+    """Hareketin derlenmiş kontrollerini (kare, eklem) açı dizisine uygular.
+
+    angles JOINT_NAMES sırasında, hesaplanamayan açılar NaN. Taraf otomatik
+    seçiliyorsa kayıttaki (kare, 33, 4) landmarklar da verilmelidir. (durum
+    indeksleri, doğru mu, sayımı süren açı) döndürür.
+    """
+    exercise = engine.exercise
+    status, values, _ = exercise.evaluate(angles, points)
+    correct = np.array([code.startswith("CORRECT") for code in STATUS_CODES])[status]
+    return status, correct, values[:, exercise.rep_check]
+
+
+def count_reps(angle, correct, timestamps, fsm):
+    """RepStateMachine ile aynı sonucu veren olay tabanlı tekrar sayımı.
+
+    Her kare için dört eşik karşılaştırması tek bir bölge kodunda toplanır.
+    Durum makinesi aynı kodlu bir dizinin sadece ilk iki karesinde durum
+    değiştirebildiğinden döngü yalnızca bu karelerde çalışır; dipte doğru
+    formda geçen süre kümülatif toplamdan okunur. Tekrarın sayıldığı kare
+    indekslerini döndürür.
+    """
+    valid = np.flatnonzero(~np.isnan(angle)) # NaN açılar durumu değiştirmez
+    if not len(valid):
+        return valid
+    depth = (fsm.rest_angle - angle[valid].astype(np.float64)) * fsm.sign
+    time = timestamps[valid]
+    AT_TOP, LEAVE_TOP, LEAVE_BOTTOM, AT_BOTTOM = 1, 2, 4, 8
+    zone = ((depth <= fsm.top_enter) * AT_TOP + (depth > fsm.top_exit) * LEAVE_TOP
+            + (depth < fsm.bottom_exit) * LEAVE_BOTTOM + (depth >= fsm.bottom_enter) * AT_BOTTOM)
+    held = np.zeros(len(valid))
+    held[1:] = np.diff(time) * correct[valid][1:]
+    np.cumsum(held, out=held)
+
+    # Kodun değiştiği kareler ve hemen sonrakiler
+    events = np.zeros(len(valid) + 1, dtype=bool)
+    events[0] = events[1] = True
+    events[1:-1] |= zone[1:] != zone[:-1]
+    events[2:] |= events[1:-1].copy()
+    events = np.flatnonzero(events[:-1])
+
+    TOP, MIDDLE, BOTTOM = 0, 1, 2 # İniş ve çıkış aynı geçişlere sahip
+    state, rep_valid, entered = TOP, False, 0
+    reps = []
+    for i in events.tolist():
+        z = zone[i]
+        if state == TOP:
+            if z & LEAVE_TOP:
+                state, rep_valid = MIDDLE, False
+        elif state == MIDDLE:
+            if z & AT_BOTTOM:
+                state, entered = BOTTOM, i
+            elif z & AT_TOP:
+                state = TOP
+                if rep_valid:
+                    reps.append(i)
+        elif z & LEAVE_BOTTOM:
+            state = MIDDLE
+            if held[i] - held[entered] >= fsm.min_dwell - DWELL_EPSILON:
+                rep_valid = True
+    # Sonu dipte biten ziyaretin süresi tekrar sayısını etkilemez (tepeye dönülmedi)
+    return valid[reps]
+
+
+def replay(frames, movement, side="auto", angle_mode=None, **params):
+    """Kaydedilmiş kareleri (FRAME_DTYPE) verilen parametrelerle puanlar.
+
+    Sadece bu hareketle kaydedilmiş kareler kullanılır; landmark yoksa
+    durum NO_POSE olur. angle_mode verilirse hareketin açı modu yerine
+    kullanılır; 3B modda dünya landmarkı kaydedilmemiş karelerde canlı
+    analizdeki gibi 2B açılar kullanılır.
+    """
+    engine = ExerciseEngine(movement, smoothing=False)
+    engine.side = side
+    if angle_mode:
+        engine.angle_modes[movement] = angle_mode
+    configure(engine, **params)
+    # Sadece gereken sütunlar okunur; kayıtların tamamı kopyalanmaz.
+    # Landmarklar sadece taraf otomatik seçiliyorsa okunur.
+    mask = frames["movement"] == MOVEMENTS.index(movement)
+    has_pose, angles, timestamps = (frames[name][mask] for name in ("has_pose", "angles", "timestamp"))
+    points = frames["points"][mask] if side == "auto" else None
+    if engine.world_angles:
+        rows = np.flatnonzero(mask)
+        has_world = has_pose & ~np.isnan(frames["world"][rows, 0, 0])
+        angles[has_world] = joint_angles(world_points(frames, rows[has_world]), dims=3)
+    angles[~has_pose] = np.nan
+    status, correct, drive = score_frames(engine, angles, points)
+    status[~has_pose] = _STATUS["NO_POSE"]
+    correct &= has_pose
+    reps = count_reps(drive, correct, timestamps, engine.rep_fsm)
+    return {
+        "params": params,
+        "frames": len(timestamps),
+        "mask": mask,
+        "status": status,
+        "correct": correct,
+        "rep_frames": reps,
+        "reps": len(reps),
+    }
+
+
+def agreement(result, labels):
+    """Kare bazlı doğru/yanlış tahminlerin etiketlerle uyum oranı.
+
+    labels ya kaydın tamamını (her kare için bir etiket) ya da sadece
+    puanlanan hareketin karelerini kapsar; ilkinde hareket maskesi uygulanır.
+    """
+    labels = np.asarray(labels, dtype=bool)
+    mask = result["mask"]
+    if len(labels) == len(mask) and len(labels) != result["frames"]:
+        labels = labels[mask]
+    elif len(labels) != result["frames"]:
+        raise ValueError(f"Etiket sayısı ({len(labels)}) ne kayıttaki kare sayısıyla ({len(mask)}) "
+                         f"ne de puanlanan kare sayısıyla ({result['frames']}) eşleşiyor")
+    return float(np.mean(result["correct"] == labels)) if len(labels) else 0.0
+
+
+_worker_frames = None
+_worker_labels = None
+
+
+def _init_worker(paths, labels):
+    global _worker_frames, _worker_labels
+    _worker_frames = np.concatenate([load_session(path)[1] for path in paths])
+    _worker_labels = labels
+
+
+def _replay_in_worker(movement, side, angle_mode, params):
+    result = replay(_worker_frames, movement, side, angle_mode, **params)
+    summary = {"params": params, "frames": result["frames"], "reps": result["reps"],
+               "correct_ratio": float(result["correct"].mean()) if result["frames"] else 0.0}
+    if _worker_labels is not None:
+        summary["agreement"] = agreement(result, _worker_labels)
+    return summary
+
+
+def sweep(paths, movement, grid, labels=None, workers=None, side="auto", angle_mode=None):
+    """Parametre ızgarasının tüm kombinasyonlarını paralel puanlar.
+
+    grid: PARAMETERS adı -> denenecek değerler listesi. Her işçi oturumları
+    bir kez yükler. labels verilirse sonuçlar uyuma göre sıralanır.
+    """
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(list(paths), labels)) as pool:
+        n = len(combos)
+        results = list(pool.map(_replay_in_worker, [movement] * n, [side] * n, [angle_mode] * n, combos))
+    if labels is not None:
+        results.sort(key=lambda r: r["agreement"], reverse=True)
+    return results
+
+
+def _parse_grid(items):
+    grid = {}
+    for item in items:
+        name, values = item.split("=", 1)
+        if name not in PARAMETERS:
+            raise argparse.ArgumentTypeError(f"Bilinmeyen parametre: {name}")
+        grid[name] = [float(v) for v in values.split(",")]
+    return grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kaydedilmiş oturumları yeniden puanlama")
+    parser.add_argument("sessions", nargs="+", help="Oturum klasörleri")
+    parser.add_argument("--movement", default="Squat", choices=ExerciseEngine.movement_types)
+    parser.add_argument("--side", default="auto", choices=SIDES,
+                        help="Değerlendirilen taraf (auto: iki taraf birlikte)")
+    parser.add_argument("--angles", choices=ANGLE_MODES, default=None,
+                        help="Açı modu (varsayılan: hareketin tanımındaki)")
+    parser.add_argument("--sweep", nargs="*", default=[], metavar="AD=D1,D2,...",
+                        help=f"Denenecek değerler ({', '.join(PARAMETERS)})")
+    parser.add_argument("--labels", help="Kare bazlı doğru/yanlış etiketleri (.npy)")
+    parser.add_argument("--workers", type=int, default=None, help="Paralel süreç sayısı")
+    args = parser.parse_args(argv)
+
+    labels = np.load(args.labels) if args.labels else None
+    if not args.sweep:
+        frames = np.concatenate([load_session(path)[1] for path in args.sessions])
+        result = replay(frames, args.movement, args.side, args.angles)
+        print(f"{result['frames']} kare, {result['reps']} tekrar, "
+              f"doğru kare oranı %{result['correct'].mean() * 100:.1f}")
+        if labels is not None:
+            print(f"Etiket uyumu: %{agreement(result, labels) * 100:.1f}")
+        return
+
+    for r in sweep(args.sessions, args.movement, _parse_grid(args.sweep), labels, args.workers, args.side,
+                   args.angles):
+        params = ", ".join(f"{k}={v:g}" for k, v in r["params"].items())
+        extra = f"  uyum %{r['agreement'] * 100:.1f}" if "agreement" in r else ""
+        print(f"{params:40s} {r['reps']:5d} tekrar  doğru %{r['correct_ratio'] * 100:.1f}{extra}")
+
+
+if __name__ == "__main__":
+    main()
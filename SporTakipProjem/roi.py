@@ -0,0 +1,119 @@
+"""Kişinin etrafındaki bölgeye (ROI) kırpılmış poz çıkarımı.
+
+Kişi bulunduktan sonra çıkarım tüm kare yerine önceki landmarkların
+genişletilmiş sınır kutusundan kesilip sabit boyuta küçültülmüş kare
+üzerinde yapılır. 720p/1080p girişte MediaPipe'a verilen piksel sayısı
+birkaç kat azalır. Sonuçlar tam kare koordinatlarına geri çevrilir.
+"""
+import cv2
+import numpy as np
+
+from angles import MIN_VISIBILITY, landmarks_to_array
+from frame_buffers import scale_frame
+
+
+class RoiTracker:
+    """Önceki karenin landmarklarından kırpma bölgesini takip eder.
+
+    padding: sınır kutusunun her yöne kendi boyunun bu oranı kadar
+    genişletilmesi. input_size: kırpılan bölgenin uzun kenarının
+    küçültüldüğü boyut (piksel); en-boy oranı korunur. Kişi mevcut bölgenin
+    iç kısmında kaldığı sürece bölge değişmez; böylece MediaPipe'ın kendi
+    takibi ve yumuşatması sabit bir görüntü üzerinde çalışır. input_scale
+    hem tam kare çıkarımını hem de kırpma boyutunu küçültür. Kırpılmış karede kişi bulunamazsa aynı kare
+    tam boyutta yeniden denenir.
+    """
+
+    def __init__(self, padding=0.25, input_size=384, min_visible=8, input_scale=1.0):
+        self.padding = padding
+        self.input_size = input_size
+        self.input_scale = input_scale
+        self.min_visible = min_visible # Bölge için gereken görünür landmark sayısı
+        self.roi = None                # (x0, y0, genişlik, yükseklik) piksel, None: tam kare
+        self._size = None              # Kırpılan bölgenin küçültüldüğü boyut
+        self._buf = None
+        self._full_buf = None          # Küçültülmüş tam kare
+        self.crops = 0      # Kırpılmış karede yapılan çıkarım
+        self.hits = 0       # Kırpılmış karede kişi bulundu
+        self.full_frames = 0
+        self.cropped = False # Son sonuç kırpılmış karede mi bulundu
+
+    def reset(self):
+        self.roi = None
+
+    def process(self, pose, frame):
+        """Çıkarımı yapar; (results, tam kare koordinatlı (33, 4) dizi ya da None) döndürür"""
+        roi = self.roi
+        if roi is not None:
+            self.crops += 1
+            x0, y0, cw, ch = roi
+            crop = frame[y0:y0 + ch, x0:x0 + cw]
+            if self._size != (cw, ch):
+                cv2.resize(crop, self._size, dst=self._buf, interpolation=cv2.INTER_AREA)
+            else:
+                self._buf[:] = crop # MediaPipe bitişik bellek ister
+            results = pose.process(self._buf)
+            if results.pose_landmarks:
+                self.hits += 1
+                self.cropped = True
+            else:
+                roi = None # Takip kayboldu, tam karede ara
+        if roi is None:
+            self.full_frames += 1
+            self.cropped = False
+            self._full_buf = scale_frame(frame, self.input_scale, self._full_buf)
+            results = pose.process(self._full_buf)
+
+        if not results.pose_landmarks:
+            self.roi = None
+            return results, None
+        points = landmarks_to_array(results.pose_landmarks)
+        h, w = frame.shape[:2]
+        if roi is not None:
+            x0, y0, cw, ch = roi
+            points[:, 0] = (x0 + points[:, 0] * cw) / w
+            points[:, 1] = (y0 + points[:, 1] * ch) / h
+            points[:, 2] *= cw / w # z, x ile aynı ölçektedir
+        self._update(points, w, h)
+        return results, points
+
+    def _update(self, points, w, h):
+        """Landmarklara göre bir sonraki karenin kırpma bölgesini seçer"""
+        visible = points[:, 3] >= MIN_VISIBILITY
+        if np.count_nonzero(visible) < self.min_visible:
+            self.roi = None
+            return
+        xs, ys = points[visible, 0] * w, points[visible, 1] * h
+        x_min, x_max, y_min, y_max = xs.min(), xs.max(), ys.min(), ys.max()
+
+        pad_x, pad_y = (x_max - x_min) * self.padding, (y_max - y_min) * self.padding
+
+        if self.roi is not None:
+            # Kişi, mevcut bölgenin dolgu payının yarısı kadar içeride kalıyorsa
+            # ve bölge kişiye göre çok büyümediyse bölge değiştirilmez
+            x0, y0, cw, ch = self.roi
+            if (x_min - pad_x / 2 >= x0 and x_max + pad_x / 2 <= x0 + cw
+                    and y_min - pad_y / 2 >= y0 and y_max + pad_y / 2 <= y0 + ch
+                    and (x_max - x_min + 4 * pad_x) * (y_max - y_min + 4 * pad_y) >= cw * ch):
+                return
+
+        x0, x1 = int(max(0, x_min - pad_x)), int(min(w, x_max + pad_x + 1))
+        y0, y1 = int(max(0, y_min - pad_y)), int(min(h, y_max + pad_y + 1))
+        cw, ch = x1 - x0, y1 - y0
+        if cw * ch >= 0.8 * w * h or cw < 16 or ch < 16:
+            self.roi = None # Kırpmanın faydası yok
+            return
+        self.roi = (x0, y0, cw, ch)
+        scale = min(1.0, self.input_size * self.input_scale / max(cw, ch))
+        size = (max(1, round(cw * scale)), max(1, round(ch * scale)))
+        if size != self._size:
+            self._size = size
+            self._buf = np.empty((size[1], size[0], 3), dtype=np.uint8)
+
+    def stats(self):
+        """Kırpma isabet oranını döndürür"""
+        return {
+            "crop_hit_rate": self.hits / self.crops if self.crops else 0.0,
+            "crops": self.crops,
+            "full_frames": self.full_frames,
+        }
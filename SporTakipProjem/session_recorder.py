@@ -0,0 +1,203 @@
+"""Analiz oturumlarının sütunlu ikili formatta kaydı.
+
+Her oturum bir klasördür: meta.json ve sırayla yazılan chunk_00000.npy,
+chunk_00001.npy ... dosyaları. Her parça FRAME_DTYPE tipinde yapılandırılmış
+bir NumPy dizisidir (kare başına 972 bayt) ve np.load(..., mmap_mode="r")
+ile belleğe eşlenerek okunabilir. Eski sürümlerin kaydettiği parçalar
+load_session ile okunurken güncel tipe çevrilir.
+"""
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from angles import JOINT_NAMES, NUM_LANDMARKS, joint_angles
+from exercises import MOVEMENTS, STATUS_CODES
+
+SESSIONS_DIR = os.path.join(os.path.expanduser("~"), ".spor_takip", "sessions")
+
+
+FRAME_DTYPE = np.dtype([
+    ("timestamp", "<f8"),                        # Oturum başından itibaren (sn)
+    ("points", "<f4", (NUM_LANDMARKS, 4)),       # Analizde kullanılan landmarklar
+    ("angles", "<f4", (len(JOINT_NAMES),)),      # JOINT_NAMES sırasıyla (NaN: yok)
+    ("movement", "u1"),                          # MOVEMENTS indeksi
+    ("status", "u1"),                            # STATUS_CODES indeksi
+    ("has_pose", "?"),
+    ("rep", "?"),                                # Bu karede tekrar sayıldı mı
+    ("count", "<u4"),
+    ("world", "<f4", (NUM_LANDMARKS, 3)),        # Dünya landmarkları x, y, z, metre (NaN: yok)
+])
+
+
+class SessionRecorder:
+    """Kare sonuçlarını arka plandaki yazıcı iş parçacığıyla diske akıtır.
+
+    record() sadece landmarkları kopyalayıp kuyruğa koyar; açı hesabı,
+    parçalama ve dosya yazımı yazıcı iş parçacığında yapılır. Kuyruk dolarsa
+    kare kaydedilmez ve dropped artar; kare döngüsü asla beklemez.
+
+    Oturum klasörü ilk parça yazılırken oluşturulur; hiç kare kaydedilmeyen
+    oturum diskte boş klasör bırakmaz. Aynı adlı klasör o arada oluşmuşsa
+    ada sayı eklenir, bu yüzden path close()'dan sonra kesinleşir.
+    """
+
+    def __init__(self, root=SESSIONS_DIR, name=None, chunk_frames=512, max_pending=1024):
+        self._created = datetime.now()
+        self._root = root
+        self._name = name or self._created.strftime("%Y%m%d_%H%M%S")
+        self.path = self._free_path()
+        self._path_created = False
+        self.chunk_frames = chunk_frames
+        self.frames = 0
+        self.dropped = 0
+        self._start = None
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._chunk = np.zeros(chunk_frames, dtype=FRAME_DTYPE)
+        self._fill = 0
+        self._chunk_index = 0
+        self._thread = threading.Thread(target=self._run, name="session-writer", daemon=True)
+        self._thread.start()
+
+    def _free_path(self):
+        path = os.path.join(self._root, self._name)
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(self._root, f"{self._name}_{suffix}")
+        return path
+
+    def _create_path(self):
+        """Oturum klasörünü ve meta.json'u ilk parçadan önce oluşturur"""
+        while True:
+            try:
+                os.makedirs(self.path)
+                break
+            except FileExistsError: # Başka bir kayıt aynı adı aldı
+                self.path = self._free_path()
+        self._write_meta()
+        self._path_created = True
+
+    def _write_meta(self):
+        meta = {
+            "created": self._created.isoformat(timespec="seconds"),
+            "dtype": FRAME_DTYPE.descr,
+            "joints": list(JOINT_NAMES),
+            "status_codes": STATUS_CODES,
+            "movements": MOVEMENTS,
+            "chunk_frames": self.chunk_frames,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    def record(self, analysis, points, world=None):
+        """Bir karenin analiz sonucunu (ve varsa dünya landmarklarını) kaydedilmek üzere kuyruğa koyar"""
+        if self._start is None:
+            self._start = analysis.timestamp
+        item = (
+            analysis.timestamp - self._start,
+            None if points is None else points.copy(),
+            analysis.movement,
+            analysis.status,
+            analysis.rep_event is not None,
+            analysis.count,
+            None if world is None else world.copy(),
+        )
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Kuyruktaki kareleri yazar ve son (yarım) parçayı diske aktarır"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._append(*item)
+        self._flush()
+
+    def _append(self, timestamp, points, movement, status, rep, count, world):
+        row = self._chunk[self._fill]
+        row["timestamp"] = timestamp
+        row["movement"] = MOVEMENTS.index(movement)
+        row["status"] = STATUS_CODES.index(status)
+        row["rep"] = rep
+        row["count"] = count
+        row["has_pose"] = points is not None
+        if points is None:
+            row["points"] = np.nan
+            row["angles"] = np.nan
+        else:
+            row["points"] = points
+            row["angles"] = joint_angles(points)
+        row["world"] = np.nan if world is None else world[:, :3]
+        self._fill += 1
+        self.frames += 1
+        if self._fill == self.chunk_frames:
+            self._flush()
+
+    def _flush(self):
+        if not self._fill:
+            return
+        if not self._path_created:
+            self._create_path()
+        path = os.path.join(self.path, f"chunk_{self._chunk_index:05d}.npy")
+        # Yarım yazılmış parça okunmasın diye önce geçici dosyaya yazılır
+        with open(path + ".tmp", "wb") as f:
+            np.save(f, self._chunk[:self._fill])
+        os.replace(path + ".tmp", path)
+        self._chunk_index += 1
+        self._fill = 0
+
+
+def open_session(path):
+    """Oturumun parçalarını belleğe eşlenmiş diziler olarak döndürür"""
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    chunks = sorted(name for name in os.listdir(path) if name.startswith("chunk_") and name.endswith(".npy"))
+    return meta, [np.load(os.path.join(path, name), mmap_mode="r") for name in chunks]
+
+
+def _upgrade_chunk(chunk):
+    """Eski tipte kaydedilmiş parçayı FRAME_DTYPE'a çevirir.
+
+    Eksik sütunlar NaN (ondalıklı) ya da sıfırla doldurulur; fazla sütunlar
+    (ör. eski (33, 4) dünya landmarklarının görünürlüğü) atılır.
+    """
+    if chunk.dtype == FRAME_DTYPE:
+        return chunk
+    upgraded = np.zeros(len(chunk), dtype=FRAME_DTYPE)
+    for name in FRAME_DTYPE.names:
+        if name not in chunk.dtype.names:
+            if FRAME_DTYPE[name].base.kind == "f":
+                upgraded[name] = np.nan
+            continue
+        column = chunk[name]
+        if column.shape[1:] != FRAME_DTYPE[name].shape:
+            column = column[..., :FRAME_DTYPE[name].shape[-1]]
+        upgraded[name] = column
+    return upgraded
+
+
+def load_session(path):
+    """Oturumun tüm karelerini tek bir FRAME_DTYPE dizisi olarak döndürür"""
+    meta, chunks = open_session(path)
+    if not chunks:
+        return meta, np.zeros(0, dtype=FRAME_DTYPE)
+    return meta, np.concatenate([_upgrade_chunk(chunk) for chunk in chunks])
+
+
+def world_points(frames, rows):
+    """Seçilen karelerin dünya landmarklarını (kare, 33, 4) dizi olarak döndürür.
+
+    Görünürlük kaydedilmediği için aynı karenin landmarklarından alınır.
+    """
+    return np.concatenate((frames["world"][rows], frames["points"][rows][..., 3:]), axis=-1)
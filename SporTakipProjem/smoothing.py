@@ -0,0 +1,85 @@
+"""Landmarkların zamansal yumuşatılması (One-Euro filtresi).
+
+33 landmarkın x, y, z koordinatları tek vektörel adımda süzülür. Filtre
+yavaş harekette titreşimi güçlü bastırır, hızlı harekette kesim frekansını
+yükselterek gecikmeyi düşük tutar.
+"""
+import math
+
+import numpy as np
+
+from angles import NUM_LANDMARKS
+
+
+class OneEuroFilter:
+    """(33, 4) landmark dizileri için vektörel One-Euro filtresi.
+
+    min_cutoff: durağan landmarklar için kesim frekansı (Hz); küçüldükçe
+    titreşim azalır, gecikme artar. beta: hızla birlikte kesim frekansının
+    ne kadar arttığı. d_cutoff: hız tahmini için kesim frekansı.
+    Görünürlük sütunu süzülmeden aktarılır. Tüm durum önceden ayrılmış
+    dizilerde tutulur; kare başına bellek ayrılmaz.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=50.0, d_cutoff=1.0, num_landmarks=NUM_LANDMARKS):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        shape = (num_landmarks, 3)
+        self.value = np.zeros((num_landmarks, 4), dtype=np.float32) # Süzülmüş landmarklar
+        self.velocity = np.zeros(shape, dtype=np.float32)           # Süzülmüş hız (birim/sn)
+        self._delta = np.empty(shape, dtype=np.float32)
+        self._speed = np.empty((num_landmarks, 1), dtype=np.float32)
+        self._alpha = np.empty((num_landmarks, 1), dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        """Geçmişi unutur; sonraki ölçüm olduğu gibi kabul edilir"""
+        self._time = None
+        self.velocity[:] = 0.0
+
+    @staticmethod
+    def _alpha_for(cutoff, dt):
+        return 1.0 / (1.0 + 1.0 / (2.0 * math.pi * cutoff * dt))
+
+    def filter(self, points, timestamp):
+        """Yeni ölçümü süzer; self.value dizisini döndürür.
+
+        points None ise (kişi kayboldu) filtre sıfırlanır ve None döner.
+        """
+        if points is None:
+            self.reset()
+            return None
+        if self._time is None or timestamp <= self._time:
+            self.value[:] = points
+            self._time = timestamp
+            return self.value
+
+        dt = timestamp - self._time
+        self._time = timestamp
+        xyz = self.value[:, :3]
+
+        # Hız tahmini: ham türev, sabit kesim frekansıyla süzülür
+        np.subtract(points[:, :3], xyz, out=self._delta)
+        self._delta *= 1.0 / dt
+        self._delta -= self.velocity
+        self._delta *= self._alpha_for(self.d_cutoff, dt)
+        self.velocity += self._delta
+
+        # Kesim frekansı landmark hızıyla artar: min_cutoff + beta * |v|
+        np.square(self.velocity, out=self._delta)
+        np.sum(self._delta, axis=1, keepdims=True, out=self._speed)
+        np.sqrt(self._speed, out=self._speed)
+        self._speed *= self.beta
+        self._speed += self.min_cutoff
+        # alpha = 1 / (1 + 1 / (2π · cutoff · dt))
+        np.multiply(self._speed, 2.0 * math.pi * dt, out=self._alpha)
+        np.reciprocal(self._alpha, out=self._alpha)
+        self._alpha += 1.0
+        np.reciprocal(self._alpha, out=self._alpha)
+
+        np.subtract(points[:, :3], xyz, out=self._delta)
+        self._delta *= self._alpha
+        xyz += self._delta
+        self.value[:, 3] = points[:, 3]
+        return self.value
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Modüller paket değil, SporTakipProjem klasöründe düz dosyalar
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import synthetic_pose
+
+
+@pytest.fixture(scope="session")
+def pose_sequence():
+    """Gürültülü yapay hareket: (kare, 33, 4) landmarklar ve zaman damgaları.
+
+    Bazı karelerde sol ya da sağ eklemler görünmez; taraf seçimi ve
+    hesaplanamayan açılar da sınanır.
+    """
+    rng = np.random.default_rng(1)
+    points = np.stack([synthetic_pose(i) for i in range(1200)])
+    points[..., :3] += rng.normal(0, 0.03, points[..., :3].shape).astype(np.float32)
+    points[::97, 25, 3] = 0.1 # Sol diz
+    points[::131, 14, 3] = 0.1 # Sağ dirsek
+    points[300:420, [11, 13, 15, 23, 25, 27], 3] = 0.3 # Kişi sol tarafını çeviriyor
+    return points, np.arange(len(points)) / 30.0
+
+
+@pytest.fixture(scope="session")
+def random_points():
+    """Her açının her sınırın iki yanına düştüğü rastgele landmarklar"""
+    rng = np.random.default_rng(2)
+    points = rng.random((3000, 33, 4)).astype(np.float32)
+    points[..., 3] = rng.uniform(0.3, 1.0, points.shape[:2])
+    return points
@@ -0,0 +1,73 @@
+"""Uyarlamalı çıkarım aralığı ve aradaki karelerde landmark tahmini"""
+import numpy as np
+import pytest
+
+from adaptive import AdaptiveInference
+
+
+def linear_pose(t):
+    """x ve y'si zamanla doğrusal değişen (33, 4) landmarklar"""
+    points = np.zeros((33, 4), dtype=np.float32)
+    points[:, 0] = 0.3 + 0.2 * t
+    points[:, 1] = 0.6 - 0.1 * t
+    points[:, 2] = np.linspace(-0.1, 0.1, 33)
+    points[:, 3] = 0.9
+    return points
+
+
+@pytest.mark.parametrize("latency_ms, interval", [(5.0, 1), (20.0, 1), (45.0, 3), (500.0, 4)])
+def test_interval_follows_latency(latency_ms, interval):
+    adaptive = AdaptiveInference(budget_ms=20.0, max_interval=4)
+    adaptive.update(linear_pose(0.0), 0.0, latency_ms)
+    assert adaptive.interval == interval
+
+
+def test_latency_is_averaged():
+    adaptive = AdaptiveInference(budget_ms=20.0, smoothing=0.5)
+    adaptive.update(None, 0.0, 10.0)
+    adaptive.update(None, 0.1, 70.0) # Tek yavaş kare: ortalama 40 ms
+    assert adaptive.latency_ms == pytest.approx(40.0)
+    assert adaptive.interval == 2
+
+
+def test_schedule_and_linear_extrapolation():
+    adaptive = AdaptiveInference(budget_ms=20.0, max_interval=4)
+    dt = 1 / 30
+    out = np.empty((33, 4), dtype=np.float32)
+    schedule = []
+    for i in range(12):
+        t = i * dt
+        if adaptive.should_infer():
+            adaptive.update(linear_pose(t), t, 50.0) # Her 3 karede bir çıkarım
+            schedule.append("I")
+            continue
+        schedule.append("E")
+        predicted = adaptive.extrapolate(t, out)
+        assert predicted is out
+        if adaptive.inferred >= 2: # İki çıkarımdan sonra hız bilinir
+            np.testing.assert_allclose(predicted[:, :3], linear_pose(t)[:, :3], atol=1e-5)
+        np.testing.assert_array_equal(predicted[:, 3], np.float32(0.9)) # Görünürlük tahmin edilmez
+    assert "".join(schedule) == "IEEIEEIEEIEE"
+    assert adaptive.stats()["interpolated_ratio"] == pytest.approx(8 / 12)
+
+
+def test_extrapolation_without_velocity_holds_last_pose():
+    adaptive = AdaptiveInference()
+    assert adaptive.extrapolate(0.0) is None
+    adaptive.update(linear_pose(0.0), 0.0, 10.0)
+    np.testing.assert_array_equal(adaptive.extrapolate(0.5), linear_pose(0.0))
+    # Kişi kaybolunca eski hızla tahmin yapılmaz
+    adaptive.update(linear_pose(0.1), 0.1, 10.0)
+    adaptive.update(None, 0.2, 10.0)
+    assert adaptive.extrapolate(0.3) is None
+    assert adaptive.should_infer()
+
+
+def test_filter_velocity_is_used():
+    adaptive = AdaptiveInference()
+    velocity = np.zeros((33, 3), dtype=np.float32)
+    velocity[:, 0] = 1.5
+    adaptive.update(linear_pose(0.0), 0.0, 10.0, velocity=velocity)
+    predicted = adaptive.extrapolate(0.1)
+    np.testing.assert_allclose(predicted[:, 0], linear_pose(0.0)[:, 0] + 0.15, atol=1e-6)
+    np.testing.assert_array_equal(predicted[:, 1:], linear_pose(0.0)[:, 1:])
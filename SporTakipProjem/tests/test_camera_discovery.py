@@ -0,0 +1,93 @@
+"""Paralel, zaman aşımlı kamera bulma ve çalışan kameranın önbelleği"""
+import json
+import threading
+import time
+
+import pytest
+
+import camera_discovery
+from camera_discovery import DEFAULT_SETTINGS, discover_camera, load_cache, save_cache
+
+
+class FakeSource:
+    def __init__(self, index):
+        self.index = index
+        self.released = threading.Event()
+
+    def release(self):
+        self.released.set()
+
+
+@pytest.fixture
+def cameras(monkeypatch):
+    """probe_camera yerine geçen sahte kameralar: indeks -> açılış süresi (sn)"""
+    state = {"working": {}, "probes": [], "sources": {}}
+
+    def probe(index, settings):
+        state["probes"].append((index, settings))
+        if index not in state["working"]:
+            return None
+        time.sleep(state["working"][index])
+        source = state["sources"][index] = FakeSource(index)
+        return source, {"index": index, "settings": dict(settings)}
+
+    monkeypatch.setattr(camera_discovery, "probe_camera", probe)
+    return state
+
+
+def test_cache_round_trip(tmp_path):
+    path = str(tmp_path / "ayar" / "camera.json")
+    assert load_cache(path) is None
+    save_cache({"index": 2, "settings": {"width": 1280}, "open_ms": 5.0}, path)
+    assert load_cache(path) == {"index": 2, "settings": {"width": 1280}}
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{bozuk")
+    assert load_cache(path) is None
+
+
+def test_cached_camera_tried_alone_first(tmp_path, cameras):
+    path = str(tmp_path / "camera.json")
+    save_cache({"index": 3, "settings": {"fourcc": "YUYV"}}, path)
+    cameras["working"] = {0: 0.0, 3: 0.0}
+    source, info = discover_camera(cache_path=path)
+    assert info["index"] == 3
+    assert cameras["probes"] == [(3, {**DEFAULT_SETTINGS, "fourcc": "YUYV"})]
+
+
+def test_falls_back_to_first_working_index_and_updates_cache(tmp_path, cameras):
+    path = str(tmp_path / "camera.json")
+    save_cache({"index": 4, "settings": {}}, path)
+    cameras["working"] = {1: 0.05, 2: 0.0}
+    source, info = discover_camera(cache_path=path)
+    # 2 önce açılsa da sırada önde olan 1 seçilir, 2 kapatılır
+    assert info["index"] == 1
+    assert cameras["sources"][2].released.is_set()
+    assert not source.released.is_set()
+    assert load_cache(path)["index"] == 1
+
+
+def test_hung_camera_is_not_waited_for(tmp_path, cameras):
+    path = str(tmp_path / "camera.json")
+    cameras["working"] = {0: 0.5, 1: 0.0}
+    start = time.perf_counter()
+    source, info = discover_camera(indices=range(3), timeout=0.1, cache_path=path)
+    assert time.perf_counter() - start < 0.4
+    assert info["index"] == 1
+    # Zaman aşımından sonra açılan kamera arka planda kapatılır
+    time.sleep(0.6)
+    assert cameras["sources"][0].released.wait(1.0)
+
+
+def test_hung_cached_camera_not_opened_twice(tmp_path, cameras):
+    path = str(tmp_path / "camera.json")
+    save_cache({"index": 0, "settings": {}}, path)
+    cameras["working"] = {0: 0.5, 1: 0.0}
+    source, info = discover_camera(indices=range(2), timeout=0.1, cache_path=path)
+    assert info["index"] == 1
+    assert [index for index, _ in cameras["probes"]] == [0, 1]
+
+
+def test_no_camera_raises(tmp_path, cameras):
+    with pytest.raises(RuntimeError):
+        discover_camera(indices=range(3), timeout=0.1, cache_path=str(tmp_path / "camera.json"))
+    assert not (tmp_path / "camera.json").exists()
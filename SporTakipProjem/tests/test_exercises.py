@@ -0,0 +1,182 @@
+"""Derlenmiş hareket tanımları: toplu ve tek kare değerlendirme ile eski analyze_* davranışı"""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+import exercises
+from angles import JOINT_NAMES, PoseLandmark, joint_angles
+from engine import ExerciseEngine
+from exercises import EXERCISES, MOVEMENTS, SIDES, STATUS_CODES, STATUS_MESSAGES, CompiledExercise
+
+
+def compile_exercise(movement, side="auto", tolerance=20):
+    engine = ExerciseEngine(movement, smoothing=False)
+    return CompiledExercise(EXERCISES[movement], engine.target_angles[movement], tolerance,
+                            engine.min_angles[movement], side)
+
+
+@pytest.mark.parametrize("side", SIDES)
+@pytest.mark.parametrize("movement", MOVEMENTS)
+def test_evaluate_matches_evaluate_frame(random_points, pose_sequence, movement, side):
+    exercise = compile_exercise(movement, side)
+    for points in (random_points, pose_sequence[0]):
+        angles = joint_angles(points)
+        status, values, ok = exercise.evaluate(angles, points)
+        _, right = exercise.check_angles(angles, points)
+        for i in range(len(points)):
+            frame_status, frame_values, frame_ok, frame_side = exercise.evaluate_frame(angles[i], points[i])
+            assert frame_status == status[i]
+            np.testing.assert_allclose(frame_values, values[i], rtol=1e-12)
+            assert frame_ok == ok[i].tolist()
+            assert frame_side == ("right" if right[i] else "left")
+
+
+def test_evaluate_frame_without_points():
+    # Landmark verilmezse iki taraf eşit ağırlıkla birleştirilir
+    exercise = compile_exercise("Push-up")
+    angles = np.full(len(JOINT_NAMES), np.nan, dtype=np.float32)
+    angles[exercise.joints[0, 0]] = 80.0
+    angles[exercise.joints[1, 0]] = 100.0
+    status, values, ok, side = exercise.evaluate_frame(angles)
+    assert (STATUS_CODES[status], values, ok) == ("CORRECT", [90.0], [True])
+    angles[exercise.joints[1, 0]] = np.nan
+    assert exercise.evaluate_frame(angles)[1] == [80.0]
+
+
+
+def test_fusion_weights_with_mismatched_visibility(pose_sequence):
+    # 3B modda açılar dünya landmarklarından hesaplanır; 2B görünürlük
+    # eşiğin altında kalsa da ağırlık negatif olmamalı
+    exercise = compile_exercise("Push-up")
+    world = pose_sequence[0][:50].copy()
+    world[..., 3] = 0.9
+    points = world.copy()
+    points[:, [11, 13, 15], 3] = 0.2 # Sol kol 2B'de görünmüyor
+    angles = joint_angles(world, dims=3)
+    left, right = (angles[:, exercise.joints[side, 0]].astype(np.float64) for side in (0, 1))
+
+    values, is_right = exercise.check_angles(angles, points)
+    np.testing.assert_allclose(values[:, 0], right)
+    assert is_right.all()
+    # Görünürlük açılarla aynı landmarklardan alınınca iki taraf eşit ağırlıklı
+    values, is_right = exercise.check_angles(angles, points, world[..., 3])
+    np.testing.assert_allclose(values[:, 0], (left + right) / 2)
+    points[:, [12, 14, 16], 3] = 0.2 # İki taraf da görünmüyor: toplam ağırlık sıfır
+    assert np.isnan(exercise.check_angles(angles, points)[0]).all()
+
+    for visibility in (None, world[..., 3]):
+        status, values, ok = exercise.evaluate(angles, points, visibility)
+        for i in range(len(points)):
+            frame = exercise.evaluate_frame(angles[i], points[i], None if visibility is None else visibility[i])
+            assert frame[0] == status[i]
+            np.testing.assert_allclose(frame[1], values[i], rtol=1e-12)
+
+
+def baseline_angle(points, a, b, c):
+    """Eski calculate_angle: arccos ile, görünmeyen noktada None"""
+    if not all(points[i, 3] > 0.5 for i in (a, b, c)):
+        return None
+    ba = points[a, :2].astype(np.float64) - points[b, :2]
+    bc = points[c, :2].astype(np.float64) - points[b, :2]
+    cosine = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
+    return float(np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0))))
+
+
+def baseline_status(movement, points, target, tolerance=20, min_torso=70):
+    """Eski analyze_* metotlarının sol taraf için verdiği mesaj ve ölçülen açılar"""
+    L = PoseLandmark
+    if movement == "Squat":
+        leg = baseline_angle(points, L.LEFT_HIP, L.LEFT_KNEE, L.LEFT_ANKLE)
+        torso = baseline_angle(points, L.LEFT_SHOULDER, L.LEFT_HIP, L.LEFT_KNEE)
+        if leg is None or torso is None:
+            return "Pozisyon Belirsiz", ()
+        leg_ok = target - tolerance <= leg <= target + tolerance
+        torso_ok = torso >= min_torso
+        message = {(True, True): "DOĞRU", (False, True): "BACAK YANLIŞ",
+                   (True, False): "GÖVDE YANLIŞ", (False, False): "BACAK & GÖVDE YANLIŞ"}[leg_ok, torso_ok]
+        return message, ((leg, target - tolerance), (leg, target + tolerance), (torso, min_torso))
+    if movement == "Lunge":
+        front = baseline_angle(points, L.LEFT_HIP, L.LEFT_KNEE, L.LEFT_ANKLE)
+        back = baseline_angle(points, L.RIGHT_HIP, L.RIGHT_KNEE, L.RIGHT_ANKLE)
+        if front is None or back is None:
+            return "Pozisyon Belirsiz", ()
+        wrong = [name for name, angle in (("ÖN DİZ", front), ("ARKA DİZ", back))
+                 if not target - tolerance <= angle <= target + tolerance]
+        message = f"{' & '.join(wrong)} YANLIŞ" if wrong else "DOĞRU"
+        return message, tuple((angle, target + d) for angle in (front, back) for d in (-tolerance, tolerance))
+    angle = baseline_angle(points, L.LEFT_SHOULDER, L.LEFT_ELBOW, L.LEFT_WRIST)
+    if angle is None:
+        return "Pozisyon Belirsiz", ()
+    if movement == "Push-up":
+        ok = target - tolerance <= angle <= target + tolerance
+        return ("DOĞRU" if ok else "AÇI YANLIŞ"), ((angle, target - tolerance), (angle, target + tolerance))
+    if movement == "Bicep Curl":
+        return ("DOĞRU (TEPE)" if angle <= target + tolerance else "AÇI YANLIŞ"), ((angle, target + tolerance),)
+    return ("DOĞRU (TEPE)" if angle >= target - tolerance else "AÇI YANLIŞ"), ((angle, target - tolerance),)
+
+
+@pytest.mark.parametrize("movement", MOVEMENTS)
+def test_left_side_matches_baseline_analysis(random_points, movement):
+    exercise = compile_exercise(movement, "left")
+    target = EXERCISES[movement].target_angle
+    angles = joint_angles(random_points)
+    batch_status = exercise.evaluate(angles, random_points)[0]
+    seen = set()
+    for i, points in enumerate(random_points):
+        message, compared = baseline_status(movement, points, target)
+        # Sınıra çok yakın açılarda float32 ve float64 hesap farklı tarafa düşebilir
+        if any(abs(angle - bound) < 1e-3 for angle, bound in compared):
+            continue
+        status = exercise.evaluate_frame(angles[i], points)[0]
+        assert STATUS_MESSAGES[STATUS_CODES[status]] == message
+        assert batch_status[i] == status
+        seen.add(message)
+    assert set(STATUS_MESSAGES[code] for code in EXERCISES[movement].statuses) <= seen
+    assert "Pozisyon Belirsiz" in seen
+
+
+@pytest.fixture
+def registry():
+    """register() testlerinin değiştirdiği tabloları test sonunda geri yükler"""
+    tables = (exercises.STATUS_MESSAGES, exercises.STATUS_CODES, exercises.MOVEMENTS,
+              exercises.EXERCISES, exercises.ANGLE_LABELS)
+    saved = [table.copy() for table in tables]
+    yield
+    for table, copy in zip(tables, saved):
+        if isinstance(table, list):
+            table[:] = copy
+        else:
+            table.clear()
+            table.update(copy)
+
+
+def snapshot():
+    return (dict(exercises.STATUS_MESSAGES), list(exercises.STATUS_CODES), list(exercises.MOVEMENTS),
+            dict(exercises.EXERCISES), dict(exercises.ANGLE_LABELS))
+
+
+@pytest.mark.parametrize("changes", [
+    {"statuses": ("NEW_CODE", "NEW_CODE", "NEW_CODE", "UNKNOWN_CODE")},
+    {"rep_angle": "knee"},
+    {"statuses": ("NEW_CODE",) * 3},
+    {"pairing": "mean"},
+    {"angle_mode": "4d"},
+    {"checks": (exercises.AngleCheck("leg", "ankle"), exercises.AngleCheck("torso", "hip"))},
+])
+def test_rejected_exercise_leaves_tables_unchanged(registry, changes):
+    before = snapshot()
+    exercise = replace(EXERCISES["Squat"], name="Deneme", messages={"NEW_CODE": "YENİ"}, **changes)
+    with pytest.raises(ValueError):
+        exercises.register(exercise)
+    assert snapshot() == before
+
+
+def test_register_accepts_own_status_codes(registry):
+    exercise = replace(EXERCISES["Push-up"], name="Deneme", messages={"NEW_CODE": "YENİ"},
+                       statuses=("CORRECT", "NEW_CODE"))
+    exercises.register(exercise)
+    assert exercises.STATUS_CODES[-1] == "NEW_CODE"
+    assert "Deneme" in exercises.MOVEMENTS
+    engine = ExerciseEngine("Deneme", smoothing=False)
+    assert engine.exercise.status_table.max() < len(exercises.STATUS_CODES)
@@ -0,0 +1,93 @@
+"""Aşama gecikme yüzdelikleri ve JSON/Prometheus dışa aktarımı"""
+import json
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from metrics import LatencyHistogram, StageMetrics, serve
+
+
+def test_percentiles_over_sliding_window():
+    histogram = LatencyHistogram(window=100)
+    assert histogram.summary() == {"count": 0}
+    values = np.random.default_rng(4).exponential(0.01, 250)
+    for value in values:
+        histogram.record(value)
+    summary = histogram.summary()
+    # Yüzdelikler son 100 ölçümden, sayı ve toplam tüm ölçümlerden
+    window = values[-100:] * 1000.0
+    assert summary["count"] == 250
+    assert histogram.total == pytest.approx(values.sum())
+    assert summary["mean_ms"] == pytest.approx(window.mean())
+    for key, q in (("p50_ms", 50), ("p95_ms", 95), ("p99_ms", 99)):
+        assert summary[key] == pytest.approx(np.percentile(window, q))
+
+
+def parse_prometheus(text):
+    samples, types = {}, {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE"):
+            _, _, name, kind = line.split()
+            types[name] = kind
+        elif line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return types, samples
+
+
+def test_prometheus_summary_format():
+    metrics = StageMetrics(window=10)
+    for ms in range(1, 21):
+        metrics.record("pose", ms / 1000.0)
+    metrics.record("render", 0.002)
+    text = metrics.to_prometheus(prefix="test")
+    assert text.endswith("\n")
+    types, samples = parse_prometheus(text)
+    assert types == {"test_stage_latency_seconds": "summary"}
+    name = "test_stage_latency_seconds"
+    assert samples[f'{name}{{stage="pose",quantile="0.5"}}'] == pytest.approx(0.0155)
+    assert samples[f'{name}{{stage="pose",quantile="0.99"}}'] == pytest.approx(0.01991, abs=1e-6)
+    assert samples[f'{name}_count{{stage="pose"}}'] == 20
+    assert samples[f'{name}_sum{{stage="pose"}}'] == pytest.approx(0.21)
+    assert samples[f'{name}_count{{stage="render"}}'] == 1
+    # JSON aynı özeti verir
+    summary = json.loads(metrics.to_json())
+    assert summary["pose"]["p50_ms"] == pytest.approx(15.5)
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = StageMetrics(enabled=False)
+    metrics.record("pose", 0.01)
+    with metrics.measure("render"):
+        pass
+    assert metrics.summary() == {}
+    assert metrics.format_overlay() == ""
+
+
+def test_measure_and_overlay():
+    metrics = StageMetrics()
+    with metrics.measure("analysis"):
+        sum(range(1000))
+    assert metrics.stages["analysis"].count == 1
+    assert metrics.format_overlay().startswith("analysis")
+
+
+def test_http_endpoints():
+    metrics = StageMetrics()
+    metrics.record("pose", 0.01)
+    server = serve(metrics, port=0, host="127.0.0.1")
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{base}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert response.read().decode("utf-8") == metrics.to_prometheus()
+        with urllib.request.urlopen(f"{base}/metrics.json", timeout=5) as response:
+            assert json.load(response)["pose"]["count"] == 1
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/yok", timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
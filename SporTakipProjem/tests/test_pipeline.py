@@ -0,0 +1,168 @@
+"""Yakalama/çıkarım iş parçacıkları ve en yeni kare kuyruğu"""
+import threading
+import time
+
+import numpy as np
+
+from pipeline import FramePipeline, LatestFrameQueue
+
+
+class CountingSource:
+    """n_frames kare üreten, okuma ve kapatma çağrılarını sayan kaynak"""
+
+    mirror = False
+
+    def __init__(self, n_frames, delay=0.0):
+        self.n_frames = n_frames
+        self.delay = delay
+        self.reads = 0
+        self.released = 0
+
+    def read(self, image=None):
+        if self.reads >= self.n_frames:
+            return False, None
+        time.sleep(self.delay)
+        self.reads += 1
+        frame = np.full((8, 8, 3), self.reads % 256, dtype=np.uint8)
+        return True, frame
+
+    def release(self):
+        self.released += 1
+
+
+class BlockingSource(CountingSource):
+    """İlk okumada gate açılana kadar bekleyen kaynak (takılan kamera)"""
+
+    def __init__(self):
+        super().__init__(0)
+        self.gate = threading.Event()
+        self.reading = threading.Event()
+        self.released_while_reading = False
+
+    def read(self, image=None):
+        self.reading.set()
+        self.gate.wait(5.0)
+        self.reading.clear()
+        return False, None
+
+    def release(self):
+        self.released_while_reading |= self.reading.is_set()
+        super().release()
+
+
+def drain(pipeline, timeout=5.0):
+    """Yakalama bitene ve kuyruk boşalana kadar sonuçları toplar"""
+    items = []
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        item = pipeline.poll()
+        if item is not None:
+            items.append(item)
+            pipeline.release(item[2])
+        elif pipeline.ended and not pipeline.inference.is_alive():
+            item = pipeline.poll()
+            if item is None:
+                break
+            items.append(item)
+            pipeline.release(item[2])
+        else:
+            time.sleep(0.001)
+    return items
+
+
+def test_latest_frame_queue_drops_oldest():
+    dropped = []
+    frames = LatestFrameQueue(maxsize=2, on_drop=dropped.append)
+    for i in range(5):
+        frames.put(i)
+    assert frames.dropped == 3
+    assert dropped == [0, 1, 2]
+    assert frames.pending
+    assert [frames.get_nowait(), frames.get(timeout=0.01)] == [3, 4]
+    assert not frames.pending
+    assert frames.get_nowait() is None
+    assert frames.get(timeout=0.01) is None
+
+
+def test_latest_frame_queue_wakes_consumer():
+    frames = LatestFrameQueue()
+    threading.Timer(0.02, frames.put, args=("kare",)).start()
+    assert frames.get(timeout=2.0) == "kare"
+    # Kapanan kuyrukta bekleyen tüketici zaman aşımını beklemeden uyanır
+    threading.Timer(0.02, frames.close).start()
+    start = time.perf_counter()
+    assert frames.get(timeout=2.0) is None
+    assert time.perf_counter() - start < 1.0
+    assert frames.closed
+
+
+def test_every_frame_buffer_is_accounted_for():
+    def process(frame, timestamp):
+        time.sleep(0.005) # Çıkarım yakalamadan yavaş: kareler düşer
+        return int(frame[0, 0, 0])
+
+    source = CountingSource(200)
+    pipeline = FramePipeline(source, process)
+    pipeline.start()
+    items = drain(pipeline)
+    pipeline.stop()
+    stats = pipeline.stats()
+    processed = pipeline.inference_stats.frames
+    assert stats["inference_dropped"] > 0
+    assert source.reads == processed + stats["inference_dropped"]
+    assert len(items) + stats["render_dropped"] == processed
+    # En yeni kare kazanır: sonuçlar sırayla gelir ve son kare kaybolmaz
+    frame_ids = [item[0] for item in items]
+    assert frame_ids == sorted(frame_ids)
+    assert frame_ids[-1] == source.reads - 1
+    # Düşen ve gösterilen tüm tamponlar havuza döner
+    pool = pipeline.capture.pool
+    assert len(pool._free) == pool.allocated < 10
+
+
+def test_inference_errors_do_not_stop_the_worker(caplog):
+    calls = []
+
+    def process(frame, timestamp):
+        calls.append(timestamp)
+        if len(calls) % 3 == 0:
+            raise RuntimeError("poz modeli hata verdi")
+        return len(calls)
+
+    pipeline = FramePipeline(CountingSource(30, delay=0.002), process)
+    pipeline.start()
+    drain(pipeline)
+    pipeline.stop()
+    # İlk hatadan sonra da kareler işlenmeye devam eder
+    assert len(calls) > 3
+    assert pipeline.stats()["inference_errors"] == len(calls) // 3
+    assert isinstance(pipeline.inference.last_error, RuntimeError)
+    assert sum("Kare işlenemedi" in record.message for record in caplog.records) == len(calls) // 3
+
+
+def test_source_released_after_blocked_read_finishes():
+    source = BlockingSource()
+    pipeline = FramePipeline(source, lambda frame, timestamp: None)
+    pipeline.start()
+    assert source.reading.wait(1.0)
+    pipeline.stop(timeout=0.05)
+    # Okuma sürerken kaynak kapatılmaz
+    assert source.released == 0
+    source.gate.set()
+    pipeline.capture.join(1.0)
+    assert not pipeline.capture.is_alive()
+    assert source.released == 1
+    assert not source.released_while_reading
+
+
+def test_source_released_immediately_when_capture_finished():
+    source = CountingSource(5)
+    pipeline = FramePipeline(source, lambda frame, timestamp: None)
+    pipeline.start()
+    drain(pipeline)
+    pipeline.stop()
+    assert source.released == 1
+    # Hiç başlamamış yakalama iş parçacığında da kaynak kapatılır
+    idle = FramePipeline(CountingSource(5), lambda frame, timestamp: None)
+    assert idle.capture.release_source()
+    assert idle.capture.source.released == 1
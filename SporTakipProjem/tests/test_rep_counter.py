@@ -0,0 +1,108 @@
+"""RepStateMachine: histerezisli bölge geçişleri ve dipte bekleme süresi"""
+from rep_counter import ASCENDING, BOTTOM, DESCENDING, TOP, RepStateMachine
+
+FPS = 30.0
+
+
+def feed(fsm, angles, correct=True, start=0.0):
+    """Açıları 30 fps aralıkla verir; tekrar tamamlanan kare indekslerini döndürür"""
+    return [i for i, angle in enumerate(angles) if fsm.update(angle, correct, start + i / FPS)]
+
+
+def squat():
+    # Tepe bölgesi derinlik <= 20 (açı >= 150), çıkışı > 30 (açı < 140);
+    # dip girişi derinlik >= 60 (açı <= 110), çıkışı < 50 (açı > 120)
+    return RepStateMachine(170, 90, tolerance=20, top_band=20, hysteresis=10, min_dwell=0.1)
+
+
+def test_thresholds():
+    fsm = squat()
+    assert (fsm.top_enter, fsm.top_exit, fsm.bottom_enter, fsm.bottom_exit) == (20, 30, 60, 50)
+
+
+def test_full_rep_counts_once_at_top():
+    fsm = squat()
+    angles = [170, 150, 130, 100, 100, 100, 100, 100, 130, 160, 170]
+    assert feed(fsm, angles) == [9]
+    assert fsm.count == 1
+    assert fsm.phase == TOP
+
+
+def test_phases():
+    fsm = squat()
+    phases = []
+    for i, angle in enumerate([170, 135, 105, 105, 105, 105, 125, 155]):
+        fsm.update(angle, True, i / FPS)
+        phases.append(fsm.phase)
+    assert phases == [TOP, DESCENDING, BOTTOM, BOTTOM, BOTTOM, BOTTOM, ASCENDING, TOP]
+
+
+def test_jitter_at_top_boundary_is_not_a_rep():
+    fsm = squat()
+    # Tepe çıkış eşiği etrafında titreşim: iniş başlar ama dibe varılmaz
+    assert feed(fsm, [170, 145, 138, 145, 138, 152, 138, 155] * 5) == []
+    assert fsm.count == 0
+
+
+def test_jitter_at_bottom_boundary_counts_one_rep():
+    fsm = squat()
+    # 115 derece dip çıkış eşiğinin (120) içinde kalır; dipten çıkılmış sayılmaz
+    angles = [170, 130, 108] + [115, 108] * 10 + [130, 160]
+    assert feed(fsm, angles) == [len(angles) - 1]
+
+
+def test_return_to_bottom_from_ascending_counts_one_rep():
+    fsm = squat()
+    angles = [170, 130, 100, 100, 100, 100, 125, 100, 100, 125, 160]
+    assert feed(fsm, angles) == [10]
+
+
+def test_turning_back_before_bottom_resets():
+    fsm = squat()
+    assert feed(fsm, [170, 130, 115, 130, 155, 170]) == []
+    assert fsm.phase == TOP
+
+
+def test_short_dwell_is_not_a_rep():
+    fsm = squat()
+    # Dipte 2 kare = 1/30 sn < 0.1 sn
+    assert feed(fsm, [170, 130, 100, 100, 130, 160]) == []
+    assert fsm.count == 0
+
+
+def test_dwell_requires_correct_form():
+    fsm = squat()
+    angles = [170, 130] + [100] * 30 + [130, 160]
+    assert feed(fsm, angles, correct=False) == []
+
+
+def test_dwell_accumulates_over_bottom_visit():
+    fsm = RepStateMachine(170, 90, min_dwell=0.1)
+    # Doğru formda 0.05 + 0.05 sn: toplam eşiğe eşit
+    for timestamp, angle, correct in [(0.0, 170, True), (0.1, 130, True), (0.2, 100, True),
+                                      (0.25, 100, True), (0.3, 100, True), (0.4, 130, True),
+                                      (0.5, 160, True)]:
+        fsm.update(angle, correct, timestamp)
+    assert fsm.count == 1
+
+
+def test_none_angle_keeps_state():
+    fsm = squat()
+    angles = [170, 130, 100, None, None, 100, 100, 100, 100, None, 130, None, 160]
+    assert feed(fsm, angles) == [12]
+
+
+def test_increasing_angle_movement():
+    # Shoulder Press: tepe 90, hedef 170; açı artarken iner
+    fsm = RepStateMachine(90, 170, tolerance=20, min_dwell=0.1)
+    assert fsm.sign == -1.0
+    angles = [90, 130, 160, 160, 160, 160, 160, 120, 95]
+    assert feed(fsm, angles) == [8]
+
+
+def test_reset():
+    fsm = squat()
+    feed(fsm, [170, 130, 100, 100, 100, 100, 100])
+    fsm.reset()
+    assert (fsm.phase, fsm.count) == (TOP, 0)
+    assert feed(fsm, [130, 160]) == []
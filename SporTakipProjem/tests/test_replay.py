@@ -0,0 +1,99 @@
+"""Kayıtların vektörel yeniden puanlanması canlı motorla aynı sonucu vermeli"""
+import numpy as np
+import pytest
+
+import replay
+from angles import joint_angles
+from engine import ExerciseEngine
+from exercises import MOVEMENTS, SIDES, STATUS_CODES
+from session_recorder import SessionRecorder, load_session
+
+
+def live(movement, points, timestamps, side="auto", **params):
+    """Kareleri tek tek canlı motordan geçirir"""
+    engine = replay.configure(ExerciseEngine(movement, smoothing=False), **params)
+    engine.side = side
+    engine.reset()
+    return [engine.process_points(p, t) for p, t in zip(points, timestamps)]
+
+
+@pytest.mark.parametrize("side", SIDES)
+@pytest.mark.parametrize("movement", MOVEMENTS)
+def test_score_frames_and_count_reps_match_engine(pose_sequence, movement, side):
+    points, timestamps = pose_sequence
+    results = live(movement, points, timestamps, side)
+
+    engine = ExerciseEngine(movement, smoothing=False)
+    engine.side = side
+    engine.reset()
+    status, correct, drive = replay.score_frames(engine, joint_angles(points), points)
+    assert [STATUS_CODES[s] for s in status] == [r.status for r in results]
+    assert correct.tolist() == [r.is_correct for r in results]
+
+    reps = replay.count_reps(drive, correct, timestamps, engine.rep_fsm)
+    assert reps.tolist() == [i for i, r in enumerate(results) if r.rep_event]
+    assert len(reps) == results[-1].count > 0
+
+
+@pytest.mark.parametrize("params", [
+    {"angle_tolerance": 10},
+    {"angle_tolerance": 30, "rep_hysteresis": 5},
+    {"rep_min_dwell": 0.5},
+    {"target_angle": 100, "min_torso_angle": 120},
+])
+def test_replay_parameters_match_engine(pose_sequence, params):
+    points, timestamps = pose_sequence
+    results = live("Squat", points, timestamps, **params)
+
+    engine = replay.configure(ExerciseEngine("Squat", smoothing=False), **params)
+    status, correct, drive = replay.score_frames(engine, joint_angles(points), points)
+    assert [STATUS_CODES[s] for s in status] == [r.status for r in results]
+    reps = replay.count_reps(drive, correct, timestamps, engine.rep_fsm)
+    assert len(reps) == results[-1].count
+
+
+@pytest.mark.parametrize("movement", MOVEMENTS)
+def test_replay_of_recorded_session(tmp_path, pose_sequence, movement):
+    points, timestamps = pose_sequence
+    engine = ExerciseEngine(movement, smoothing=False)
+    recorder = SessionRecorder(str(tmp_path), chunk_frames=256)
+    statuses = []
+    for i, (p, t) in enumerate(zip(points, timestamps)):
+        analysis = engine.process_points(None if i % 50 == 49 else p, t) # Arada kişi bulunamıyor
+        recorder.record(analysis, engine.smoothed_points)
+        statuses.append(analysis.status)
+    recorder.close()
+
+    _, frames = load_session(recorder.path)
+    result = replay.replay(frames, movement)
+    assert result["frames"] == len(points)
+    assert [STATUS_CODES[s] for s in result["status"]] == statuses
+    assert result["reps"] == engine.correct_count
+
+
+def test_count_reps_without_angles():
+    fsm = ExerciseEngine("Squat").rep_fsm
+    angle = np.full(10, np.nan)
+    assert len(replay.count_reps(angle, np.ones(10, dtype=bool), np.arange(10) / 30.0, fsm)) == 0
+
+
+def test_agreement_on_mixed_movement_session(tmp_path, pose_sequence):
+    points, timestamps = pose_sequence
+    recorder = SessionRecorder(str(tmp_path), chunk_frames=256)
+    engines = {movement: ExerciseEngine(movement, smoothing=False) for movement in MOVEMENTS[:2]}
+    for i, (p, t) in enumerate(zip(points, timestamps)):
+        engine = engines[MOVEMENTS[(i // 100) % 2]] # Hareket her 100 karede değişiyor
+        recorder.record(engine.process_points(p, t), engine.smoothed_points)
+    recorder.close()
+
+    _, frames = load_session(recorder.path)
+    result = replay.replay(frames, MOVEMENTS[0])
+    assert result["frames"] < len(frames)
+    # Oturumun tamamını kapsayan etiketlere hareket maskesi uygulanır
+    session_labels = np.zeros(len(frames), dtype=bool)
+    session_labels[result["mask"]] = result["correct"]
+    assert replay.agreement(result, session_labels) == 1.0
+    assert replay.agreement(result, result["correct"]) == 1.0
+    assert replay.agreement(result, ~session_labels) == 0.0
+    with pytest.raises(ValueError):
+        replay.agreement(result, session_labels[:-1])
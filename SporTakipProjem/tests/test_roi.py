@@ -0,0 +1,102 @@
+"""Kırpılmış bölgede çıkarım ve landmarkların tam kareye geri çevrilmesi"""
+from types import SimpleNamespace
+
+import numpy as np
+
+from roi import RoiTracker
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def person(dx=0):
+    """Çakışmayan 33 landmarkın piksel merkezleri (3 sütun x 11 satır)"""
+    columns = np.array([537, 640, 742]) + dx
+    rows = 216 + 36 * np.arange(11)
+    return np.array([(x, y) for y in rows for x in columns])
+
+
+def render(pixels):
+    """Her landmarkı kendine özgü renkte 9x9 piksellik kare olarak çizer"""
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    for i, (x, y) in enumerate(pixels):
+        frame[y - 4:y + 5, x - 4:x + 5] = (40 + 6 * i, 255, 0)
+    return frame
+
+
+def normalized(pixels):
+    return (pixels + 0.5) / [WIDTH, HEIGHT]
+
+
+class MarkerPose:
+    """Landmarkları verilen görüntüdeki renkli karelerin merkezinden bulan poz modeli"""
+
+    def __init__(self):
+        self.shapes = []
+
+    def process(self, image):
+        self.shapes.append(image.shape[:2])
+        h, w = image.shape[:2]
+        marked = image[..., 1] == 255 # Küçültmede karışan kenar pikselleri elenir
+        landmarks = []
+        for i in range(33):
+            ys, xs = np.nonzero(marked & (image[..., 0] == 40 + 6 * i))
+            if not len(xs):
+                return SimpleNamespace(pose_landmarks=None)
+            landmarks.append(SimpleNamespace(x=(xs.mean() + 0.5) / w, y=(ys.mean() + 0.5) / h,
+                                             z=0.1, visibility=0.9))
+        return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=landmarks))
+
+
+def test_cropped_landmarks_map_back_to_full_frame():
+    pose, tracker = MarkerPose(), RoiTracker()
+    pixels = person()
+    frame = render(pixels)
+    tolerance = 2.0 / np.array([WIDTH, HEIGHT]) # İki tam kare pikseli
+
+    _, points = tracker.process(pose, frame)
+    assert not tracker.cropped and pose.shapes[-1] == (HEIGHT, WIDTH)
+    np.testing.assert_allclose(points[:, :2], normalized(pixels), atol=1e-6)
+    assert tracker.roi is not None
+
+    x0, y0, cw, ch = tracker.roi
+    assert x0 <= pixels[:, 0].min() and pixels[:, 0].max() < x0 + cw
+    assert y0 <= pixels[:, 1].min() and pixels[:, 1].max() < y0 + ch
+    _, points = tracker.process(pose, frame)
+    assert tracker.cropped
+    assert max(pose.shapes[-1]) <= tracker.input_size
+    assert np.all(np.abs(points[:, :2] - normalized(pixels)) <= tolerance)
+    np.testing.assert_allclose(points[:, 2], 0.1 * cw / WIDTH, rtol=1e-6) # z, x ölçeğinde
+
+    # Kişi bölgenin içinde biraz kayınca bölge değişmez, koordinatlar izlenir
+    pixels = person(dx=12)
+    _, points = tracker.process(pose, render(pixels))
+    assert tracker.cropped and tracker.roi == (x0, y0, cw, ch)
+    assert np.all(np.abs(points[:, :2] - normalized(pixels)) <= tolerance)
+    assert tracker.stats() == {"crop_hit_rate": 1.0, "crops": 2, "full_frames": 1}
+
+
+def test_lost_person_falls_back_to_full_frame():
+    pose, tracker = MarkerPose(), RoiTracker()
+    frame = render(person())
+    tracker.process(pose, frame)
+    # Kişi kırpılan bölgeden çıktı: aynı kare tam boyutta denenir
+    pixels = person(dx=-400)
+    _, points = tracker.process(pose, render(pixels))
+    assert not tracker.cropped
+    assert pose.shapes[-2] != (HEIGHT, WIDTH) and pose.shapes[-1] == (HEIGHT, WIDTH)
+    np.testing.assert_allclose(points[:, :2], normalized(pixels), atol=1e-6)
+    # Kimse yoksa bölge sıfırlanır
+    results, points = tracker.process(pose, np.zeros_like(frame))
+    assert points is None and tracker.roi is None
+    assert tracker.stats()["crop_hit_rate"] == 0.0
+
+
+def test_input_scale_keeps_normalized_coordinates():
+    pose, tracker = MarkerPose(), RoiTracker(input_scale=0.5)
+    pixels = person()
+    frame = render(pixels)
+    _, points = tracker.process(pose, frame)
+    assert pose.shapes[-1] == (HEIGHT // 2, WIDTH // 2)
+    assert np.all(np.abs(points[:, :2] - normalized(pixels)) <= 2.0 / np.array([WIDTH, HEIGHT]))
+    tracker.process(pose, frame)
+    assert tracker.cropped and max(pose.shapes[-1]) <= tracker.input_size * 0.5
@@ -0,0 +1,31 @@
+"""Oturum kaydı: klasör sadece kare yazılınca oluşur"""
+import os
+
+from engine import ExerciseEngine
+from session_recorder import SessionRecorder, load_session
+
+
+def test_empty_session_leaves_no_folder(tmp_path):
+    recorder = SessionRecorder(str(tmp_path), name="bos")
+    recorder.close()
+    assert recorder.frames == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_folder_created_on_first_chunk(tmp_path, pose_sequence):
+    points, timestamps = pose_sequence
+    engine = ExerciseEngine("Squat", smoothing=False)
+    first = SessionRecorder(str(tmp_path), name="oturum", chunk_frames=64)
+    second = SessionRecorder(str(tmp_path), name="oturum", chunk_frames=64)
+    assert not os.path.exists(first.path)
+    for recorder in (second, first): # İkinci kayıt klasörünü önce oluşturur
+        for p, t in zip(points[:100], timestamps[:100]):
+            recorder.record(engine.process_points(p, t), engine.smoothed_points)
+        recorder.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["oturum", "oturum_2"]
+    assert first.path != second.path
+    for recorder in (first, second):
+        meta, frames = load_session(recorder.path)
+        assert len(frames) == recorder.frames == 100
+        assert meta["chunk_frames"] == 64
@@ -0,0 +1,68 @@
+"""Vektörel One-Euro filtresi"""
+import math
+
+import numpy as np
+
+from smoothing import OneEuroFilter
+
+
+def reference_filter(samples, timestamps, min_cutoff, beta, d_cutoff):
+    """Tek landmark için düz Python One-Euro; hız vektörünün normu kullanılır"""
+    def alpha(cutoff, dt):
+        return 1.0 / (1.0 + 1.0 / (2.0 * math.pi * cutoff * dt))
+
+    value, velocity, out = list(samples[0]), [0.0, 0.0, 0.0], [list(samples[0])]
+    for previous, timestamp, sample in zip(timestamps, timestamps[1:], samples[1:]):
+        dt = timestamp - previous
+        a = alpha(d_cutoff, dt)
+        velocity = [v + a * ((s - x) / dt - v) for v, s, x in zip(velocity, sample, value)]
+        a = alpha(min_cutoff + beta * math.sqrt(sum(v * v for v in velocity)), dt)
+        value = [x + a * (s - x) for x, s in zip(value, sample)]
+        out.append(value)
+    return np.array(out)
+
+
+def test_matches_scalar_reference(pose_sequence):
+    points, timestamps = pose_sequence
+    points, timestamps = points[:200], timestamps[:200]
+    smoother = OneEuroFilter(min_cutoff=1.0, beta=20.0, d_cutoff=1.0)
+    filtered = np.stack([smoother.filter(p, t).copy() for p, t in zip(points, timestamps)])
+    for landmark in (0, 13, 25):
+        expected = reference_filter(points[:, landmark, :3].astype(np.float64), timestamps, 1.0, 20.0, 1.0)
+        np.testing.assert_allclose(filtered[:, landmark, :3], expected, atol=1e-5)
+    # Görünürlük süzülmeden aktarılır
+    np.testing.assert_array_equal(filtered[..., 3], points[..., 3])
+
+
+def test_reset_on_missing_points_and_time_jumps(pose_sequence):
+    points = pose_sequence[0]
+    smoother = OneEuroFilter()
+    np.testing.assert_array_equal(smoother.filter(points[0], 0.0), points[0])
+    assert not np.array_equal(smoother.filter(points[10], 1 / 30), points[10])
+    # Kişi kaybolunca sıfırlanır; sonraki ölçüm olduğu gibi kabul edilir
+    assert smoother.filter(None, 2 / 30) is None
+    assert not smoother.velocity.any()
+    np.testing.assert_array_equal(smoother.filter(points[20], 3 / 30), points[20])
+    # Geriye giden zaman damgası (ör. video başa sardı) ölçümü olduğu gibi alır
+    np.testing.assert_array_equal(smoother.filter(points[30], 0.0), points[30])
+
+
+def test_jitter_reduced_and_motion_followed():
+    rng = np.random.default_rng(3)
+    timestamps = np.arange(300) / 30.0
+    still = np.full((300, 33, 4), 0.5, dtype=np.float32)
+    noisy = still.copy()
+    noisy[..., :3] += rng.normal(0, 0.005, noisy[..., :3].shape).astype(np.float32)
+    smoother = OneEuroFilter()
+    filtered = np.stack([smoother.filter(p, t).copy() for p, t in zip(noisy, timestamps)])
+    assert np.std(filtered[30:, :, :3]) < np.std(noisy[30:, :, :3]) * 0.7
+
+    # Hızlı harekette beta kesim frekansını yükseltir: gecikme azalır
+    moving = still.copy()
+    moving[..., 0] += (timestamps * 0.5)[:, None].astype(np.float32)
+    lag = {}
+    for beta in (0.0, 50.0):
+        smoother = OneEuroFilter(beta=beta)
+        filtered = np.stack([smoother.filter(p, t).copy() for p, t in zip(moving, timestamps)])
+        lag[beta] = np.abs(filtered[60:, :, 0] - moving[60:, :, 0]).mean()
+    assert lag[50.0] < lag[0.0] / 5
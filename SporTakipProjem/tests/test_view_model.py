@@ -0,0 +1,96 @@
+"""Farka dayalı, hız sınırlı widget güncellemeleri (Tk olmadan)"""
+import pytest
+
+from view_model import ViewModel
+
+
+class FakeWidget:
+    def __init__(self):
+        self.calls = []
+
+    def config(self, **options):
+        self.calls.append(options)
+
+
+class FakeRoot:
+    """after() çağrılarını kaydeden, zamanı elle ilerletilen kök pencere"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.timers = {}
+        self.delays = []
+
+    def clock(self):
+        return self.now
+
+    def after(self, delay_ms, callback):
+        timer = f"after#{len(self.delays)}"
+        self.delays.append(delay_ms)
+        self.timers[timer] = callback
+        return timer
+
+    def after_cancel(self, timer):
+        del self.timers[timer]
+
+    def run(self, seconds):
+        self.now += seconds
+        for timer in list(self.timers):
+            self.timers.pop(timer)()
+
+
+@pytest.fixture
+def widgets():
+    return {"status": FakeWidget(), "counter": FakeWidget()}
+
+
+def test_only_changed_options_are_sent(widgets):
+    view = ViewModel(widgets)
+    view.set("status", text="DOĞRU", fg="green")
+    view.set("counter", text="1")
+    view.flush()
+    assert widgets["status"].calls == [{"text": "DOĞRU", "fg": "green"}]
+    view.set("status", text="DOĞRU", fg="red")
+    view.set("counter", text="1")
+    view.flush()
+    assert widgets["status"].calls[-1] == {"fg": "red"}
+    assert widgets["counter"].calls == [{"text": "1"}]
+    assert (view.updates, view.skipped) == (3, 1)
+
+
+def test_only_latest_pending_value_is_applied(widgets):
+    view = ViewModel(widgets)
+    for count in range(10):
+        view.set("counter", text=str(count))
+    view.flush()
+    assert widgets["counter"].calls == [{"text": "9"}]
+    view.flush() # Bekleyen yok: Tk'ye dokunulmaz
+    assert widgets["counter"].calls == [{"text": "9"}]
+
+
+def test_invalidate_resends_options(widgets):
+    view = ViewModel(widgets)
+    view.set("status", text="HAZIR")
+    view.flush()
+    view.invalidate("status")
+    view.set("status", text="HAZIR")
+    view.flush()
+    assert widgets["status"].calls == [{"text": "HAZIR"}] * 2
+
+
+def test_flushes_are_rate_limited(widgets):
+    root = FakeRoot()
+    view = ViewModel(widgets, root=root, max_rate=50.0, clock=root.clock)
+    view.set("counter", text="1")
+    view.set("status", text="DOĞRU") # Zaten zamanlanmış: ikinci after yok
+    assert root.delays == [0]
+    root.run(0.001)
+    assert widgets["counter"].calls == [{"text": "1"}]
+    # Son flush'tan 20 ms geçmeden yenisi zamanlanmaz
+    view.set("counter", text="2")
+    assert root.delays[-1] == 20
+    root.run(0.02)
+    assert widgets["counter"].calls[-1] == {"text": "2"}
+    view.set("counter", text="3")
+    view.cancel()
+    assert not root.timers
+    assert widgets["counter"].calls[-1] == {"text": "2"}
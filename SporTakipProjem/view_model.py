@@ -0,0 +1,73 @@
+"""Tk widget güncellemelerinin farka dayalı ve hız sınırlı uygulanması.
+
+Kare döngüsü widget'lara doğrudan config çağırmak yerine istenen durumu
+ViewModel'e yazar. Bekleyen durumlar ekran yenileme hızını aşmayacak
+aralıklarla toplanıp son çizilen durumla karşılaştırılır; sadece değişen
+seçenekler Tk'ye gönderilir. Böylece değişmeyen metin ve renkler için Tcl
+çağrısı ve geometri hesabı yapılmaz.
+"""
+import time
+
+DISPLAY_RATE = 60.0 # Hz
+
+
+class ViewModel:
+    """Ad -> widget eşlemesinin istenen ve son çizilen seçeneklerini tutar.
+
+    set() sadece istenen durumu kaydeder ve (root verilmişse) en fazla
+    max_rate Hz'de bir flush() zamanlar. Widget'ların bu seçenekleri
+    ViewModel dışından değiştirilmemelidir; değiştirilirse invalidate()
+    çağrılmalıdır.
+    """
+
+    def __init__(self, widgets, root=None, max_rate=DISPLAY_RATE, metrics=None, clock=time.perf_counter):
+        self.widgets = widgets
+        self.root = root
+        self.interval = 1.0 / max_rate
+        self.metrics = metrics
+        self.clock = clock
+        self._rendered = {name: {} for name in widgets}
+        self._pending = {}
+        self._last_flush = float("-inf")
+        self._scheduled = None
+        self.updates = 0 # Tk'ye gönderilen config çağrıları
+        self.skipped = 0 # Değişiklik olmadığı için atlananlar
+
+    def set(self, name, **options):
+        """Widget'ın istenen seçeneklerini kaydeder; Tk'ye dokunmaz"""
+        self._pending.setdefault(name, {}).update(options)
+        if self.root is not None and self._scheduled is None:
+            delay = max(0.0, self._last_flush + self.interval - self.clock())
+            self._scheduled = self.root.after(int(delay * 1000), self._scheduled_flush)
+
+    def _scheduled_flush(self):
+        self._scheduled = None
+        self.flush()
+
+    def flush(self):
+        """Bekleyen durumlardan sadece değişen seçenekleri widget'lara uygular"""
+        start = self.clock()
+        self._last_flush = start
+        pending, self._pending = self._pending, {}
+        for name, options in pending.items():
+            rendered = self._rendered[name]
+            changed = {key: value for key, value in options.items() if rendered.get(key) != value}
+            if changed:
+                self.widgets[name].config(**changed)
+                rendered.update(changed)
+                self.updates += 1
+            else:
+                self.skipped += 1
+        if self.metrics is not None:
+            self.metrics.record("widgets", self.clock() - start)
+
+    def invalidate(self, name=None):
+        """Son çizilen durumu unutur; sonraki flush seçenekleri yeniden gönderir"""
+        for key in ([name] if name else self._rendered):
+            self._rendered[key].clear()
+
+    def cancel(self):
+        """Zamanlanmış flush'ı iptal eder (pencere kapatılırken)"""
+        if self._scheduled is not None:
+            self.root.after_cancel(self._scheduled)
+            self._scheduled = None